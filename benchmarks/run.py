@@ -0,0 +1,300 @@
+"""
+Reproducible throughput / latency benchmarks.
+
+    python benchmarks/run.py                       # full sizes, JSON to stdout
+    python benchmarks/run.py --out bench.json      # ... and to a file
+    python benchmarks/run.py --scale 0.1 -k shadow # smaller runs, only matching cases
+
+Every case uses a fixed seed, so two runs on the same machine do the same work.
+Each result records events, wall seconds, events/sec and p50/p99/max per-event
+latency in microseconds. The meta block (python, platform, git revision) makes
+files from different versions comparable.
+"""
+import gc, json, os, platform, random, subprocess, sys, tempfile, time
+from pathlib import Path
+from time import perf_counter_ns
+
+import click
+
+from spltrader.core.log import log, WARN
+from spltrader.core.types import Quote, Trade, Side, OrderReq, OrdType, Fill
+from spltrader.engine.engine import Engine
+from spltrader.exec.backend_paper import PaperBackend
+from spltrader.exec.backend_shadow import ShadowBackend
+from spltrader.mock_adapter.mock import MockMarket
+from spltrader.risk.allow_all import AllowAllRisk
+from spltrader.storage.sqlite_store import SQLiteStore, WriteBehindSQLiteStore
+from spltrader.strategies.demo import RangeBounce
+
+SEED = 20240601
+
+
+# --- helpers ---------------------------------------------------------------
+
+def _summary(lat_ns: list[int], wall_ns: int, **extra) -> dict:
+    lat_ns.sort()
+    n = len(lat_ns)
+    pick = lambda q: lat_ns[min(n - 1, int(q * n))] / 1e3 if n else 0.0
+    return {
+        "events": n,
+        "seconds": round(wall_ns / 1e9, 6),
+        "events_per_sec": round(n / (wall_ns / 1e9), 1) if wall_ns else 0.0,
+        "p50_us": round(pick(0.50), 3),
+        "p99_us": round(pick(0.99), 3),
+        "max_us": round(lat_ns[-1] / 1e3, 3) if n else 0.0,
+        **extra,
+    }
+
+
+def _timed(fn, args_list) -> dict:
+    """Call fn(*args) for each args tuple; per-call latency plus total wall time."""
+    lat = []
+    gc.collect()
+    t_start = perf_counter_ns()
+    for args in args_list:
+        t0 = perf_counter_ns()
+        fn(*args)
+        lat.append(perf_counter_ns() - t0)
+    return _summary(lat, perf_counter_ns() - t_start)
+
+
+def _walk(rnd: random.Random, n: int, start: float = 100.0, step: float = 0.05):
+    p = start
+    for _ in range(n):
+        p = min(max(p + rnd.uniform(-step, step), start * 0.98), start * 1.02)
+        yield p
+
+
+class _NullStore:
+    def write_fill(self, f): pass
+    def write_event(self, kind, payload): pass
+    def write_snapshot(self, s): pass
+
+
+# --- cases -----------------------------------------------------------------
+
+class _ListMarket:
+    """Pre-generated finite feed (generation cost stays out of the measurement)."""
+    def __init__(self, quotes, trades):
+        self.quotes, self.trades = quotes, trades
+
+    def subscribe_quotes(self, symbol):
+        return iter(self.quotes)
+
+    def subscribe_trades(self, symbol):
+        return iter(self.trades)
+
+
+class _TimedEngine(Engine):
+    """Engine that records the wall time of every dispatched event."""
+    def __init__(self, *a, **kw):
+        super().__init__(*a, **kw)
+        self.lat = []
+
+    def _dispatch(self, symbol, kind, evt, strategy):
+        t0 = perf_counter_ns()
+        super()._dispatch(symbol, kind, evt, strategy)
+        self.lat.append(perf_counter_ns() - t0)
+
+
+def bench_engine(n: int, merge: str) -> dict:
+    rnd = random.Random(SEED)
+    quotes, trades = [], []
+    for i, p in enumerate(_walk(rnd, n)):
+        if i % 2:
+            trades.append(Trade(ts=i, price=round(p, 2), size=1.0, side=Side.BUY if rnd.random() < 0.5 else Side.SELL))
+        else:
+            quotes.append(Quote(ts=i, bid=p - 0.01, ask=p + 0.01, bid_sz=1.0, ask_sz=1.0))
+    strat = RangeBounce({"symbol": "BENCH", "strategy": {"range_low": 99.0, "range_high": 101.0}})
+    eng = _TimedEngine(_ListMarket(quotes, trades), ShadowBackend(fee_bps=1.0), _NullStore(), AllowAllRisk(), merge=merge)
+    gc.collect()
+    t0 = perf_counter_ns()
+    eng.run("BENCH", strat)
+    return _summary(eng.lat, perf_counter_ns() - t0, fills=eng.n_fills)
+
+
+def bench_engine_mock(n: int, profile: str) -> dict:
+    """Engine fed straight from an unpaced MockMarket (feed generation included)."""
+    feed = MockMarket({"mock": {"seed": SEED, "speed": 0, "events": n, "rate": 10_000, "profile": profile,
+                                "start_ms": 1_700_000_000_000}})
+    strat = RangeBounce({"symbol": "BENCH", "strategy": {"range_low": 99.9, "range_high": 100.1}})
+    eng = _TimedEngine(feed, ShadowBackend(fee_bps=1.0), _NullStore(), AllowAllRisk(), merge="timestamp")
+    gc.collect()
+    t0 = perf_counter_ns()
+    eng.run("BENCH", strat)
+    return _summary(eng.lat, perf_counter_ns() - t0, fills=eng.n_fills, sim_sec=(eng.now - 1_700_000_000_000) / 1e3)
+
+
+def bench_shadow_on_trade(n: int, resting: int) -> dict:
+    """Book held at `resting` orders: every fill is replaced by a new order at a random price."""
+    rnd = random.Random(SEED)
+    b = ShadowBackend(fee_bps=1.0)
+    seq = 0
+
+    def place():
+        nonlocal seq
+        seq += 1
+        side = Side.BUY if rnd.random() < 0.5 else Side.SELL
+        # mostly away from the market, a few close enough to trade
+        off = rnd.uniform(0.02, 2.0)
+        px = 100.0 - off if side == Side.BUY else 100.0 + off
+        b.place(OrderReq(client_id=f"o{seq}", symbol="BENCH", side=side, type=OrdType.LIMIT, px=round(px, 2), sz=1.0))
+
+    for _ in range(resting):
+        place()
+    trades = [Trade(ts=i, price=round(p, 2), size=1.0, side=Side.BUY, symbol="BENCH")
+              for i, p in enumerate(_walk(rnd, n, step=0.02))]
+    lat, fills = [], 0
+    gc.collect()
+    t_start = perf_counter_ns()
+    for t in trades:
+        t0 = perf_counter_ns()
+        out = b.on_trade(t)
+        lat.append(perf_counter_ns() - t0)
+        fills += len(out)
+        for _ in out:
+            place()
+    return _summary(lat, perf_counter_ns() - t_start, resting=resting, fills=fills)
+
+
+def bench_paper_on_quote(n: int, resting: int) -> dict:
+    rnd = random.Random(SEED)
+    b = PaperBackend(store=_NullStore(), fee_bps=1.0, slippage_bps=1.0)
+    for i in range(resting):
+        side = Side.BUY if i % 2 else Side.SELL
+        off = rnd.uniform(0.02, 2.0)
+        px = 100.0 - off if side == Side.BUY else 100.0 + off
+        b.place(OrderReq(client_id=f"o{i}", symbol="BENCH", side=side, type=OrdType.LIMIT, px=round(px, 2), sz=1.0))
+    quotes = [Quote(ts=i, bid=p - 0.01, ask=p + 0.01, bid_sz=1.0, ask_sz=1.0, symbol="BENCH")
+              for i, p in enumerate(_walk(rnd, n, step=0.02))]
+    res = _timed(b.on_quote, [(q,) for q in quotes])
+    res.update(resting=resting, fills=len(b._fills))
+    return res
+
+
+def bench_store(n: int, write_behind: bool) -> dict:
+    with tempfile.TemporaryDirectory() as d:
+        cfg = {"storage": {"path": os.path.join(d, "bench.db")}}
+        store = WriteBehindSQLiteStore(cfg) if write_behind else SQLiteStore(cfg)
+        fills = [Fill(ts=i, client_id=f"c{i}", symbol="BENCH", side=Side.BUY, px=100.0, sz=1.0, fee=0.01)
+                 for i in range(n)]
+        res = _timed(store.write_fill, [(f,) for f in fills])
+        t0 = perf_counter_ns()
+        store.close()  # write-behind: time to drain what is still queued
+        res["close_seconds"] = round((perf_counter_ns() - t0) / 1e9, 6)
+        return res
+
+
+def hl_frames(n: int) -> list[str]:
+    """
+    Synthetic Hyperliquid text frames in the exchange's layout: l2Book snapshots (20 levels,
+    top of book changing on about a third of them) and trades frames of 1-4 trades for SOL and
+    BTC, plus acks and frames for an unrouted coin.
+    """
+    rnd = random.Random(SEED)
+    frames, books = [], {"SOL": 150.0, "BTC": 60_000.0}
+    dumps = lambda obj: json.dumps(obj, separators=(",", ":"))
+    for i in range(n):
+        r = rnd.random()
+        coin = "SOL" if rnd.random() < 0.5 else "BTC"
+        tick = books[coin] * 1e-4
+        if r < 0.02:
+            frames.append(dumps({"channel": "subscriptionResponse", "data": {
+                "method": "subscribe", "subscription": {"type": "trades", "coin": coin}}}))
+        elif r < 0.07:
+            frames.append(dumps({"channel": "trades", "data": [
+                {"coin": "DOGE", "side": "B", "px": "0.1", "sz": "100", "time": 1_700_000_000_000 + i, "tid": i}]}))
+        elif r < 0.55:
+            if rnd.random() < 0.33:
+                books[coin] += rnd.choice((-tick, tick))
+            mid = books[coin]
+            levels = [[{"px": f"{mid - tick * (k + 1):.6g}", "sz": f"{10 + k}", "n": 3} for k in range(20)],
+                      [{"px": f"{mid + tick * (k + 1):.6g}", "sz": f"{10 + k}", "n": 3} for k in range(20)]]
+            frames.append(dumps({"channel": "l2Book", "data": {
+                "coin": coin, "time": 1_700_000_000_000 + i, "levels": levels}}))
+        else:
+            frames.append(dumps({"channel": "trades", "data": [
+                {"coin": coin, "side": "B" if rnd.random() < 0.5 else "A", "px": f"{books[coin]:.6g}",
+                 "sz": "1.25", "time": 1_700_000_000_000 + i, "hash": "0x0", "tid": i * 4 + k}
+                for k in range(rnd.randint(1, 4))]}))
+    return frames
+
+
+def bench_hl_decode(n: int, frames_file: "str | None", fast: bool) -> dict:
+    """handle_message (text fast path) or the general parse path over the same frames."""
+    try:
+        from spl_adapter_hyperliquid.adapter import handle_message, _handle_parsed, _Route
+        from spl_adapter_hyperliquid.book import L2Book
+    except ImportError:
+        return {"skipped": "spl-adapter-hyperliquid not installed"}
+    frames = Path(frames_file).read_text().splitlines() if frames_file else hl_frames(n)
+    quotes, trades = [], []
+    routes = {c: _Route(f"{c}-PERP", quotes.append, trades.append, L2Book(c)) for c in ("SOL", "BTC")}
+    res = _timed(handle_message if fast else _handle_parsed, [(f, routes) for f in frames])
+    res.update(quotes=len(quotes), trade_msgs=len(trades), source=frames_file or "synthetic")
+    return res
+
+
+def cases(scale: float, hl_frames_file: "str | None" = None) -> dict:
+    k = lambda n: max(100, int(n * scale))
+    out = {
+        "engine_timestamp": lambda: bench_engine(k(200_000), "timestamp"),
+        "engine_arrival": lambda: bench_engine(k(200_000), "arrival"),
+        "engine_mock_burst": lambda: bench_engine_mock(k(200_000), "burst"),
+    }
+    for r in (10, 100, 1000):
+        out[f"shadow_on_trade_{r}"] = lambda r=r: bench_shadow_on_trade(k(100_000), r)
+        out[f"paper_on_quote_{r}"] = lambda r=r: bench_paper_on_quote(k(100_000), r)
+    out["sqlite_write_fill"] = lambda: bench_store(k(5_000), write_behind=False)
+    out["sqlite_write_behind_write_fill"] = lambda: bench_store(k(100_000), write_behind=True)
+    out["hyperliquid_decode"] = lambda: bench_hl_decode(k(100_000), hl_frames_file, fast=True)
+    out["hyperliquid_decode_parsed"] = lambda: bench_hl_decode(k(100_000), hl_frames_file, fast=False)
+    return out
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, timeout=5).stdout.strip()
+    except Exception:
+        return ""
+
+
+def run_all(scale: float = 1.0, only: "str | None" = None, hl_frames_file: "str | None" = None) -> dict:
+    results = {}
+    level, log.level = log.level, max(log.level, WARN)  # per-event INFO records would dominate
+    try:
+        for name, fn in cases(scale, hl_frames_file).items():
+            if only and only not in name:
+                continue
+            results[name] = fn()
+    finally:
+        log.level = level
+    return {
+        "meta": {
+            "seed": SEED,
+            "scale": scale,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "git": _git_rev(),
+            "time": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        },
+        "results": results,
+    }
+
+
+@click.command()
+@click.option("--out", default=None, help="Also write the JSON report to this file")
+@click.option("--scale", type=float, default=1.0, help="Multiply every case's event count")
+@click.option("-k", "only", default=None, help="Only cases whose name contains this")
+@click.option("--hl-frames", default=None, help="Captured Hyperliquid WS text frames, one per line")
+def main(out, scale, only, hl_frames):
+    report = run_all(scale, only, hl_frames)
+    text = json.dumps(report, indent=2)
+    if out:
+        Path(out).write_text(text + "\n")
+    click.echo(text)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,15 @@
 # src/spl_adapter_drift/__init__.py
 
-from .adapter import DriftAdapter, DriftExecutionLive
+# The adapter needs driftpy/solana; they load on first use of these names, so
+# the driftpy-free modules (execution_live, market_data, stream, fields)
+# import on their own.
 
 __all__ = ["DriftAdapter", "DriftExecutionLive"]
 __version__ = "0.1.0"
+
+
+def __getattr__(name):
+    if name in __all__:
+        from . import adapter
+        return getattr(adapter, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
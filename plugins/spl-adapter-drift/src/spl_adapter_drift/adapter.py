@@ -1,12 +1,17 @@
 # plugins/spl-adapter-drift/src/spl_adapter_drift/adapter.py
-from driftpy.drift_client import DriftClient
-from driftpy.accounts import AccountSubscriptionConfig
-from solana.rpc.async_api import AsyncClient
-from anchorpy import Wallet
-from solders.keypair import Keypair
-from driftpy.constants.config import configs
+try:  # driftpy + solana stack, only needed to connect (a DriftAdapter can be handed a client)
+    from driftpy.drift_client import DriftClient
+    from driftpy.accounts import AccountSubscriptionConfig
+    from solana.rpc.async_api import AsyncClient
+    from anchorpy import Wallet
+    from solders.keypair import Keypair
+    from driftpy.constants.config import configs
+except ImportError:
+    DriftClient = AccountSubscriptionConfig = AsyncClient = Wallet = Keypair = configs = None
 
+from .async_bridge import AsyncBridge
 from .execution_live import DriftExecutionLive
+from .market_data import DriftMarketData
 
 # Central entry point used by CLI resolver
 
@@ -44,10 +49,22 @@ class SymbolMaps:
         return self._Lots(base_prec, price_prec)
 
 class DriftAdapter:
-    def __init__(self, cfg: dict):
+    """
+    One DriftClient, subscribed on one AsyncBridge loop, shared by market_data()
+    and execution_live(). dc/symbols/bridge: an already-built client, its
+    symbol maps and loop, instead of connecting from cfg.
+    """
+    def __init__(self, cfg: dict, dc=None, symbols=None, bridge: AsyncBridge | None = None):
         self.cfg = cfg
         env = cfg.get("network", "mainnet")
-        self.syms = SymbolMaps(env)
+        if dc is not None:
+            self.syms = symbols
+            self.dc = dc
+            self.bridge = bridge or AsyncBridge()
+            return
+        if DriftClient is None:
+            raise RuntimeError("the Drift adapter needs driftpy (pip install -e plugins/spl-adapter-drift)")
+        self.syms = symbols or SymbolMaps(env)
 
         http = cfg["rpc"]["url"]
         ws   = cfg["rpc"].get("ws")
@@ -60,14 +77,19 @@ class DriftAdapter:
         sub = AccountSubscriptionConfig(type="websocket", commitment=commitment)
 
         self.dc = DriftClient(conn, wallet=wallet, env=env, account_subscription=sub)
-        # subscribe up-front
-        import asyncio
-        loop = asyncio.get_event_loop()
-        loop.run_until_complete(self.dc.subscribe())
+        # subscribe up-front, on the loop the executor later submits orders on
+        self.bridge = AsyncBridge()
+        self.bridge.run(self.dc.subscribe())
 
     # ---- expose live execution that satisfies your IExecutionBackend
     def execution_live(self):
-        return DriftExecutionLive(self.dc, self.syms.index_of, self.syms.lots)
+        return DriftExecutionLive(self.dc, self.syms.index_of, self.syms.lots, bridge=self.bridge,
+                                  max_in_flight=int(self.cfg.get("max_in_flight", 16)),
+                                  max_ixs_per_tx=int(self.cfg.get("max_ixs_per_tx", 6)))
 
-    # (optional) expose a market-data impl matching your IMarketData later
+    # ---- market data for `spl run` (build_market): streams account updates by default
+    def market_data(self):
+        """[drift] md_mode = "stream" (websocket account cache, default) | "poll"; poll_sec for polling."""
+        return DriftMarketData(self, self.syms, poll_sec=float(self.cfg.get("poll_sec", 0.5)),
+                               mode=self.cfg.get("md_mode", "stream"))
 
@@ -1,21 +1,54 @@
 # plugins/spl-adapter-drift/src/spl_adapter_drift/execution_live.py
 from __future__ import annotations
-import time, hashlib
+import time, hashlib, inspect, itertools, threading
+from collections import deque
 from typing import Iterable, List
 from spltrader.core.interfaces import IExecutionBackend  # your Protocol
-from spltrader.core.types import Quote, Trade, OrderReq, Fill, AccountSnapshot, Side, OrdType
+from spltrader.core.types import Quote, Trade, OrderReq, Fill, AccountSnapshot, OrderAck, Side, OrdType
+from .async_bridge import AsyncBridge
 
 # Implements live execution backend matching IExecutionBackend
 # Responsibilities:
 # -Place/cancel real Drift orders.
 # -Return account snapshot via DriftPy.
 # -Translate OrderReq → DriftClient.place_perp_order(...).
+#
+# Submission is pipelined: place()/cancel() schedule the DriftClient call on
+# the bridge loop (the one the client was subscribed on) and return at once,
+# so the engine thread never waits on an RPC round trip. Each submission ends
+# in an OrderAck (ok with the tx signature, or the error) that the engine
+# drains through poll_acks(). At most `max_in_flight` places are outstanding;
+# past that place() rejects immediately with a failed ack rather than queueing
+# orders against stale prices. snapshot() serves the last fetched account and
+# refreshes it in the background.
+#
+# place_many() (the engine hands over each tick's orders in one call) packs
+# the orders into multi-instruction transactions of up to `max_ixs_per_tx`
+# instructions. An order with meta["replaces"] = old client id puts the
+# cancel-by-user-id instruction right before its place in the same
+# transaction, so the requote is atomic: both land or neither does, and
+# there is no gap with nothing on the book. A lone plain order still goes
+# through place_perp_order().
 
 def _u64_from_client_id(s: str) -> int:
     # Drift expects u64 for client_order_id. Hash string → 64-bit int.
     h = hashlib.blake2b(s.encode(), digest_size=8).digest()
     return int.from_bytes(h, "big", signed=False)
 
+def _u64(client_id: str) -> int:
+    # numeric ids are sent as-is when they fit; longer ones hash like any other string
+    if client_id.isascii() and client_id.isdigit():
+        n = int(client_id)
+        if n < 2**64:
+            return n
+    return _u64_from_client_id(client_id)
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+async def _maybe_await(v):
+    return (await v) if inspect.isawaitable(v) else v
+
 class DriftExecutionLive(IExecutionBackend):
     """
     Exchange-specific live executor for Drift that satisfies your IExecutionBackend.
@@ -23,48 +56,162 @@ class DriftExecutionLive(IExecutionBackend):
       - dc: driftpy.DriftClient (already subscribed)
       - index_of(symbol) -> market_index
       - lots(symbol).base(sz)->int, lots(symbol).price(px)->int
+      - bridge: the AsyncBridge whose loop dc lives on (a fresh one if omitted)
     """
-    def __init__(self, dc, index_of, lots):
+    blocking = False  # place/cancel are pipelined onto the bridge's loop, never awaited here
+
+    def __init__(self, dc, index_of, lots, bridge: AsyncBridge | None = None, max_in_flight: int = 16,
+                 max_ixs_per_tx: int = 6):
         self.dc = dc
         self.index_of = index_of
         self.lots = lots
+        self.bridge = bridge or AsyncBridge()
+        self.max_in_flight = max_in_flight
+        self.max_ixs_per_tx = max_ixs_per_tx   # Solana's 1232-byte packet limit
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._acks: deque = deque()        # appended on the loop thread, drained by poll_acks()
+        self._ids = itertools.count(1)
+        self._symbol_of: dict = {}         # client id -> symbol of accepted places, for cancel acks
+        self._snap: AccountSnapshot | None = None
+        self._snap_pending = False
 
     def place(self, req: OrderReq) -> str:
+        return self.place_many([req])[0]
+
+    def place_many(self, reqs: List[OrderReq]) -> List[str]:
+        """Submit one engine tick's orders as few transactions as possible; returns their client ids."""
+        ids, batch, n_ixs = [], [], 0
+        for req in reqs:
+            cid, item = self._admit(req)
+            ids.append(cid)
+            if item is None:
+                continue
+            size = 2 if item[3] else 1
+            if batch and n_ixs + size > self.max_ixs_per_tx:
+                self._send(batch)
+                batch, n_ixs = [], 0
+            batch.append(item)
+            n_ixs += size
+        if batch:
+            self._send(batch)
+        return ids
+
+    def _admit(self, req: OrderReq):
+        """(client id, batch item), or (client id, None) after queueing a rejected ack."""
+        cid = req.client_id or f"drift-{next(self._ids)}"
+        try:
+            params = self._order_params(req, cid)
+        except Exception as e:
+            self._acks.append(OrderAck(_now_ms(), cid, req.symbol, False, error=repr(e)))
+            return cid, None
+        with self._lock:
+            full = self._in_flight >= self.max_in_flight
+            if not full:
+                self._in_flight += 1
+        if full:
+            self._acks.append(OrderAck(_now_ms(), cid, req.symbol, False,
+                                       error=f"in-flight limit {self.max_in_flight} reached"))
+            return cid, None
+        self._symbol_of[cid] = req.symbol
+        replaces = (req.meta or {}).get("replaces") or ""
+        return cid, (cid, req.symbol, params, replaces)
+
+    def _send(self, batch: list) -> None:
+        cid, symbol, params, replaces = batch[0]
+        if len(batch) == 1 and not replaces:
+            self.bridge.create_task(self._place(cid, symbol, params))
+        else:
+            self.bridge.create_task(self._place_ixs(batch))
+
+    def _order_params(self, req: OrderReq, cid: str) -> dict:
         idx = self.index_of(req.symbol)
         base_lots = self.lots(req.symbol).base(abs(req.sz))
         px_lots = None if (req.type == OrdType.MARKET or req.px is None) else self.lots(req.symbol).price(req.px)
         direction = "long" if req.side == Side.BUY else "short"
 
-        client_order_id = _u64_from_client_id(req.client_id) if req.client_id else 0
-
         # TIF mapping (simple): GTC default; IOC if tif == "IOC"; post-only via meta flag
-        order_type = None  # let SDK default; adjust if your driftpy exposes it
         immediate_or_cancel = (req.tif.upper() == "IOC")
         post_only = bool((req.meta or {}).get("post_only", False))
         reduce_only = bool((req.meta or {}).get("reduce_only", False))
 
         # NOTE: adapt parameter names to your driftpy version as needed.
-        sig = self.dc._loop.run_until_complete(self.dc.place_perp_order(
+        return dict(
             market_index=idx,
             base_asset_amount=base_lots,
             price=px_lots,
             direction=direction,
             reduce_only=reduce_only,
-            client_order_id=client_order_id,
+            client_order_id=_u64(cid),
             immediate_or_cancel=immediate_or_cancel,
             post_only=post_only,
-            # order_type=order_type,  # include only if your version supports it
-        ))
-        # Prefer returning your own client_id for deterministic cancel
-        return req.client_id or str(client_order_id or sig)
+            # order_type=...,  # include only if your version supports it
+        )
+
+    async def _place(self, cid: str, symbol: str, params: dict) -> None:
+        try:
+            sig = await self.dc.place_perp_order(**params)
+            self._acks.append(OrderAck(_now_ms(), cid, symbol, True, ref=str(sig)))
+        except Exception as e:
+            self._symbol_of.pop(cid, None)
+            self._acks.append(OrderAck(_now_ms(), cid, symbol, False, error=repr(e)))
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def _place_ixs(self, batch: list) -> None:
+        # one transaction: [cancel old,] place per item, all landing or none
+        dc = self.dc
+        try:
+            ixs = []
+            for cid, symbol, params, replaces in batch:
+                if replaces:
+                    ixs.append(await _maybe_await(dc.get_cancel_order_by_user_id_ix(_u64(replaces))))
+                ixs.append(await _maybe_await(dc.get_place_perp_order_ix(**params)))
+            sig = str(await dc.send_ixs(ixs))
+            ok, error = True, ""
+        except Exception as e:
+            sig, ok, error = "", False, repr(e)
+        ts = _now_ms()
+        for cid, symbol, params, replaces in batch:
+            if replaces:
+                if ok:
+                    self._symbol_of.pop(replaces, None)
+                self._acks.append(OrderAck(ts, replaces, symbol, ok, op="cancel", ref=sig, error=error))
+            if not ok:
+                self._symbol_of.pop(cid, None)
+            self._acks.append(OrderAck(ts, cid, symbol, ok, ref=sig, error=error))
+        with self._lock:
+            self._in_flight -= len(batch)
 
     def cancel(self, client_order_id: str) -> bool:
+        """Submits the cancel and returns True; the outcome arrives as an OrderAck(op="cancel")."""
         try:
-            cid = _u64_from_client_id(client_order_id) if not client_order_id.isdigit() else int(client_order_id)
-            self.dc._loop.run_until_complete(self.dc.cancel_order_by_user_id(cid))
-            return True
+            cid = _u64(client_order_id)
         except Exception:
             return False
+        symbol = self._symbol_of.get(client_order_id, "")   # dropped once the cancel lands, kept for a retry
+        self.bridge.create_task(self._cancel(client_order_id, symbol, cid))
+        return True
+
+    async def _cancel(self, client_order_id: str, symbol: str, cid: int) -> None:
+        try:
+            sig = await self.dc.cancel_order_by_user_id(cid)
+            self._symbol_of.pop(client_order_id, None)
+            self._acks.append(OrderAck(_now_ms(), client_order_id, symbol, True, op="cancel", ref=str(sig)))
+        except Exception as e:
+            self._acks.append(OrderAck(_now_ms(), client_order_id, symbol, False, op="cancel", error=repr(e)))
+
+    def poll_acks(self) -> List[OrderAck]:
+        """Acks completed since the last call, oldest first."""
+        acks = self._acks
+        out = []
+        while acks:
+            out.append(acks.popleft())
+        return out
+
+    def in_flight(self) -> int:
+        return self._in_flight
 
     def on_quote(self, q: Quote) -> Iterable[Fill]:
         # Live fills come from exchange/user events; quotes don't generate fills here.
@@ -74,9 +221,26 @@ class DriftExecutionLive(IExecutionBackend):
         return []
 
     def snapshot(self) -> AccountSnapshot:
-        u = self.dc._loop.run_until_complete(self.dc.get_user())
+        # the first call blocks for a real account; later ones return the cached
+        # snapshot and refresh it in the background
+        if self._snap is None:
+            self._snap = self.bridge.run(self._fetch_snapshot())
+        elif not self._snap_pending:
+            self._snap_pending = True
+            self.bridge.create_task(self._refresh_snapshot())
+        return self._snap
+
+    async def _refresh_snapshot(self) -> None:
+        try:
+            self._snap = await self._fetch_snapshot()
+        except Exception:
+            pass  # keep serving the previous one
+        finally:
+            self._snap_pending = False
+
+    async def _fetch_snapshot(self) -> AccountSnapshot:
+        u = await _maybe_await(self.dc.get_user())
         # Map to your AccountSnapshot. Adjust scales to your driftpy version.
-        ts = int(time.time() * 1000)
         balance = float(getattr(u, "total_collateral", 0)) / 1e6  # adjust if needed
         positions = {}  # fill in by iterating dc.get_user_positions() if you like
-        return AccountSnapshot(ts=ts, balance=balance, positions=positions)
+        return AccountSnapshot(ts=_now_ms(), balance=balance, positions=positions)
@@ -0,0 +1,147 @@
+# plugins/spl-adapter-drift/src/spl_adapter_drift/fields.py
+from __future__ import annotations
+
+import inspect
+from importlib.metadata import PackageNotFoundError, version
+from typing import Any, Callable, Dict, NamedTuple, Optional, Sequence, Tuple
+
+from spltrader.core.log import log
+
+# Memoized field resolution for values whose location differs across driftpy
+# releases (mark price, funding, ...).
+#
+# A FieldResolver holds an ordered list of candidates, each "read attribute
+# path P on source object S and scale it". The first read for a key (market
+# index) probes the candidates in order and remembers the winner together with
+# its scale factor; later reads fetch just that one source and walk one path.
+# Once the winner fails `max_failures` reads in a row (raises or reads None)
+# it is dropped and the next read probes again. Winners are keyed by driftpy
+# version as well, so nothing resolved against one release is reused with
+# another.
+#
+#   value = resolver.read(market_index, fetch)     # fetch(source_name) -> object
+
+try:
+    DRIFTPY_VERSION = version("driftpy")
+except PackageNotFoundError:
+    DRIFTPY_VERSION = "unknown"
+
+
+class Candidate(NamedTuple):
+    source: str                       # which object to read, e.g. "oracle" | "market"
+    path: Tuple[str, ...]             # attribute path on it
+    scale: Optional[float] = None     # None: decided at probe (1e-6 if it looks like a 1e6-scaled int)
+    numeric_only: bool = False        # skip values that aren't int/float (e.g. structs)
+
+
+_MISSING = object()
+
+
+class FieldResolver:
+    def __init__(self, name: str, candidates: Sequence[Candidate], max_failures: int = 3):
+        self.name = name
+        self.candidates = tuple(candidates)
+        self.max_failures = max_failures
+        self._winner: Dict[tuple, Tuple[Candidate, float]] = {}
+        self._failures: Dict[tuple, int] = {}
+        self.probes = 0
+
+    def read(self, key: Any, fetch: Callable[[str], Any]) -> Optional[float]:
+        k = (DRIFTPY_VERSION, key)
+        hit = self._winner.get(k)
+        if hit is None:
+            return self._probe(k, fetch)
+        cand, scale = hit
+        try:
+            v = _walk(fetch(cand.source), cand.path)
+            if v is not None:
+                if self._failures:
+                    self._failures.pop(k, None)
+                return float(v) * scale
+        except Exception:
+            pass
+        n = self._failures.get(k, 0) + 1
+        if n < self.max_failures:
+            self._failures[k] = n
+            return None
+        # the winner stopped working: forget it and look again
+        del self._winner[k]
+        self._failures.pop(k, None)
+        log.warn("adapter.drift", event="field_reprobe", field=self.name, key=key, was=_label(cand))
+        return self._probe(k, fetch)
+
+    def resolved(self, key: Any) -> Optional[str]:
+        """Label of the cached accessor for key (None before the first successful probe)."""
+        hit = self._winner.get((DRIFTPY_VERSION, key))
+        return _label(hit[0]) if hit else None
+
+    def _probe(self, k: tuple, fetch: Callable[[str], Any]) -> Optional[float]:
+        self.probes += 1
+        sources: Dict[str, Any] = {}
+        for cand in self.candidates:
+            src = sources.get(cand.source)
+            if src is None:
+                try:
+                    src = fetch(cand.source)
+                except Exception:
+                    src = _MISSING
+                sources[cand.source] = src
+            if src is _MISSING:
+                continue
+            try:
+                v = _walk(src, cand.path)
+            except Exception:
+                continue
+            if v is None or (cand.numeric_only and not isinstance(v, (int, float))):
+                continue
+            try:
+                fv = float(v)
+            except (TypeError, ValueError):
+                continue
+            scale = cand.scale if cand.scale is not None else (1e-6 if fv > 10_000 else 1.0)
+            self._winner[k] = (cand, scale)
+            log.debug("adapter.drift", event="field_resolved", field=self.name, key=k[1], via=_label(cand), scale=scale)
+            return fv * scale
+        return None
+
+
+def awaited(bridge, value):
+    """driftpy accessors are coroutines in some releases and plain reads of the cache in others."""
+    return bridge.run(value) if inspect.isawaitable(value) else value
+
+
+def _walk(obj, path: Tuple[str, ...]):
+    for name in path:
+        obj = getattr(obj, name, None)
+        if obj is None:
+            return None
+    return obj
+
+
+def _label(cand: Candidate) -> str:
+    return ".".join((cand.source, *cand.path))
+
+
+# Perp market mark price: oracle first, then the market's cached mark fields
+MARK_CANDIDATES = (
+    Candidate("market", ("mark_price_twap",)),          # already scaled or needs scaling?
+    Candidate("market", ("mark_price",)),               # cached integer mark
+    Candidate("market", ("last_mark_price_twap",)),     # variant
+    Candidate("market", ("amm", "mark_price")),
+    Candidate("market", ("amm", "last_mark_price_twap")),
+    Candidate("market", ("amm", "oracle_price_twap")),
+)
+PRICE_CANDIDATES = (
+    Candidate("oracle", ("price",), scale=1e-6),        # commonly Pyth prices are 1e6 scaled
+    *MARK_CANDIDATES,
+)
+FUNDING_CANDIDATES = (
+    Candidate("market", ("last_funding_rate",), scale=1.0),
+    Candidate("market", ("last_funding_rate_8h",), scale=1.0),
+    Candidate("market", ("last_funding_rate_per_hour",), scale=1.0),
+    Candidate("market", ("estimated_funding_rate",), scale=1.0),
+    Candidate("market", ("amm", "last_funding_rate"), scale=1.0, numeric_only=True),
+    Candidate("market", ("amm", "last_funding_rate_8h"), scale=1.0, numeric_only=True),
+    Candidate("market", ("amm", "funding_period"), scale=1.0, numeric_only=True),
+    Candidate("market", ("amm", "funding_last_measured"), scale=1.0, numeric_only=True),
+)
@@ -8,23 +8,31 @@
 # plugins/spl-adapter-drift/src/spl_adapter_drift/market_data.py
 from __future__ import annotations
 
-import time
-from typing import Iterable, Generator, Optional
+import queue, time
+from typing import TYPE_CHECKING, Iterable, Generator, Optional
 
 from spltrader.core.interfaces import IMarketData
+from spltrader.core.log import log
 from spltrader.core.types import Quote, Trade
 
 # Local imports from this adapter package
-from .client import DriftHandle
-from .symbols import SymbolMaps
+from .fields import FUNDING_CANDIDATES, MARK_CANDIDATES, PRICE_CANDIDATES, FieldResolver, awaited
+from .stream import DriftAccountFeed
+
+if TYPE_CHECKING:  # both pull in driftpy/solana; only annotations here
+    from .client import DriftHandle
+    from .symbols import SymbolMaps
 
 
 class DriftMarketData(IMarketData):
     """
     Drift-backed market data provider that satisfies your IMarketData Protocol.
 
-    - subscribe_quotes(symbol): yields Quote(ts,bid,ask,bid_sz,ask_sz) by polling a mark/oracle price.
-      * We set bid=ask=mark (or oracle) and sizes to 0.0 (you can wire orderbook later).
+    - subscribe_quotes(symbol): yields Quote(ts,bid,ask,bid_sz,ask_sz) with the oracle (or mark) price.
+      * mode="stream" (default): pushed from the websocket account cache the moment the
+        perp market or oracle account changes (DriftAccountFeed, or any stand-in `feed`).
+      * mode="poll": reads the price every poll_sec.
+      * We set bid=ask=price and sizes to 0.0 (you can wire orderbook later).
     - subscribe_trades(symbol): placeholder generator (no trade tape yet).
     - get_mark_price(symbol): best-effort mark/oracle read.
     - get_funding(symbol): best-effort funding metric (instantaneous or twap) if available.
@@ -34,10 +42,18 @@ class DriftMarketData(IMarketData):
     * To avoid version pin issues, price/funding readers try multiple field names.
     """
 
-    def __init__(self, handle: DriftHandle, symbols: SymbolMaps, poll_sec: float = 0.5):
+    def __init__(self, handle: DriftHandle, symbols: SymbolMaps, poll_sec: float = 0.5,
+                 mode: str = "stream", feed=None):
         self.h = handle           # DriftHandle with .dc (DriftClient) and async bridge
         self.syms = symbols       # SymbolMaps with index_of(...)
         self.poll_sec = float(poll_sec)
+        if mode not in ("stream", "poll"):
+            raise ValueError(f"mode must be 'stream' or 'poll', not {mode!r}")
+        self.mode = mode
+        self.feed = feed          # watch(market_index, on_market, on_oracle); built on first use
+        self._price = FieldResolver("price", PRICE_CANDIDATES)
+        self._funding = FieldResolver("funding", FUNDING_CANDIDATES)
+        self._fetchers: dict = {}
 
     # -------------------------
     # Public API (IMarketData)
@@ -45,10 +61,16 @@ class DriftMarketData(IMarketData):
 
     def subscribe_quotes(self, symbol: str) -> Iterable[Quote]:
         """
-        Simple polling generator. Emits a Quote whenever the price changes
-        (bid=ask=mark/oracle; sizes are 0.0 as we aren't wiring orderbook yet).
+        Emits a Quote whenever the price changes (bid=ask=oracle/mark; sizes are
+        0.0 as we aren't wiring orderbook yet). Streams by default; polls in
+        mode="poll" or when the client has no websocket subscriber to hook.
         """
         idx = self.syms.index_of(symbol)
+        if self.mode == "stream":
+            try:
+                return self._stream_quotes(symbol, idx)
+            except LookupError as e:
+                log.warn("adapter.drift", event="stream_unavailable", symbol=symbol, error=str(e))
 
         def gen() -> Generator[Quote, None, None]:
             last_px: Optional[float] = None
@@ -57,7 +79,7 @@ class DriftMarketData(IMarketData):
                 # Only emit on change (reduces spam)
                 if px is not None and px != last_px:
                     ts = int(time.time() * 1000)
-                    yield Quote(ts=ts, bid=px, ask=px, bid_sz=0.0, ask_sz=0.0)
+                    yield Quote(ts=ts, bid=px, ask=px, bid_sz=0.0, ask_sz=0.0, symbol=symbol)
                     last_px = px
                 time.sleep(self.poll_sec)
 
@@ -86,107 +108,91 @@ class DriftMarketData(IMarketData):
         Returns a *per-period* rate (not annualized). You can scale as needed.
         """
         idx = self.syms.index_of(symbol)
-        mkt = self.h.bridge.run(self.h.dc.get_perp_market_account(idx))
-
-        # Try several likely locations/field names across versions
-        # 1) Direct field on market (e.g., 'last_funding_rate' or 'last_funding_rate_8h')
-        for name in (
-            "last_funding_rate",
-            "last_funding_rate_8h",
-            "last_funding_rate_per_hour",
-            "estimated_funding_rate",
-        ):
-            v = getattr(mkt, name, None)
-            if v is not None:
-                try:
-                    return float(v)
-                except Exception:
-                    pass
-
-        # 2) Funding on amm sub-struct (some versions keep rollups there)
-        amm = getattr(mkt, "amm", None)
-        if amm is not None:
-            for name in (
-                "last_funding_rate",
-                "last_funding_rate_8h",
-                "funding_period",
-                "funding_last_measured",
-            ):
-                v = getattr(amm, name, None)
-                if isinstance(v, (int, float)):
-                    try:
-                        return float(v)
-                    except Exception:
-                        pass
-
-        # 3) Fallback: zero if we can't read it
-        return 0.0
+        # Several likely locations/field names across versions (fields.FUNDING_CANDIDATES),
+        # probed once per market; zero if we can't read it
+        v = self._funding.read(idx, self._fetcher(idx))
+        return 0.0 if v is None else v
 
     # -------------------------
     # Internals
     # -------------------------
 
+    def _stream_quotes(self, symbol: str, market_index: int) -> Iterable[Quote]:
+        """Registers with the account feed now (LookupError if it can't); the generator drains a queue."""
+        if self.feed is None:
+            self.feed = DriftAccountFeed(self.h.dc)
+        q: queue.Queue = queue.Queue(maxsize=10_000)
+        stream = _QuoteStream(symbol, market_index, q)
+        self.feed.watch(market_index, stream.on_market, stream.on_oracle)
+
+        def gen() -> Generator[Quote, None, None]:
+            while True:
+                yield q.get()
+
+        return gen()
+
     def _read_mark_or_oracle(self, market_index: int) -> Optional[float]:
         """
-        Attempts to read a sensible 'mark' price for the perp market.
-        Strategy (robust to DriftPy version variance):
-          1) Try an explicit oracle price accessor if present.
-          2) Try market's cached/mark price fields.
-          3) As a last resort, read oracle price data for the market and scale.
-        Returns None if all attempts fail.
+        A sensible 'mark' price for the perp market: the oracle price if the SDK
+        exposes it, else the market's cached mark fields (fields.PRICE_CANDIDATES).
+        The first read per market probes; later reads make the one call that worked.
+        Returns None if nothing could be read.
         """
-        # 1) Try a convenient SDK helper if available
-        try:
-            # Some versions expose this helper:
-            pd = self.h.bridge.run(self.h.dc.get_oracle_price_data_for_perp_market(market_index))
-            # Commonly Pyth prices are 1e6 scaled
-            if hasattr(pd, "price"):
-                return float(pd.price) / 1_000_000.0
-        except AttributeError:
-            # Helper not available — continue to next attempt
-            pass
-        except Exception:
-            # Accessor failed — continue
-            pass
-
-        # 2) Read market account and look for a cached mark
-        try:
-            mkt = self.h.bridge.run(self.h.dc.get_perp_market_account(market_index))
-
-            # Try common mark/cached fields (different releases use different names)
-            for name in (
-                "mark_price_twap",                # already scaled or needs scaling?
-                "mark_price",                     # cached integer mark
-                "last_mark_price_twap",           # variant
-            ):
-                v = getattr(mkt, name, None)
-                if v is not None:
-                    # Heuristic: if it's a big int, assume 1e6 scaling
-                    fv = float(v)
-                    return fv / 1_000_000.0 if fv > 10_000 else fv
-
-            # Try through amm sub-struct
-            amm = getattr(mkt, "amm", None)
-            if amm is not None:
-                for name in (
-                    "mark_price",                 # integer
-                    "last_mark_price_twap",       # integer
-                    "oracle_price_twap",          # integer
-                ):
-                    v = getattr(amm, name, None)
-                    if v is not None:
-                        fv = float(v)
-                        return fv / 1_000_000.0 if fv > 10_000 else fv
-        except Exception:
-            pass
-
-        # 3) Read oracle price data directly (generic path)
+        return self._price.read(market_index, self._fetcher(market_index))
+
+    def _fetcher(self, market_index: int):
+        f = self._fetchers.get(market_index)
+        if f is None:
+            h = self.h
+
+            def f(source: str):
+                if source == "oracle":
+                    return awaited(h.bridge, h.dc.get_oracle_price_data_for_perp_market(market_index))
+                return awaited(h.bridge, h.dc.get_perp_market_account(market_index))
+
+            self._fetchers[market_index] = f
+        return f
+
+_MARK = FieldResolver("mark", MARK_CANDIDATES)
+
+
+def mark_from_market(mkt, market_index: int = -1) -> Optional[float]:
+    """Cached mark from a perp market account (field names vary across releases; resolved once per market)."""
+    return _MARK.read(market_index, lambda _source: mkt)
+
+
+class _QuoteStream:
+    """Latest oracle/mark per market from account updates; queues a Quote when the price moves."""
+    def __init__(self, symbol: str, market_index: int, q: queue.Queue):
+        self.symbol = symbol
+        self.market_index = market_index
+        self.q = q
+        self.mark: Optional[float] = None
+        self.oracle: Optional[float] = None
+        self.last: Optional[float] = None
+
+    def on_market(self, mkt, slot: int) -> None:
+        self.mark = mark_from_market(mkt, self.market_index)
+        self._emit()
+
+    def on_oracle(self, pd, slot: int) -> None:
+        # Commonly Pyth prices are 1e6 scaled
+        price = getattr(pd, "price", None)
+        self.oracle = float(price) / 1_000_000.0 if price is not None else None
+        self._emit()
+
+    def _emit(self) -> None:
+        px = self.oracle if self.oracle is not None else self.mark
+        if px is None or px == self.last:
+            return
+        self.last = px
+        quote = Quote(ts=int(time.time() * 1000), bid=px, ask=px, bid_sz=0.0, ask_sz=0.0, symbol=self.symbol)
         try:
-            pd = self.h.bridge.run(self.h.dc.get_oracle_price_data_for_perp_market(market_index))
-            if hasattr(pd, "price"):
-                return float(pd.price) / 1_000_000.0
-        except Exception:
-            pass
-
-        # If everything failed, return None
-        return None
+            self.q.put_nowait(quote)
+        except queue.Full:
+            # drop oldest; never block the client's event loop
+            try:
+                self.q.get_nowait()
+            except queue.Empty:
+                pass
+            self.q.put_nowait(quote)
@@ -0,0 +1,61 @@
+# plugins/spl-adapter-drift/src/spl_adapter_drift/stream.py
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List
+
+# Push notifications from the DriftClient's websocket account cache.
+#
+# With AccountSubscriptionConfig(type="websocket") (see client.py) driftpy
+# keeps one WebsocketAccountSubscriber per perp market and per oracle, and
+# each stores every new account version through its _update_data(). The feed
+# wraps that method on the subscribers of the markets being watched, so
+# listeners run (on the client's event loop) as soon as a new version lands:
+#
+#   feed.watch(market_index, on_market, on_oracle)
+#   on_market(perp_market_account, slot) / on_oracle(oracle_price_data, slot)
+#
+# Anything with the same watch() signature can stand in for it (tests feed
+# account versions by hand).
+
+Listener = Callable[[Any, int], None]
+
+
+class DriftAccountFeed:
+    def __init__(self, dc):
+        self.dc = dc
+        self._listeners: Dict[int, List[Listener]] = {}   # id(subscriber) -> listeners
+
+    def watch(self, market_index: int, on_market: Listener, on_oracle: Listener) -> None:
+        """Raises LookupError when the client has no websocket subscriber for the market or its oracle."""
+        sub = getattr(self.dc, "account_subscriber", None)
+        perp = getattr(sub, "perp_market_subscribers", {}).get(market_index)
+        if perp is None:
+            raise LookupError(f"no websocket subscriber for perp market {market_index}")
+        oracle_key = perp.data_and_slot.data.amm.oracle
+        oracles = getattr(sub, "oracle_subscribers", {})
+        oracle = oracles.get(oracle_key) or oracles.get(str(oracle_key))
+        if oracle is None:
+            raise LookupError(f"no websocket subscriber for the oracle of perp market {market_index}")
+        self._hook(perp, on_market)
+        self._hook(oracle, on_oracle)
+        # current versions, so a quote goes out without waiting for the next update
+        for s, fn in ((perp, on_market), (oracle, on_oracle)):
+            das = s.data_and_slot
+            if das is not None:
+                fn(das.data, das.slot)
+
+    def _hook(self, subscriber, listener: Listener) -> None:
+        listeners = self._listeners.get(id(subscriber))
+        if listeners is None:
+            listeners = self._listeners[id(subscriber)] = []
+            store = subscriber._update_data
+
+            def _update_data(new_data, _store=store, _sub=subscriber, _listeners=listeners):
+                _store(new_data)
+                das = _sub.data_and_slot
+                if das is not None:
+                    for fn in _listeners:
+                        fn(das.data, das.slot)
+
+            subscriber._update_data = _update_data
+        listeners.append(listener)
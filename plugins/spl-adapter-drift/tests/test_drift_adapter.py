@@ -0,0 +1,36 @@
+import pytest
+
+pytest.importorskip("spl_adapter_drift")   # the plugin's own venv; driftpy itself is not needed
+
+from spltrader.cli.main import build_market
+from spl_adapter_drift.adapter import DriftAdapter
+from spl_adapter_drift.market_data import DriftMarketData
+
+
+class FakeSymbols:
+    def index_of(self, symbol):
+        return {"SOL-PERP": 0}[symbol]
+
+
+class FakeFeed:
+    def __init__(self):
+        self.watched = []
+
+    def watch(self, market_index, on_market, on_oracle):
+        self.watched.append(market_index)
+        self.on_oracle = on_oracle
+
+
+def test_spl_run_gets_the_streaming_market_data():
+    adapter = DriftAdapter({"network": "devnet"}, dc=object(), symbols=FakeSymbols(), bridge=object())
+    market = build_market({"exchange": "drift"}, adapter)
+    assert isinstance(market, DriftMarketData) and market.mode == "stream"
+    assert market.h is adapter and market.syms is adapter.syms   # the adapter's one client and bridge
+
+    market.feed = FakeFeed()
+    market.subscribe_quotes("SOL-PERP")
+    assert market.feed.watched == [0]                             # went down the stream path, not polling
+
+    polled = DriftAdapter({"md_mode": "poll", "poll_sec": 2}, dc=object(), symbols=FakeSymbols(), bridge=object())
+    md = build_market({"exchange": "drift"}, polled)
+    assert (md.mode, md.poll_sec) == ("poll", 2.0)
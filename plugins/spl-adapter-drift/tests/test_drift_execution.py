@@ -0,0 +1,164 @@
+import asyncio
+import time
+
+import pytest
+
+pytest.importorskip("spl_adapter_drift")   # the plugin's own venv; driftpy itself is not needed
+
+from spltrader.core.types import OrderReq, OrdType, Side
+from spl_adapter_drift.async_bridge import AsyncBridge
+from spl_adapter_drift.execution_live import DriftExecutionLive
+
+
+class Lots:
+    def base(self, sz):
+        return int(sz * 1000)
+
+    def price(self, px):
+        return int(px * 1_000_000)
+
+
+class MockDriftClient:
+    """Async place/cancel that complete only when the test releases them."""
+    def __init__(self, loop):
+        self.loop = loop
+        self.gate = asyncio.Event()
+        self.placed = []
+        self.sent = []
+        self.fail_tx = False
+        self.fail_cancel = False
+
+    def release(self):
+        self.loop.call_soon_threadsafe(self.gate.set)
+
+    async def place_perp_order(self, **params):
+        self.placed.append(params)
+        await self.gate.wait()
+        if params["price"] is not None and params["price"] <= 0:
+            raise RuntimeError("invalid price")
+        return f"sig{len(self.placed)}"
+
+    def get_place_perp_order_ix(self, **params):          # sync in some driftpy releases
+        return ("place", params["client_order_id"])
+
+    async def get_cancel_order_by_user_id_ix(self, cid):
+        return ("cancel", cid)
+
+    async def send_ixs(self, ixs):
+        self.sent.append(ixs)
+        await self.gate.wait()
+        if self.fail_tx:
+            raise RuntimeError("tx failed")
+        return f"tx{len(self.sent)}"
+
+    async def cancel_order_by_user_id(self, cid):
+        await self.gate.wait()
+        if self.fail_cancel:
+            raise RuntimeError("blockhash expired")
+        return "sigc"
+
+    async def get_user(self):
+        return type("User", (), {"total_collateral": 5_000_000})()
+
+
+def req(cid, px=100.0, replaces=None):
+    return OrderReq(cid, "SOL-PERP", Side.BUY, OrdType.LIMIT, px, 0.5, "GTC",
+                    {"replaces": replaces} if replaces else None)
+
+
+def wait_acks(ex, n, timeout=2.0):
+    acks, deadline = [], time.monotonic() + timeout
+    while len(acks) < n and time.monotonic() < deadline:
+        acks += ex.poll_acks()
+        time.sleep(0.001)
+    return acks
+
+
+@pytest.fixture
+def setup():
+    bridge = AsyncBridge()
+    dc = MockDriftClient(bridge._loop)
+    yield DriftExecutionLive(dc, index_of=lambda s: 0, lots=lambda s: Lots(), bridge=bridge,
+                             max_in_flight=2, max_ixs_per_tx=3), dc
+    dc.release()
+    bridge.stop()
+
+
+def test_place_returns_before_the_exchange_answers(setup):
+    ex, dc = setup
+    assert ex.place(req("a")) == "a"
+    assert ex.place(req("b", px=-1.0)) == "b"
+    assert ex.poll_acks() == [] and ex.in_flight() == 2
+
+    rejected = ex.place(req("c"))             # over the cap: rejected without touching the client
+    [ack] = ex.poll_acks()
+    assert (ack.client_id, ack.ok) == (rejected, False) and "in-flight" in ack.error
+
+    dc.release()
+    acks = {a.client_id: a for a in wait_acks(ex, 2)}
+    assert acks["a"].ok and acks["a"].ref.startswith("sig")
+    assert not acks["b"].ok and "invalid price" in acks["b"].error
+    assert ex.in_flight() == 0
+    assert [p["direction"] for p in dc.placed] == ["long", "long"]
+
+
+def test_cancel_and_snapshot_are_pipelined(setup):
+    ex, dc = setup
+    ex.place(req("a"))
+    assert ex.cancel("a") is True
+    assert ex.snapshot().balance == 5.0       # first snapshot is fetched
+    dc.release()
+    acks = wait_acks(ex, 2)
+    cancel = next(a for a in acks if a.op == "cancel")
+    assert (cancel.ok, cancel.client_id, cancel.symbol) == (True, "a", "SOL-PERP")
+
+
+def test_failed_cancel_keeps_the_order_for_a_retry(setup):
+    ex, dc = setup
+    ex.place(req("a"))
+    dc.release()
+    wait_acks(ex, 1)
+    dc.fail_cancel = True
+    ex.cancel("a")
+    [failed] = wait_acks(ex, 1)
+    dc.fail_cancel = False
+    ex.cancel("a")
+    [retried] = wait_acks(ex, 1)
+    assert [(a.ok, a.symbol) for a in (failed, retried)] == [(False, "SOL-PERP"), (True, "SOL-PERP")]
+
+
+def test_tick_orders_and_replaces_share_transactions(setup):
+    ex, dc = setup
+    ex.max_in_flight = 10
+    ids = ex.place_many([req("bid"), req("ask"), req("bid2", replaces="bid"), req("ask2", replaces="ask")])
+    assert ids == ["bid", "ask", "bid2", "ask2"] and ex.poll_acks() == []
+    dc.release()
+    acks = wait_acks(ex, 6)
+    # 2 + 2 + 2 instructions against a limit of 3 per transaction
+    assert [[op for op, _ in tx] for tx in dc.sent] == [["place", "place"], ["cancel", "place"], ["cancel", "place"]]
+    assert dc.sent[1][0] == ("cancel", dc.sent[0][0][1])         # cancel-by-user-id of the replaced order
+    assert dc.placed == []                                        # nothing went out as a lone place
+    assert {(a.op, a.client_id) for a in acks if a.ok} == {
+        ("place", "bid"), ("place", "ask"), ("cancel", "bid"), ("place", "bid2"), ("cancel", "ask"), ("place", "ask2")}
+
+
+def test_failed_replace_rejects_both_halves(setup):
+    ex, dc = setup
+    dc.fail_tx = True
+    ex.place(req("new", replaces="old"))
+    dc.release()
+    acks = wait_acks(ex, 2)
+    assert [(a.op, a.client_id, a.ok) for a in acks] == [("cancel", "old", False), ("place", "new", False)]
+    assert ex.in_flight() == 0
+
+
+def test_numeric_client_ids_too_big_for_u64_are_hashed(setup):
+    ex, dc = setup
+    ex.max_in_flight = 10
+    big = str(2**64)
+    ex.place_many([req("7"), req(big), req("8", replaces=big)])
+    dc.release()
+    assert all(a.ok for a in wait_acks(ex, 4))
+    (_, small_id), (_, big_id) = dc.sent[0][:2]
+    assert small_id == 7 and big_id < 2**64
+    assert ("cancel", big_id) in dc.sent[0] + dc.sent[1]        # cancel-by-user-id hashes the same way
@@ -0,0 +1,90 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("spl_adapter_drift")   # the plugin's own venv; driftpy itself is not needed
+
+from spl_adapter_drift.fields import Candidate, FieldResolver
+from spl_adapter_drift.market_data import DriftMarketData
+
+
+class Calls:
+    """fetch(source) over fixed objects, counting calls per source."""
+    def __init__(self, **sources):
+        self.sources = sources
+        self.n = {}
+
+    def __call__(self, source):
+        self.n[source] = self.n.get(source, 0) + 1
+        obj = self.sources[source]
+        if isinstance(obj, Exception):
+            raise obj
+        return obj
+
+
+CANDS = (
+    Candidate("oracle", ("price",), scale=1e-6),
+    Candidate("market", ("mark_price",)),
+    Candidate("market", ("amm", "oracle_price_twap")),
+)
+
+
+def test_probe_once_then_single_read():
+    r = FieldResolver("price", CANDS)
+    fetch = Calls(oracle=AttributeError("no helper"), market=SimpleNamespace(amm=SimpleNamespace(oracle_price_twap=150_000_000)))
+    assert r.read(0, fetch) == pytest.approx(150.0)
+    assert r.resolved(0) == "market.amm.oracle_price_twap"
+    assert fetch.n == {"oracle": 1, "market": 1}      # each source fetched once while probing
+    for _ in range(10):
+        assert r.read(0, fetch) == pytest.approx(150.0)
+    assert r.probes == 1
+    assert fetch.n == {"oracle": 1, "market": 11}     # steady state: one call, no probing
+
+
+def test_failing_winner_is_reprobed():
+    r = FieldResolver("price", CANDS, max_failures=2)
+    mkt = SimpleNamespace(mark_price=101.5)
+    fetch = Calls(oracle=SimpleNamespace(price=100_000_000), market=mkt)
+    assert r.read(7, fetch) == pytest.approx(100.0) and r.resolved(7) == "oracle.price"
+    fetch.sources["oracle"] = RuntimeError("rpc down")
+    assert r.read(7, fetch) is None                   # first failure: winner kept
+    assert r.read(7, fetch) == pytest.approx(101.5)   # second: dropped and re-probed
+    assert r.resolved(7) == "market.mark_price" and r.probes == 2
+    assert r.read(8, fetch) == pytest.approx(101.5)   # other markets probe for themselves
+    assert r.probes == 3
+
+
+class FakeDC:
+    def __init__(self, mkt, oracle=None):
+        self.mkt, self.oracle, self.calls = mkt, oracle, []
+
+    def get_perp_market_account(self, idx):           # sync cache read (newer driftpy)
+        self.calls.append(("market", idx))
+        return self.mkt
+
+    async def get_oracle_price_data_for_perp_market(self, idx):   # coroutine (older driftpy)
+        self.calls.append(("oracle", idx))
+        if self.oracle is None:
+            raise AttributeError("oracle helper")
+        return self.oracle
+
+
+class FakeBridge:
+    def run(self, coro):
+        try:
+            coro.send(None)
+        except StopIteration as stop:
+            return stop.value
+
+
+def test_market_data_reads_price_and_funding_through_resolvers():
+    dc = FakeDC(SimpleNamespace(mark_price=150_250_000, last_funding_rate=0.0001,
+                                amm=SimpleNamespace(funding_period=3600)),
+                oracle=SimpleNamespace(price=150_000_000))
+    md = DriftMarketData(handle=SimpleNamespace(dc=dc, bridge=FakeBridge()),
+                         symbols=SimpleNamespace(index_of=lambda s: 3), mode="poll")
+    assert md.get_mark_price("SOL-PERP") == pytest.approx(150.0)
+    assert md.get_mark_price("SOL-PERP") == pytest.approx(150.0)
+    assert md.get_funding("SOL-PERP") == pytest.approx(0.0001)
+    assert md.get_funding("SOL-PERP") == pytest.approx(0.0001)
+    assert dc.calls == [("oracle", 3), ("oracle", 3), ("market", 3), ("market", 3)]
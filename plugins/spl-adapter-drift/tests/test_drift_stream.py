@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import pytest
+
+pytest.importorskip("spl_adapter_drift")   # the plugin's own venv; driftpy itself is not needed
+
+from spl_adapter_drift.market_data import DriftMarketData
+from spl_adapter_drift.stream import DriftAccountFeed
+
+
+class FakeSymbols:
+    def index_of(self, symbol):
+        return {"SOL-PERP": 0, "BTC-PERP": 1}[symbol]
+
+
+class FakeFeed:
+    """Stand-in account feed: tests push perp market / oracle versions by hand."""
+    def __init__(self):
+        self.listeners = {}
+
+    def watch(self, market_index, on_market, on_oracle):
+        self.listeners[market_index] = (on_market, on_oracle)
+
+    def market(self, idx, mkt, slot=1):
+        self.listeners[idx][0](mkt, slot)
+
+    def oracle(self, idx, price, slot=1):
+        self.listeners[idx][1](SimpleNamespace(price=price), slot)
+
+
+def test_stream_emits_on_account_changes_only():
+    feed = FakeFeed()
+    md = DriftMarketData(handle=None, symbols=FakeSymbols(), feed=feed)
+    sol, btc = md.subscribe_quotes("SOL-PERP"), md.subscribe_quotes("BTC-PERP")
+
+    feed.market(0, SimpleNamespace(mark_price=151_000_000))   # no oracle yet: mark
+    feed.oracle(0, 150_000_000)                               # oracle wins once known
+    feed.oracle(0, 150_000_000, slot=2)                       # unchanged: no quote
+    feed.oracle(1, 60_000_000_000)
+    feed.oracle(0, 150_500_000, slot=3)
+
+    assert [next(sol).bid for _ in range(3)] == [151.0, 150.0, 150.5]
+    q = next(btc)
+    assert (q.symbol, q.bid, q.ask) == ("BTC-PERP", 60_000.0, 60_000.0)
+
+
+class FakeSubscriber:
+    """Shape of driftpy's WebsocketAccountSubscriber: _update_data stores into data_and_slot."""
+    def __init__(self, data, slot=1):
+        self.data_and_slot = SimpleNamespace(data=data, slot=slot)
+
+    def _update_data(self, new_data):
+        self.data_and_slot = new_data
+
+
+def test_account_feed_hooks_websocket_subscribers():
+    oracle_key = "Oracle111"
+    perp = FakeSubscriber(SimpleNamespace(amm=SimpleNamespace(oracle=oracle_key), mark_price=101_000_000))
+    oracle = FakeSubscriber(SimpleNamespace(price=100_000_000))
+    dc = SimpleNamespace(account_subscriber=SimpleNamespace(
+        perp_market_subscribers={0: perp}, oracle_subscribers={oracle_key: oracle}))
+
+    seen = []
+    DriftAccountFeed(dc).watch(0, lambda m, s: seen.append(("market", s)), lambda p, s: seen.append(("oracle", p.price, s)))
+    assert seen == [("market", 1), ("oracle", 100_000_000, 1)]   # current versions first
+
+    oracle._update_data(SimpleNamespace(data=SimpleNamespace(price=100_100_000), slot=7))
+    assert seen[-1] == ("oracle", 100_100_000, 7)
+    assert oracle.data_and_slot.slot == 7                          # the original store still runs
+
+    with pytest.raises(LookupError):
+        DriftAccountFeed(dc).watch(5, print, print)
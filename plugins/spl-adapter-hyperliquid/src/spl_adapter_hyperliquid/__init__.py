@@ -1,6 +1,9 @@
 # src/spl_adapter_hyperliquid/__init__.py
 
-from .adapter import HyperliquidMarket
+from .adapter import HyperliquidMarket, AsyncHyperliquidMarket
+from .book import L2Book
+from .backend import HyperliquidExec
+from .user_feed import HyperliquidUserFeed
 
-__all__ = ["HyperliquidMarket"]
+__all__ = ["HyperliquidMarket", "AsyncHyperliquidMarket", "L2Book", "HyperliquidExec", "HyperliquidUserFeed"]
 __version__ = "0.1.0"
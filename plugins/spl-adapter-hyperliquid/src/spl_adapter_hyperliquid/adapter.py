@@ -1,37 +1,37 @@
-import threading, json, queue, time
-from dataclasses import dataclass
-from typing import Iterable, Optional
+import asyncio, itertools, re, threading, json, queue, time
+from typing import AsyncIterator, Callable, Iterable, Optional
 import anyio
 import websockets
 import orjson
 
-from spl.core.types import Quote, Trade, Side
+from spltrader.core.batch import TradeBatch
+from spltrader.core.types import Quote, Trade, Side
+from spltrader.core.log import log
+from spltrader.core.metrics import metrics
+from .book import L2Book
 
 HL_MAINNET_WS = "wss://api.hyperliquid.xyz/ws"
 HL_TESTNET_WS = "wss://api.hyperliquid-testnet.xyz/ws"
 
 
-@dataclass(frozen=True)
-class _SubSpec:
-    type: str           # "trades" | "l2Book"
-    coin: str           # e.g., "SOL"
-    n_levels: Optional[int] = None  # for l2Book; defaults to 20 on server
-
-
 class HyperliquidMarket:
     """
     Bridges Hyperliquid WS -> blocking generators for Engine.subscribe_*.
-    Uses a background task per stream that pushes into Queue.
+    One background thread runs one event loop with a HyperliquidFeed that
+    carries every subscribed symbol and pushes into per-symbol Queues.
     """
     def __init__(self, cfg: dict):
         self.cfg = cfg
         self.net = cfg.get("network", "mainnet")  # "mainnet" | "testnet"
-        self.ws_url = HL_TESTNET_WS if self.net == "testnet" else HL_MAINNET_WS
+        self.ws_url = cfg.get("ws_url") or (HL_TESTNET_WS if self.net == "testnet" else HL_MAINNET_WS)
         self._lock = threading.Lock()
         self._q_quotes: dict[str, queue.Queue] = {}
         self._q_trades: dict[str, queue.Queue] = {}
         self._threads: list[threading.Thread] = []
-        print("Hyperliquid Network: ", self.net)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._feed = HyperliquidFeed(self.ws_url, connections=int(cfg.get("ws_connections", 1)),
+                                     depth=int(cfg.get("book_depth", 20)))
+        log.info("adapter.hyperliquid", network=self.net)
 
     def _ensure_queues(self, symbol: str) -> None:
         self._q_quotes.setdefault(symbol, queue.Queue(maxsize=10_000))
@@ -42,125 +42,363 @@ class HyperliquidMarket:
         """
         symbol: your internal like "SOL-PERP" -> we map to HL coin "SOL".
         """
-        coin = _to_hl_coin(symbol)
-        self._ensure_stream(symbol, coin)
+        self._ensure_stream(symbol)
         q = self._q_quotes[symbol]
         while True:
             yield q.get()  # blocks until new Quote
 
     def subscribe_trades(self, symbol: str) -> Iterable[Trade]:
-        coin = _to_hl_coin(symbol)
-        self._ensure_stream(symbol, coin)
+        self._ensure_stream(symbol)
         q = self._q_trades[symbol]
         while True:
             yield q.get()
 
     # --- internals ---
-    def _ensure_stream(self, symbol: str, coin: str) -> None:
-        tag = f"{symbol}::{coin}"
+    def _ensure_stream(self, symbol: str) -> None:
         with self._lock:
-            if any(t.name == tag for t in self._threads):
+            if symbol in self._q_quotes:
                 return
-            # make sure both queues exist BEFORE starting the worker
+            # make sure both queues exist BEFORE the feed can route to them
             self._ensure_queues(symbol)
-            t = threading.Thread(target=self._ws_worker, name=tag, args=(symbol, coin), daemon=True)
-            t.start()
-            self._threads.append(t)
+            q_quotes, q_trades = self._q_quotes[symbol], self._q_trades[symbol]
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                t = threading.Thread(target=self._loop.run_forever, name="hyperliquid-ws", daemon=True)
+                t.start()
+                self._threads.append(t)
+            self._loop.call_soon_threadsafe(
+                self._feed.add, symbol,
+                lambda q: _q_put(q_quotes, q),
+                lambda t: _q_put(q_trades, t),
+            )
+
+    def book(self, symbol: str) -> Optional[L2Book]:
+        """Local depth book for a subscribed symbol (top-N, microprice, depth-to-notional)."""
+        return self._feed.book(symbol)
 
+    def get_mark_price(self, symbol: str) -> float:
+        return _book_mid(self._feed, symbol)
 
-    def _ws_worker(self, symbol: str, coin: str) -> None:
+    def get_funding(self, symbol: str) -> float:
+        return 0.0
+
+    def execution_live(self):
+        """Live backend for mode = "live": orders plus fills streamed from userFills."""
+        from .backend import HyperliquidExec
+        return HyperliquidExec(self.cfg, book=self.book)   # prices market orders off the local book
+
+    def aio(self) -> "AsyncHyperliquidMarket":
         """
-        Runs an anyio event loop in this thread; holds a single WS conn,
-        subscribes to both l2Book and trades for `coin`, and pushes
-        parsed messages to the symbol queues.
+        Async-native twin of this market for AsyncEngine (no threads, no queue.Queue).
+        It drives this market's feed, so book() and the execution_live() backend see
+        the books it subscribes; use one of the two markets per run, not both.
         """
-        anyio.run(self._ws_loop, symbol, coin)
+        return AsyncHyperliquidMarket(self.cfg, feed=self._feed)
+
+
+class AsyncHyperliquidMarket:
+    """
+    Satisfies IAsyncMarketData. The feed runs on the caller's event loop
+    and parsed events go straight into asyncio queues.
+    """
+    def __init__(self, cfg: dict, feed: Optional["HyperliquidFeed"] = None):
+        self.cfg = cfg
+        self.net = cfg.get("network", "mainnet")
+        self.ws_url = cfg.get("ws_url") or (HL_TESTNET_WS if self.net == "testnet" else HL_MAINNET_WS)
+        self._q_quotes: dict[str, asyncio.Queue] = {}
+        self._q_trades: dict[str, asyncio.Queue] = {}
+        self._feed = feed or HyperliquidFeed(self.ws_url, connections=int(cfg.get("ws_connections", 1)),
+                                             depth=int(cfg.get("book_depth", 20)))
+
+    async def subscribe_quotes(self, symbol: str) -> AsyncIterator[Quote]:
+        self._ensure_stream(symbol)
+        q = self._q_quotes[symbol]
+        while True:
+            yield await q.get()
+
+    async def subscribe_trades(self, symbol: str) -> AsyncIterator[Trade]:
+        self._ensure_stream(symbol)
+        q = self._q_trades[symbol]
+        while True:
+            yield await q.get()
+
+    async def get_mark_price(self, symbol: str) -> float:
+        return _book_mid(self._feed, symbol)
+
+    async def get_funding(self, symbol: str) -> float:
+        return 0.0
+
+    def book(self, symbol: str) -> Optional[L2Book]:
+        """Local depth book for a subscribed symbol (top-N, microprice, depth-to-notional)."""
+        return self._feed.book(symbol)
+
+    def _ensure_stream(self, symbol: str) -> None:
+        if symbol in self._q_quotes:
+            return
+        q_quotes = self._q_quotes.setdefault(symbol, asyncio.Queue(maxsize=10_000))
+        q_trades = self._q_trades.setdefault(symbol, asyncio.Queue(maxsize=10_000))
+        self._feed.add(symbol, lambda q: _q_put(q_quotes, q), lambda t: _q_put(q_trades, t))
+
+
+class _Route:
+    __slots__ = ("symbol", "on_quote", "on_trade", "book")
+
+    def __init__(self, symbol: str, on_quote: Callable[[Quote], None], on_trade: Callable[[Trade], None],
+                 book: L2Book):
+        self.symbol = symbol
+        self.on_quote = on_quote
+        self.on_trade = on_trade
+        self.book = book
+
+
+class HyperliquidFeed:
+    """
+    Market data for any number of coins over one event loop and `connections`
+    websockets (coins are spread round-robin). Every frame is decoded once and
+    dispatched by its coin to that symbol's callbacks. Each coin keeps an
+    L2Book of `depth` levels per side; a Quote goes out only when its top of
+    book changes. Shared by the thread-backed and the async market; add()
+    must run on the feed's loop.
+    """
+    def __init__(self, ws_url: str, connections: int = 1, depth: int = 20):
+        self.ws_url = ws_url
+        self.depth = depth
+        self.routes: dict[str, _Route] = {}   # HL coin -> route
+        self._conns = [_WsConn(ws_url, handle_message, self.routes) for _ in range(max(1, connections))]
+
+    def add(self, symbol: str, on_quote: Callable[[Quote], None], on_trade: Callable[[Trade], None]) -> None:
+        coin = _to_hl_coin(symbol)
+        if coin in self.routes:
+            return
+        self.routes[coin] = _Route(symbol, on_quote, on_trade, L2Book(coin, self.depth))
+        self._conns[(len(self.routes) - 1) % len(self._conns)].subscribe(
+            {"type": "trades", "coin": coin}, {"type": "l2Book", "coin": coin})
+
+    def book(self, symbol: str) -> Optional[L2Book]:
+        route = self.routes.get(_to_hl_coin(symbol))
+        return route.book if route is not None else None
+
 
-    async def _ws_loop(self, symbol: str, coin: str) -> None:
-        self._ensure_queues(symbol) 
-        q_quotes = self._q_quotes[symbol]
-        q_trades = self._q_trades[symbol]
-        
+class _WsConn:
+    """
+    One websocket: (re)connects, (re)sends its subscriptions and passes every
+    frame to handle(raw, ctx) (handle_message with the routes table for market
+    data, handle_user_message with the user feed for fills). post() sends a
+    request (signed action or info query) on the same socket and waits for the
+    reply with the same id.
+    """
+    def __init__(self, ws_url: str, handle: Callable, ctx):
+        self.ws_url = ws_url
+        self.handle = handle
+        self.ctx = ctx
+        self.subs: list[dict] = []
+        self._ws = None
+        self._task: Optional[asyncio.Task] = None
+        self._connected = asyncio.Event()
+        self._posts: dict[int, asyncio.Future] = {}
+        self._post_ids = itertools.count(1)
+
+    def subscribe(self, *subs: dict) -> None:
+        self.subs.extend(subs)
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        elif self._ws is not None:
+            asyncio.get_running_loop().create_task(self._send_subs(self._ws, subs))
+
+    async def post(self, request: dict, timeout: float = 10.0) -> dict:
+        """{"type": "action"|"info", "payload": ...} -> the response's {"type": ..., "payload": ...}."""
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run())
+        await asyncio.wait_for(self._connected.wait(), timeout)
+        pid = next(self._post_ids)
+        fut = self._posts[pid] = asyncio.get_running_loop().create_future()
+        try:
+            await self._ws.send(orjson.dumps({"method": "post", "id": pid, "request": request}).decode())
+            return await asyncio.wait_for(fut, timeout)
+        finally:
+            self._posts.pop(pid, None)
+
+    def _on_post(self, raw) -> None:
+        try:
+            data = orjson.loads(raw)["data"]
+            fut = self._posts.get(data["id"])
+        except Exception:
+            return
+        if fut is not None and not fut.done():
+            fut.set_result(data.get("response") or {})
+
+    async def _send_subs(self, ws, subs) -> None:
         # Subscription payloads per HL docs
         # example: {"method":"subscribe","subscription":{"type":"trades","coin":"SOL"}}
-        #          {"method":"subscribe","subscription":{"type":"l2Book","coin":"SOL"}}
-        subs = [
-            {"method": "subscribe", "subscription": {"type": "trades", "coin": coin}},
-            {"method": "subscribe", "subscription": {"type": "l2Book", "coin": coin}},
-        ]
+        #          {"method":"subscribe","subscription":{"type":"userFills","user":"0x..."}}
+        for sub in subs:
+            await ws.send(orjson.dumps({"method": "subscribe", "subscription": sub}).decode())
 
+    async def _run(self) -> None:
         backoff = 1.0
         while True:
             try:
                 async with websockets.connect(self.ws_url, open_timeout=10) as ws:
-                    # subscribe
-                    for s in subs:
-                        await ws.send(orjson.dumps(s).decode())
+                    # subscriptions added from here on are sent by subscribe()
+                    self._ws = ws
+                    await self._send_subs(ws, list(self.subs))
+                    self._connected.set()
 
-                    # main receive loop
+                    # main receive loop; post replies only while a post waits for one
+                    handle, ctx, posts = self.handle, self.ctx, self._posts
                     async for raw in ws:
-                        try:
-                            msg = orjson.loads(raw)
-                        except Exception:
-                            continue
-
-                        # Message routing:
-                        # trades: {"channel":"trades","data":{"coin":"SOL","time":ms,"side":"B"/"S","px":float,"sz":float,...}}
-                        # l2Book: {"channel":"l2Book","data":{"coin":"SOL","levels":{"bids":[[px,sz],...],"asks":[[px,sz],...]}}}
-                        ch = msg.get("channel")
-                        data = msg.get("data")
-
-                        # ignore acks
-                        if ch == "subscriptionResponse":
-                            continue
-
-                        if ch == "trades" and data:
-                            # data is a list of trades
-                            for trd in data:
-                                if trd.get("coin") != coin:
-                                    continue
-                                ts = int(trd["time"])
-                                px = float(trd["px"])
-                                sz = float(trd["sz"])
-                                side = Side.BUY if trd.get("side") in ("B", "Buy", "buy") else Side.SELL
-                                _q_put(q_trades, Trade(ts=ts, price=px, size=sz, side=side))
-
-                        elif ch == "l2Book" and data and data.get("coin") == coin:
-                            # levels is [bids[], asks[]]; each level is a dict {px, sz, n}
-                            bids, asks = data.get("levels", [[], []])
-                            if bids and asks:
-                                best_bid = bids[0]
-                                best_ask = asks[0]
-                                ts = int(data.get("time", int(time.time() * 1000)))
-                                _q_put(q_quotes, Quote(
-                                    ts=ts,
-                                    bid=float(best_bid["px"]),
-                                    ask=float(best_ask["px"]),
-                                    bid_sz=float(best_bid["sz"]),
-                                    ask_sz=float(best_ask["sz"]),
-                                ))
+                        if posts and raw.__class__ is str and raw.startswith(_POST_REPLY):
+                            self._on_post(raw)
+                        else:
+                            handle(raw, ctx)
 
                     # if loop exits normally, reset backoff
                     backoff = 1.0
 
-            except Exception:
-                # simple backoff + reconnect
-                time.sleep(backoff)
+            except Exception as e:
+                # simple backoff + reconnect (never block the loop)
+                log.warn("adapter.hyperliquid", event="reconnect", subs=len(self.subs), error=repr(e), backoff=backoff)
+                await anyio.sleep(backoff)
                 backoff = min(backoff * 2, 30.0)
+            finally:
+                self._ws = None
+                self._connected.clear()
+                for fut in self._posts.values():
+                    if not fut.done():
+                        fut.set_exception(ConnectionError("websocket closed before the reply"))
+
+
+_POST_REPLY = '{"channel":"post"'
+
+
+# Decoding. HL text frames start with {"channel":"<name>", and the coin is the
+# first "coin" key after it, so handle_message reads both off the text and
+# drops acks, pongs, other channels and unrouted coins without parsing JSON.
+# For l2Book the top level of each side is matched off the text too; the
+# frame is only parsed if someone reads the depth (see L2Book). trades frames
+# are parsed and decoded into one Trade, or a TradeBatch when the frame
+# carries several. Anything that doesn't fit this layout (bytes, reordered
+# keys) takes the general path through _handle_parsed.
+#
+# trades: {"channel":"trades","data":[{"coin":"SOL","side":"B"/"A","px":"..","sz":"..","time":ms,...}]}
+# l2Book: {"channel":"l2Book","data":{"coin":"SOL","time":ms,"levels":[[{px,sz,n},...],[{px,sz,n},...]]}}
+
+_CHANNEL = '{"channel":"'
+_COIN = '"coin":"'
+_BOOK_TOP = re.compile(
+    r'"levels":\[\[(?:\{"px":"([^"]*)","sz":"([^"]*)")?[^\]]*\],\[(?:\{"px":"([^"]*)","sz":"([^"]*)")?')
+_TIME = re.compile(r'"time":(\d+)')
+_SIDES = {"B": Side.BUY, "A": Side.SELL, "S": Side.SELL, "Buy": Side.BUY, "buy": Side.BUY}
+
+
+def handle_message(raw: "str | bytes", routes: "dict[str, _Route]") -> None:
+    """Decode one WS frame and hand any Quote/Trade(Batch) to the route of its coin."""
+    if raw.__class__ is not str or not raw.startswith(_CHANNEL):
+        _handle_parsed(raw, routes)
+        return
+    end = raw.find('"', 12)
+    ch = raw[12:end]
+    if ch != "l2Book" and ch != "trades":
+        return  # subscriptionResponse, pong, channels we don't route
+    c = raw.find(_COIN, end)
+    if c < 0:
+        _handle_parsed(raw, routes)
+        return
+    c += 8
+    route = routes.get(raw[c:raw.find('"', c)])
+    if route is None:
+        return
 
+    if ch == "trades":
+        try:
+            data = orjson.loads(raw)["data"]
+        except Exception:
+            return
+        _on_trades(route, data)
+        return
+
+    top, ts = _BOOK_TOP.search(raw, c), _TIME.search(raw, c)
+    if top is None or ts is None:
+        _handle_parsed(raw, routes)
+        return
+    bpx, bsz, apx, asz = top.groups("")
+    if (not bpx and raw[top.start() + 11] != "]") or (not apx and raw[top.end()] != "]"):
+        _handle_parsed(raw, routes)  # a side has levels but not in px, sz order
+        return
+    _on_book(route, route.book.update_top((bpx, bsz, apx, asz), raw, int(ts.group(1))))
+
+
+def _handle_parsed(raw: "str | bytes", routes: "dict[str, _Route]") -> None:
+    try:
+        msg = orjson.loads(raw)
+    except Exception:
+        return
+    ch = msg.get("channel")
+    data = msg.get("data")
+    if not data:
+        return
+    if ch == "trades":
+        route = routes.get(data[0].get("coin"))
+        if route is not None:
+            _on_trades(route, data)
+    elif ch == "l2Book":
+        route = routes.get(data.get("coin"))
+        levels = data.get("levels")
+        if route is not None and levels:
+            _on_book(route, route.book.apply(levels, int(data.get("time", time.time() * 1000))))
+
+
+def _on_book(route: "_Route", changed: bool) -> None:
+    if changed:
+        q = route.book.quote(route.symbol)
+        if q is not None:
+            route.on_quote(q)
 
-def _q_put(q: queue.Queue, item):
+
+def _on_trades(route: "_Route", data: list) -> None:
+    """One frame carries one coin's trades: a Trade for one, a TradeBatch (columns) for several."""
+    try:
+        if len(data) == 1:
+            t = data[0]
+            route.on_trade(Trade(ts=int(t["time"]), price=float(t["px"]), size=float(t["sz"]),
+                                 side=_SIDES.get(t.get("side"), Side.SELL), symbol=route.symbol))
+            return
+        batch = TradeBatch(route.symbol)
+        append, sides = batch.append, _SIDES
+        for t in data:
+            append(int(t["time"]), float(t["px"]), float(t["sz"]), sides.get(t.get("side"), Side.SELL))
+    except (KeyError, TypeError, ValueError):
+        log.warn("adapter.hyperliquid", event="bad_trade", symbol=route.symbol)
+        return
+    route.on_trade(batch)
+
+
+_dropped = metrics.counter("spl_dropped_total", "Messages dropped before reaching the engine")
+
+
+def _q_put(q: "queue.Queue | asyncio.Queue", item):
     try:
         q.put_nowait(item)
-    except queue.Full:
+    except (queue.Full, asyncio.QueueFull):
         # drop oldest to avoid blocking
         try:
             q.get_nowait()
+            _dropped.inc()
         except Exception:
             pass
         q.put_nowait(item)
 
 
+def _book_mid(feed: "HyperliquidFeed", symbol: str) -> float:
+    """Mid of the local book's top; LookupError until the symbol is subscribed and has both sides."""
+    book = feed.book(symbol)
+    bid = book.best_bid() if book is not None else None
+    ask = book.best_ask() if book is not None else None
+    if bid is None or ask is None:
+        raise LookupError(f"no two-sided book for {symbol} yet (subscribe_quotes first)")
+    return (bid + ask) / 2.0
+
+
 def _to_hl_coin(symbol: str) -> str:
     """
     Map your internal symbol (e.g., 'SOL-PERP') to HL 'coin' (e.g., 'SOL').
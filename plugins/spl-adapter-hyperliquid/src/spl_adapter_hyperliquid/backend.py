@@ -1,37 +1,234 @@
-# spl/exec/backend_hyperliquid.py
-import time
-from spl.core.types import OrderReq, Fill  # whatever your types are
-from hyperliquid import exchange
+# plugins/spl-adapter-hyperliquid/src/spl_adapter_hyperliquid/backend.py
+import asyncio, itertools, os, threading
+from collections import deque
+from typing import List, Optional
+
+from spltrader.core.types import AccountSnapshot, OrderAck, OrderReq, Fill
+from spltrader.core.log import log
+from .adapter import HL_MAINNET_WS, HL_TESTNET_WS
+from .orders import HyperliquidOrderClient, Signer, sdk_signer, _now_ms
+from .user_feed import HyperliquidUserFeed, cloid_for
+
+# Live fills arrive over the userFills websocket (user_feed.py) on a
+# background loop and wait in a deque; on_quote()/on_trade() hand them to
+# the engine on its next event, so they are booked (store, risk) the same
+# way simulated fills are.
+#
+# Orders never block the engine thread. place_many()/place()/cancel() only
+# queue work and wake the loop once; the loop's flush sends everything
+# queued since the last flush (normally one engine tick) as one "order",
+# one "batchModify" (orders with meta["replaces"]) and one "cancelByCloid"
+# action, signed and posted on the same websocket as the fills
+# (orders.py). Outcomes come back as OrderAcks via poll_acks().
+#
+# A post that timed out or lost the socket may still have executed. Its
+# orders are held back until their outcome is known: the first orderUpdates
+# entry that settles one acks it, and after reconcile_after_s an orderStatus
+# query by cloid settles the rest (not on the exchange = place failed; still
+# open = cancel failed). The strategy never sees a reject for an order that
+# is actually resting.
 
 class HyperliquidExec:
-    def __init__(self, cfg, store):
+    blocking = False  # every call only queues work for the background loop (see above)
+
+    def __init__(self, cfg, store=None, signer: Optional[Signer] = None, book=None):
         """
         cfg['hyperliquid'] should include:
           network: "mainnet" | "testnet"
           account_address: "0x..."    # main wallet address
           secret_key: "..."           # API wallet private key (keep in env!)
+          secret_key_env: "HL_SECRET_KEY"   # ...or the env var holding it
+          vault_address: optional, trade for a vault / subaccount
+          ws_url: optional override of the websocket endpoint
+          market_slippage: fraction a market order may fill beyond the book's touch (default 0.05)
+          reconcile_after_s: seconds before an unanswered order is looked up by cloid (default 5)
+        signer: (action, nonce) -> signature; defaults to the SDK's L1 signer over secret_key
+        book: symbol -> L2Book (HyperliquidMarket.book), to price MARKET orders sent without px
         """
-          # from official SDK or ccxt-hyperliquid
         self.cfg = cfg
         self.store = store
-        self.hl = exchange.Exchange({
-            "network": cfg.get("network","mainnet"),
-            "account_address": cfg["account_address"],
-            "secret_key": cfg["secret_key"],
-        })
-
-    def place(self, req: OrderReq):
-        # translate your OrderRequest -> HL order payload (price tick, size lot)
-        # example (pseudo):
-        side = "buy" if req.side == "buy" else "sell"
-        res = self.hl.create_limit_order(req.symbol, "limit", side, req.sz, req.px)
-        # store pending order id, etc.
-        return res
-
-    def on_quote(self, q):
-        return []  # real matching happens on-chain; no synthetic fills for live
-
-    def on_trade(self, t):
-        # poll user fills via WS "userFills" or Info endpoint
-        # return [Fill(...), ...] to keep Engine behavior consistent
-        return []
+        net = cfg.get("network", "mainnet")
+        self.ws_url = cfg.get("ws_url") or (HL_TESTNET_WS if net == "testnet" else HL_MAINNET_WS)
+        self.address = cfg["account_address"]
+        secret = cfg.get("secret_key") or os.environ.get(cfg.get("secret_key_env") or "")
+        if signer is None and secret:
+            signer = sdk_signer(secret, cfg.get("vault_address"), is_mainnet=(net != "testnet"))
+
+        self._fills: deque = deque()   # appended on the feed loop, drained on the engine thread
+        self._acks: deque = deque()
+        self._queued: deque = deque()  # (kind, item) from the engine thread, drained by _flush on the loop
+        self._flush_scheduled = False
+        self._symbol_of: dict[str, str] = {}   # client id -> symbol, for cancels
+        self._unknown: dict[str, tuple] = {}   # client id -> (symbol, op) of posts with no reply, loop side
+        self.reconcile_after_s = float(cfg.get("reconcile_after_s", 5.0))
+        self._ids = itertools.count(1)
+        self._snap: Optional[AccountSnapshot] = None
+        self._snap_pending = False
+
+        self.user = HyperliquidUserFeed(self.ws_url, self.address, on_fill=self._fills.append, on_order=self._on_order)
+        self.orders = HyperliquidOrderClient(self.user.conn, signer, self._on_ack, self._on_unknown,
+                                             vault=cfg.get("vault_address"), book=book,
+                                             market_slippage=float(cfg.get("market_slippage", 0.05)))
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="hyperliquid-user", daemon=True)
+        self._thread.start()
+        self._loop.call_soon_threadsafe(self.user.start)
+        if signer is not None:
+            asyncio.run_coroutine_threadsafe(self._warm(), self._loop)
+        log.info("adapter.hyperliquid", event="user_feed", network=net)
+
+    def place(self, req: OrderReq) -> str:
+        return self.place_many([req])[0]
+
+    def place_many(self, reqs: List[OrderReq]) -> List[str]:
+        """Queue one tick's orders for a single batched action; returns their client ids at once."""
+        ids = []
+        for req in reqs:
+            cid = req.client_id or f"hl-{next(self._ids)}"
+            cloid = self.user.expect(cid)
+            self._symbol_of[cid] = req.symbol
+            replaces = (req.meta or {}).get("replaces")
+            self._queued.append(("modify", (cid, cloid, req, replaces)) if replaces else ("order", (cid, cloid, req)))
+            ids.append(cid)
+        self._wake()
+        return ids
+
+    def cancel(self, client_order_id: str) -> bool:
+        """Queues the cancel and returns True; the outcome arrives as an OrderAck(op="cancel")."""
+        self._queued.append(("cancel", (client_order_id, self._symbol_of.get(client_order_id, ""))))
+        self._wake()
+        return True
+
+    def poll_acks(self) -> List[OrderAck]:
+        """Acks completed since the last call, oldest first."""
+        acks = self._acks
+        out = []
+        while acks:
+            out.append(acks.popleft())
+        return out
+
+    def snapshot(self) -> AccountSnapshot:
+        # the first call blocks for a real account; later ones return the cached
+        # snapshot and refresh it in the background
+        if self._snap is None:
+            self._snap = asyncio.run_coroutine_threadsafe(self.orders.account(self.address), self._loop).result(timeout=15)
+        elif not self._snap_pending:
+            self._snap_pending = True
+            asyncio.run_coroutine_threadsafe(self._refresh_snapshot(), self._loop)
+        return self._snap
+
+    # --- loop side ---
+    def _wake(self) -> None:
+        # queue first, then check: a flush that already cleared the flag still sees the item
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self._loop.call_soon_threadsafe(self._flush)
+
+    def _flush(self) -> None:
+        self._flush_scheduled = False
+        batches = {"order": [], "modify": [], "cancel": []}
+        queued = self._queued
+        while queued:
+            kind, item = queued.popleft()
+            batches[kind].append(item)
+        create_task = self._loop.create_task
+        for kind, items in batches.items():
+            if items:
+                create_task(getattr(self.orders, kind)(items))
+
+    def _on_ack(self, ack: OrderAck) -> None:
+        if ack.ok and ack.op == "place" and ack.ref:
+            self.user.bind(int(ack.ref), ack.client_id)   # fills carry the oid
+        elif ack.op == "cancel" and ack.ok:
+            self._symbol_of.pop(ack.client_id, None)
+        self._acks.append(ack)
+
+    def _on_unknown(self, cid: str, symbol: str, op: str) -> None:
+        self._unknown[cid] = (symbol, op)
+        self._loop.create_task(self._reconcile(cid))
+
+    def _on_order(self, cid: str, symbol: str, status: str, oid: int) -> None:
+        if cid in self._unknown:
+            self._settle(cid, status, oid, final=False)
+
+    async def _reconcile(self, cid: str) -> None:
+        while cid in self._unknown:
+            await asyncio.sleep(self.reconcile_after_s)
+            if cid not in self._unknown:
+                return
+            try:
+                status, oid = await self.orders.order_status(self.address, cloid_for(cid))
+            except Exception as e:
+                log.warn("adapter.hyperliquid", event="reconcile_failed", id=cid, error=repr(e))
+                continue
+            if cid in self._unknown:
+                self._settle(cid, status, oid, final=True)
+
+    def _settle(self, cid: str, status: str, oid: int, final: bool) -> None:
+        """Ack a held-back order from its exchange status, unless the status doesn't settle it yet."""
+        symbol, op = self._unknown[cid]
+        ok = _outcome(op, status, final)
+        if ok is None:
+            return
+        del self._unknown[cid]
+        log.info("adapter.hyperliquid", event="reconciled", id=cid, op=op, status=status or "unknown_oid")
+        self._on_ack(OrderAck(_now_ms(), cid, symbol, ok, op=op, ref=str(oid) if ok and op == "place" else "",
+                              error="" if ok else (status or "not on the exchange")))
+
+    async def _warm(self) -> None:
+        try:
+            await self.orders.assets()   # asset ids before the first order needs them
+        except Exception as e:
+            log.warn("adapter.hyperliquid", event="meta_failed", error=repr(e))
+
+    async def _refresh_snapshot(self) -> None:
+        try:
+            self._snap = await self.orders.account(self.address)
+        except Exception:
+            pass  # keep serving the previous one
+        finally:
+            self._snap_pending = False
+
+    def on_quote(self, q) -> List[Fill]:
+        return self._drain()  # real matching happens on-chain; fills come from userFills
+
+    def on_trade(self, t) -> List[Fill]:
+        return self._drain()
+
+    def _drain(self) -> List[Fill]:
+        fills = self._fills
+        if not fills:
+            return []
+        out = []
+        while fills:
+            out.append(fills.popleft())
+        return out
+
+    def close(self) -> None:
+        async def _cancel_all():
+            tasks = [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+            for t in tasks:
+                t.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+        if self._loop.is_running():
+            asyncio.run_coroutine_threadsafe(_cancel_all(), self._loop).result(timeout=5)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=1)
+
+
+def _outcome(op: str, status: str, final: bool) -> Optional[bool]:
+    """
+    Did a place/cancel take effect, given the order's exchange status ("" for
+    an order the exchange never saw)? None while the status can still change
+    the answer; final=True for a direct orderStatus lookup.
+    """
+    if op == "place":
+        if not status:
+            return False if final else None
+        return not status.endswith(("rejected", "Rejected"))
+    if status == "canceled":
+        return True
+    if status in ("", "open", "triggered") and not final:
+        return None
+    return False   # filled, cancelled by the exchange, or still open: the cancel itself did not happen
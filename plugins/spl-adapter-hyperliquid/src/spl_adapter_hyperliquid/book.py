@@ -0,0 +1,164 @@
+# src/spl_adapter_hyperliquid/book.py
+from array import array
+from typing import Optional
+
+import orjson
+
+from spltrader.core.types import Quote, Side
+
+# Local depth book per coin, kept from Hyperliquid l2Book frames.
+#
+# l2Book frames are snapshots of the top levels per side ([bids[], asks[]],
+# best first, each {px, sz, n}), so each frame replaces the book rather than
+# patching it. Only the top of book is read eagerly (as the frame's own px/sz
+# strings, which is enough to tell whether it changed); the depth is decoded
+# into a pair of preallocated array('d') columns per side the first time it
+# is read after a frame. A busy coin whose depth nobody reads costs no float
+# conversions, and with update_top() not even a JSON parse.
+#
+# Each frame is stored as one (top, source, ts) tuple and depth is decoded
+# into the spare pair of sides before swapping it in, so a reader on another
+# thread (the engine) always sees a whole frame. One reader thread per book.
+
+_EMPTY_TOP = ("", "", "", "")
+
+
+class Levels:
+    __slots__ = ("px", "sz", "n")
+
+    def __init__(self, depth: int):
+        self.px = array("d", bytes(8 * depth))
+        self.sz = array("d", bytes(8 * depth))
+        self.n = 0
+
+    def __len__(self) -> int:
+        return self.n
+
+    def fill(self, levels: list) -> None:
+        px, sz = self.px, self.sz
+        n = min(len(levels), len(px))
+        for i in range(n):
+            lvl = levels[i]
+            px[i] = float(lvl["px"])
+            sz[i] = float(lvl["sz"])
+        self.n = n
+
+    def top(self, n: int) -> list[tuple[float, float]]:
+        n = min(n, self.n)
+        return list(zip(self.px[:n], self.sz[:n]))
+
+    def notional(self, n: Optional[int] = None) -> float:
+        n = self.n if n is None else min(n, self.n)
+        px, sz = self.px, self.sz
+        return sum(px[i] * sz[i] for i in range(n))
+
+
+class L2Book:
+    def __init__(self, coin: str, depth: int = 20):
+        self.coin = coin
+        self.depth = depth
+        self._state: tuple = (_EMPTY_TOP, ((), ()), 0)   # (top strings, levels or raw frame, ts)
+        self._sides = (Levels(depth), Levels(depth))
+        self._spare = (Levels(depth), Levels(depth))
+        self._decoded = self._state[1]
+
+    # --- writes (feed thread) ---
+    def apply(self, levels: list, ts: int) -> bool:
+        """Replace the book with a parsed l2Book frame's levels; True when the top of book changed."""
+        bids, asks = levels
+        top = (bids[0]["px"], bids[0]["sz"]) if bids else ("", "")
+        top += (asks[0]["px"], asks[0]["sz"]) if asks else ("", "")
+        return self.update_top(top, levels, ts)
+
+    def update_top(self, top: tuple, source, ts: int) -> bool:
+        """
+        Replace the book given only its top as strings (bid px, bid sz, ask px, ask sz;
+        "" for an empty side). source is the frame's levels list or the raw frame text,
+        decoded only if the depth is read.
+        """
+        changed = top != self._state[0]
+        self._state = (top, source, ts)
+        return changed
+
+    # --- reads ---
+    @property
+    def ts(self) -> int:
+        return self._state[2]
+
+    @property
+    def bids(self) -> Levels:
+        return self._depth()[0]
+
+    @property
+    def asks(self) -> Levels:
+        return self._depth()[1]
+
+    def best_bid(self) -> Optional[float]:
+        px = self._state[0][0]
+        return float(px) if px else None
+
+    def best_ask(self) -> Optional[float]:
+        px = self._state[0][2]
+        return float(px) if px else None
+
+    def top(self, n: int = 5) -> tuple[list, list]:
+        """([(px, sz)] bids, [(px, sz)] asks), best first."""
+        bids, asks = self._depth()
+        return bids.top(n), asks.top(n)
+
+    def microprice(self) -> Optional[float]:
+        """Size-weighted mid: leans toward the side with less size at the touch."""
+        bpx, bsz, apx, asz = self._state[0]
+        if not (bpx and apx):
+            return None
+        bid, ask, bsz, asz = float(bpx), float(apx), float(bsz), float(asz)
+        if bsz + asz <= 0:
+            return (bid + ask) / 2
+        return (bid * asz + ask * bsz) / (bsz + asz)
+
+    def vwap_for_notional(self, side: Side, notional: float) -> Optional[float]:
+        """Average price to buy (walk asks) or sell (walk bids) `notional` quote units; None if the book is too thin."""
+        bids, asks = self._depth()
+        lv = asks if side == Side.BUY else bids
+        px, sz = lv.px, lv.sz
+        left, base = notional, 0.0
+        for i in range(lv.n):
+            lvl_notional = px[i] * sz[i]
+            if lvl_notional >= left:
+                base += left / px[i]
+                return notional / base
+            left -= lvl_notional
+            base += sz[i]
+        return None
+
+    def notional_within(self, side: Side, bps: float) -> float:
+        """Resting notional on `side` priced within `bps` of that side's best price."""
+        bids, asks = self._depth()
+        lv = bids if side == Side.BUY else asks
+        if not lv.n:
+            return 0.0
+        px, sz = lv.px, lv.sz
+        limit = px[0] * (1 - bps / 1e4) if side == Side.BUY else px[0] * (1 + bps / 1e4)
+        total = 0.0
+        for i in range(lv.n):
+            if (px[i] < limit) if side == Side.BUY else (px[i] > limit):
+                break
+            total += px[i] * sz[i]
+        return total
+
+    def quote(self, symbol: str = "") -> Optional[Quote]:
+        (bpx, bsz, apx, asz), _, ts = self._state
+        if not (bpx and apx):
+            return None
+        return Quote(ts=ts, bid=float(bpx), ask=float(apx), bid_sz=float(bsz), ask_sz=float(asz), symbol=symbol)
+
+    def _depth(self) -> tuple:
+        source = self._state[1]
+        if source is not self._decoded:
+            levels = orjson.loads(source)["data"]["levels"] if isinstance(source, (str, bytes)) else source
+            bids, asks = self._spare
+            bids.fill(levels[0])
+            asks.fill(levels[1])
+            self._spare, self._sides = self._sides, (bids, asks)
+            self._decoded = source
+        return self._sides
@@ -0,0 +1,269 @@
+# plugins/spl-adapter-hyperliquid/src/spl_adapter_hyperliquid/orders.py
+import asyncio, time
+from decimal import Decimal
+from typing import Callable, Optional
+
+from spltrader.core.types import AccountSnapshot, OrderAck, OrderReq, OrdType, Side
+from spltrader.core.log import log
+from .adapter import _WsConn, _to_hl_coin
+from .book import L2Book
+from .user_feed import cloid_for, _from_hl_coin
+
+try:  # official SDK + eth_account, only needed to sign real orders
+    from eth_account import Account
+    from hyperliquid.utils.signing import sign_l1_action
+except ImportError:
+    Account = sign_l1_action = None
+
+# Signed exchange actions posted over a persistent websocket (the _WsConn
+# that also carries the account's fills, see backend.py), so no order pays
+# for a connection or TLS handshake.
+#
+# Each call takes everything the backend collected in one engine tick and
+# sends it as ONE action: "order" with N orders, "batchModify" for
+# cancel/replace (the order is modified in place by its cloid), or
+# "cancelByCloid" with N cancels. Every order in it gets an OrderAck
+# through on_ack, from its entry in the reply's statuses:
+#
+#   {"status":"ok","response":{"type":"order","data":{"statuses":[
+#       {"resting":{"oid":1}} | {"filled":{"oid":2,...}} | {"error":"..."} | "success"]}}}
+#
+# A rejected action (no signer, error reply) fails all of them. A post that
+# timed out or lost its socket may still have executed, so its orders get
+# no ack here: they go to on_unknown(client_id, symbol, op) and the backend
+# acks them once orderUpdates or an orderStatus query by cloid settles them.
+# There are no native market orders: a MARKET order without px goes out as
+# an IOC limit at the local book's far touch moved market_slippage (a
+# fraction, 0.05 by default as in the SDK) against us, so it crosses the
+# book but cannot fill beyond that price.
+# Prices go out at 5 significant figures and at most 6 - szDecimals
+# decimals, sizes at szDecimals, as the exchange requires.
+
+Signer = Callable[[dict, int], dict]   # (action, nonce) -> {"r": .., "s": .., "v": ..}
+
+
+def sdk_signer(secret_key: str, vault: Optional[str], is_mainnet: bool) -> Signer:
+    """L1 action signer from the official SDK (EIP-712 over the msgpack hash of the action)."""
+    if sign_l1_action is None:
+        raise RuntimeError("signing orders needs hyperliquid-python-sdk (pip install hyperliquid-python-sdk)")
+    wallet = Account.from_key(secret_key)
+
+    def sign(action: dict, nonce: int) -> dict:
+        return sign_l1_action(wallet, action, vault, nonce, None, is_mainnet)
+    return sign
+
+
+class HyperliquidOrderClient:
+    def __init__(self, conn: _WsConn, signer: Optional[Signer], on_ack: Callable[[OrderAck], None],
+                 on_unknown: Callable[[str, str, str], None], vault: Optional[str] = None,
+                 book: Optional[Callable[[str], Optional[L2Book]]] = None, market_slippage: float = 0.05):
+        self.conn = conn
+        self.signer = signer
+        self.on_ack = on_ack
+        self.on_unknown = on_unknown
+        self.vault = vault
+        self.book = book
+        self.market_slippage = market_slippage
+        self._assets: Optional[dict] = None   # coin -> (asset index, szDecimals)
+        self._nonce = 0
+
+    async def assets(self) -> dict:
+        if self._assets is None:
+            meta = _info(await self.conn.post({"type": "info", "payload": {"type": "meta"}}))
+            self._assets = {a["name"]: (i, int(a.get("szDecimals", 0))) for i, a in enumerate(meta["universe"])}
+        return self._assets
+
+    async def order(self, items: list) -> None:
+        """items: (client_id, cloid, OrderReq)."""
+        wires, sent = [], []
+        for cid, cloid, req in items:
+            w = await self._wire(cid, cloid, req)
+            if w is not None:
+                wires.append(w)
+                sent.append((cid, req.symbol))
+        if not wires:
+            return
+        results = await self._act({"type": "order", "orders": wires, "grouping": "na"}, len(wires))
+        ts = _now_ms()
+        for (cid, symbol), res in zip(sent, results):
+            self._ack(ts, cid, symbol, "place", res)
+
+    async def modify(self, items: list) -> None:
+        """items: (client_id, cloid, OrderReq, client id it replaces); old and new ack together."""
+        mods, sent = [], []
+        for cid, cloid, req, old in items:
+            w = await self._wire(cid, cloid, req)
+            if w is not None:
+                mods.append({"oid": cloid_for(old), "order": w})
+                sent.append((cid, req.symbol, old))
+        if not mods:
+            return
+        results = await self._act({"type": "batchModify", "modifies": mods}, len(mods))
+        ts = _now_ms()
+        for (cid, symbol, old), res in zip(sent, results):
+            self._ack(ts, old, symbol, "cancel", res and (res[0], "", res[2]))
+            self._ack(ts, cid, symbol, "place", res)
+
+    async def cancel(self, items: list) -> None:
+        """items: (client_id, symbol)."""
+        cancels, sent = [], []
+        for cid, symbol in items:
+            if not symbol:
+                self.on_ack(OrderAck(_now_ms(), cid, symbol, False, op="cancel", error="unknown client id"))
+                continue
+            a = await self._assets_or_fail(cid, symbol, "cancel")
+            if a is not None:
+                cancels.append({"asset": a[0], "cloid": cloid_for(cid)})
+                sent.append((cid, symbol))
+        if not cancels:
+            return
+        results = await self._act({"type": "cancelByCloid", "cancels": cancels}, len(cancels))
+        ts = _now_ms()
+        for (cid, symbol), res in zip(sent, results):
+            self._ack(ts, cid, symbol, "cancel", res)
+
+    async def account(self, user: str) -> AccountSnapshot:
+        st = _info(await self.conn.post({"type": "info", "payload": {"type": "clearinghouseState", "user": user}}))
+        positions = {}
+        for p in st.get("assetPositions") or ():
+            pos = p.get("position") or {}
+            positions[_from_hl_coin(pos.get("coin", ""))] = {
+                "base": float(pos.get("szi") or 0.0),
+                "pnl_unreal": float(pos.get("unrealizedPnl") or 0.0),
+                "pnl_real": 0.0,
+            }
+        return AccountSnapshot(ts=_now_ms(), balance=float(st["marginSummary"]["accountValue"]), positions=positions)
+
+    async def order_status(self, user: str, cloid: str) -> tuple:
+        """(status, oid) of one order by its cloid; ("", 0) if the exchange never saw it."""
+        st = _info(await self.conn.post({"type": "info", "payload": {"type": "orderStatus", "user": user, "oid": cloid}}))
+        if st.get("status") != "order":
+            return "", 0
+        o = st.get("order") or {}
+        return o.get("status", ""), int((o.get("order") or {}).get("oid") or 0)
+
+    # --- internals ---
+    def _ack(self, ts: int, cid: str, symbol: str, op: str, res) -> None:
+        if res is None:
+            self.on_unknown(cid, symbol, op)
+        else:
+            ok, ref, error = res
+            self.on_ack(OrderAck(ts, cid, symbol, ok, op=op, ref=ref, error=error))
+
+    async def _assets_or_fail(self, cid: str, symbol: str, op: str):
+        try:
+            a = (await self.assets()).get(_to_hl_coin(symbol))
+            if a is None:
+                raise KeyError(f"unknown coin {_to_hl_coin(symbol)}")
+            return a
+        except Exception as e:
+            self.on_ack(OrderAck(_now_ms(), cid, symbol, False, op=op, error=repr(e)))
+            return None
+
+    async def _wire(self, cid: str, cloid: str, req: OrderReq) -> Optional[dict]:
+        a = await self._assets_or_fail(cid, req.symbol, "place")
+        if a is None:
+            return None
+        try:
+            px = self._market_px(req) if req.type == OrdType.MARKET and req.px is None else None
+            return order_wire(req, a[0], a[1], cloid, px)
+        except ValueError as e:
+            self.on_ack(OrderAck(_now_ms(), cid, req.symbol, False, error=str(e)))
+            return None
+
+    def _market_px(self, req: OrderReq) -> float:
+        """Worst acceptable price for a market order: far touch of the local book plus slippage."""
+        book = self.book(req.symbol) if self.book is not None else None
+        if req.side == Side.BUY:
+            touch = book.best_ask() if book is not None else None
+            slip = 1.0 + self.market_slippage
+        else:
+            touch = book.best_bid() if book is not None else None
+            slip = 1.0 - self.market_slippage
+        if touch is None:
+            raise ValueError(f"market order needs px or a book for {req.symbol} (subscribe its quotes)")
+        return touch * slip
+
+    async def _act(self, action: dict, n: int) -> list:
+        """
+        Sign and post one action; (ok, ref, error) per entry, all failed if the
+        action itself was, all None if the post may or may not have executed.
+        """
+        try:
+            return [_status(st) for st in await self._send(action, n)]
+        except (asyncio.TimeoutError, ConnectionError) as e:
+            log.warn("adapter.hyperliquid", event="action_unknown", action=action["type"], n=n, error=repr(e))
+            return [None] * n
+        except Exception as e:
+            log.warn("adapter.hyperliquid", event="action_failed", action=action["type"], n=n, error=repr(e))
+            return [(False, "", repr(e))] * n
+
+    async def _send(self, action: dict, n: int) -> list:
+        if self.signer is None:
+            raise RuntimeError("no signer configured (hyperliquid.secret_key)")
+        nonce = self._nonce = max(_now_ms(), self._nonce + 1)   # strictly increasing per signer
+        payload = {"action": action, "nonce": nonce, "signature": self.signer(action, nonce),
+                   "vaultAddress": self.vault}
+        resp = await self.conn.post({"type": "action", "payload": payload})
+        body = resp.get("payload")
+        if resp.get("type") == "error" or not isinstance(body, dict):
+            raise RuntimeError(str(body))
+        if body.get("status") != "ok":
+            raise RuntimeError(str(body.get("response")))
+        statuses = ((body.get("response") or {}).get("data") or {}).get("statuses") or []
+        if len(statuses) != n:
+            raise RuntimeError(f"{n} entries sent, {len(statuses)} statuses back")
+        return statuses
+
+
+def order_wire(req: OrderReq, asset: int, sz_decimals: int, cloid: str, px: Optional[float] = None) -> dict:
+    """OrderReq -> HL order wire (key order matters: the action is hashed as msgpack); px overrides req.px."""
+    meta = req.meta or {}
+    if req.type == OrdType.LIMIT:
+        tif = "Alo" if meta.get("post_only") else ("Ioc" if req.tif.upper() == "IOC" else "Gtc")
+    elif req.type == OrdType.MARKET:
+        tif = "Ioc"  # no native market orders: an IOC limit at the worst acceptable price
+    else:
+        raise ValueError(f"unsupported order type {req.type.value}")
+    if px is None:
+        px = req.px
+    if px is None:
+        raise ValueError(f"{req.type.value} order needs px (sent as a limit price)")
+    return {
+        "a": asset,
+        "b": req.side == Side.BUY,
+        "p": float_to_wire(round(float(f"{px:.5g}"), 6 - sz_decimals)),
+        "s": float_to_wire(round(abs(req.sz), sz_decimals)),
+        "r": bool(meta.get("reduce_only", False)),
+        "t": {"limit": {"tif": tif}},
+        "c": cloid,
+    }
+
+
+def float_to_wire(x: float) -> str:
+    s = f"{Decimal(f'{x:.8f}').normalize():f}"
+    return "0" if s == "-0" else s
+
+
+def _status(st) -> tuple:
+    """(ok, ref, error) of one statuses entry."""
+    if st == "success":
+        return True, "", ""
+    if isinstance(st, dict):
+        if "error" in st:
+            return False, "", str(st["error"])
+        for k in ("resting", "filled"):
+            if k in st:
+                return True, str(st[k].get("oid", "")), ""
+    return False, "", f"unexpected status {st!r}"
+
+
+def _info(resp: dict) -> dict:
+    body = resp.get("payload")
+    if resp.get("type") == "error" or not isinstance(body, dict):
+        raise RuntimeError(str(body))
+    return body.get("data", body)
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
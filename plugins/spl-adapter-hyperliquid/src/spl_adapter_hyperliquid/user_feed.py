@@ -0,0 +1,131 @@
+# plugins/spl-adapter-hyperliquid/src/spl_adapter_hyperliquid/user_feed.py
+import hashlib, time
+from collections import deque
+from typing import Callable, Optional
+
+import orjson
+
+from spltrader.core.types import Fill, Side
+from spltrader.core.log import log
+from .adapter import _WsConn, _SIDES
+
+# Account stream: the userFills and orderUpdates channels for one address on
+# the same _WsConn machinery as market data (reconnect, resubscribe).
+#
+# userFills: {"channel":"userFills","data":{"isSnapshot":true?,"user":"0x..","fills":[
+#              {"coin":"SOL","px":"..","sz":"..","side":"B"/"A","time":ms,"oid":1,"tid":7,"fee":"..",...}]}}
+# orderUpdates: {"channel":"orderUpdates","data":[
+#              {"order":{"coin":"SOL","oid":1,"cloid":"0x..",...},"status":"open"|"filled"|...,"statusTimestamp":ms}]}
+#
+# Every fill is keyed by its trade id (tid) and passed on at most once:
+# the stream repeats fills as a snapshot after each (re)connect, and only
+# snapshot fills newer than the feed's start that were never seen (missed
+# while disconnected) go out. Fills carry the exchange oid; client ids are
+# recovered through the cloid that expect() hands out for each client id,
+# learned from orderUpdates, or bound directly from a place response with
+# bind(). A fill whose order was never matched keeps str(oid).
+
+
+def cloid_for(client_id: str) -> str:
+    """HL client order id (16 bytes, 0x-hex) for one of our client ids."""
+    return "0x" + hashlib.blake2b(client_id.encode(), digest_size=16).hexdigest()
+
+
+class HyperliquidUserFeed:
+    """
+    on_fill(Fill) runs on the feed's event loop for every new fill;
+    on_order(client_id, symbol, status, oid) for every order update.
+    start() must run on that loop.
+    """
+    def __init__(self, ws_url: str, user: str, on_fill: Callable[[Fill], None],
+                 on_order: Optional[Callable[[str, str, str, int], None]] = None, keep: int = 10_000):
+        self.ws_url = ws_url
+        self.user = user.lower()
+        self.on_fill = on_fill
+        self.on_order = on_order
+        self.since_ms = int(time.time() * 1000)
+        self._client_of_cloid: dict[str, str] = {}
+        self._client_of_oid: dict[int, str] = {}
+        self._seen: set = set()
+        self._seen_order: deque = deque(maxlen=keep)
+        self.conn = _WsConn(ws_url, handle_user_message, self)   # also carries order posts (backend.py)
+        self._started = False
+
+    def start(self) -> None:
+        if not self._started:
+            self._started = True
+            self.conn.subscribe({"type": "userFills", "user": self.user}, {"type": "orderUpdates", "user": self.user})
+
+    def expect(self, client_id: str) -> str:
+        """Register a client id about to be placed; returns the cloid to send with it."""
+        cloid = cloid_for(client_id)
+        self._client_of_cloid[cloid] = client_id
+        return cloid
+
+    def bind(self, oid: int, client_id: str) -> None:
+        self._client_of_oid[int(oid)] = client_id
+
+    def client_id(self, oid: int, cloid: Optional[str] = None) -> str:
+        cid = self._client_of_oid.get(oid)
+        if cid is None and cloid:
+            cid = self._client_of_cloid.get(cloid)
+            if cid is not None:
+                self._client_of_oid[oid] = cid
+        return cid if cid is not None else str(oid)
+
+    def _on_fills(self, data: dict) -> None:
+        snapshot = data.get("isSnapshot", False)
+        for f in data.get("fills") or ():
+            try:
+                tid = f["tid"]
+                if tid in self._seen:
+                    continue
+                ts = int(f["time"])
+                if snapshot and ts < self.since_ms:
+                    self._remember(tid)
+                    continue
+                oid = int(f["oid"])
+                fill = Fill(ts=ts, client_id=self.client_id(oid, f.get("cloid")), symbol=_from_hl_coin(f["coin"]),
+                            side=_SIDES.get(f.get("side"), Side.SELL), px=float(f["px"]), sz=float(f["sz"]),
+                            fee=float(f.get("fee") or 0.0))
+            except (KeyError, TypeError, ValueError):
+                log.warn("adapter.hyperliquid", event="bad_fill", tid=f.get("tid") if isinstance(f, dict) else None)
+                continue
+            self._remember(tid)
+            self.on_fill(fill)
+
+    def _on_orders(self, data: list) -> None:
+        for u in data:
+            order = u.get("order") or {}
+            oid = order.get("oid")
+            if oid is None:
+                continue
+            cid = self.client_id(int(oid), order.get("cloid"))
+            if self.on_order is not None:
+                self.on_order(cid, _from_hl_coin(order.get("coin", "")), u.get("status", ""), int(oid))
+
+    def _remember(self, tid) -> None:
+        if len(self._seen_order) == self._seen_order.maxlen:
+            self._seen.discard(self._seen_order[0])
+        self._seen_order.append(tid)
+        self._seen.add(tid)
+
+
+def handle_user_message(raw: "str | bytes", feed: HyperliquidUserFeed) -> None:
+    try:
+        msg = orjson.loads(raw)
+    except Exception:
+        return
+    ch = msg.get("channel")
+    data = msg.get("data")
+    if not data:
+        return
+    if ch == "userFills":
+        feed._on_fills(data)
+    elif ch == "orderUpdates":
+        feed._on_orders(data)
+
+
+def _from_hl_coin(coin: str) -> str:
+    """Inverse of adapter._to_hl_coin for perps: 'SOL' -> 'SOL-PERP'."""
+    return f"{coin}-PERP" if coin else coin
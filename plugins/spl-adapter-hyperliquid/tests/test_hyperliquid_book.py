@@ -0,0 +1,93 @@
+import orjson
+import pytest
+
+from spltrader.core.types import Side
+from spl_adapter_hyperliquid.adapter import _Route, handle_message
+from spl_adapter_hyperliquid.book import L2Book
+
+
+def _levels(bids, asks):
+    lv = lambda rows: [{"px": str(px), "sz": str(sz), "n": 1} for px, sz in rows]
+    return [lv(bids), lv(asks)]
+
+
+BIDS = [(99.0, 2.0), (98.0, 3.0), (97.0, 5.0)]
+ASKS = [(101.0, 1.0), (102.0, 4.0), (103.0, 10.0)]
+
+
+def test_book_reads():
+    b = L2Book("SOL", depth=2)
+    assert b.apply(_levels(BIDS, ASKS), ts=1)
+    assert b.top(5) == ([(99.0, 2.0), (98.0, 3.0)], [(101.0, 1.0), (102.0, 4.0)])  # depth caps levels
+    assert (b.best_bid(), b.best_ask()) == (99.0, 101.0)
+    # microprice leans to the ask, which has less size at the touch
+    assert b.microprice() == pytest.approx((99.0 * 1.0 + 101.0 * 2.0) / 3.0)
+    # buy 301 quote units: 101 at 101.0, then 200 at 102.0
+    assert b.vwap_for_notional(Side.BUY, 301.0) == pytest.approx(301.0 / (1.0 + 200.0 / 102.0))
+    assert b.vwap_for_notional(Side.BUY, 1e6) is None
+    assert b.notional_within(Side.BUY, 150) == pytest.approx(99.0 * 2.0 + 98.0 * 3.0)
+    assert b.notional_within(Side.SELL, 50) == pytest.approx(101.0)
+    q = b.quote("SOL-PERP")
+    assert (q.ts, q.bid, q.ask, q.bid_sz, q.ask_sz, q.symbol) == (1, 99.0, 101.0, 2.0, 1.0, "SOL-PERP")
+
+
+def test_top_change_detection():
+    b = L2Book("SOL")
+    assert b.apply(_levels(BIDS, ASKS), ts=1)
+    deeper = [BIDS[0], (98.5, 7.0)]
+    assert not b.apply(_levels(deeper, ASKS), ts=2)   # only depth moved
+    assert b.top(2)[0] == [(99.0, 2.0), (98.5, 7.0)]
+    assert b.apply(_levels([(99.0, 2.5)], ASKS), ts=3)  # size at the touch
+    assert b.apply(_levels([(99.0, 2.5)], []), ts=4)    # one side emptied
+    assert b.quote() is None
+
+
+def test_handle_message_emits_quotes_only_on_top_change():
+    quotes = []
+    routes = {"SOL": _Route("SOL-PERP", quotes.append, lambda t: None, L2Book("SOL"))}
+    frame = lambda ts, bids: orjson.dumps({"channel": "l2Book", "data": {
+        "coin": "SOL", "time": ts, "levels": _levels(bids, ASKS)}})
+    handle_message(frame(1, BIDS), routes)
+    handle_message(frame(2, [BIDS[0], (98.9, 1.0)]), routes)
+    handle_message(frame(3, [(99.5, 1.0)]), routes)
+    assert [(q.ts, q.bid) for q in quotes] == [(1, 99.0), (3, 99.5)]
+    assert routes["SOL"].book.top(1)[0] == [(99.5, 1.0)]
+
+
+def _text(obj):
+    return orjson.dumps(obj).decode()  # compact, as Hyperliquid sends it
+
+
+def test_text_fast_path_matches_parsed_path():
+    from spl_adapter_hyperliquid.adapter import _handle_parsed
+    from spltrader.core.batch import TradeBatch
+
+    frames = [
+        _text({"channel": "subscriptionResponse", "data": {"subscription": {"type": "l2Book", "coin": "SOL"}}}),
+        _text({"channel": "l2Book", "data": {"coin": "SOL", "time": 1, "levels": _levels(BIDS, ASKS)}}),
+        _text({"channel": "l2Book", "data": {"coin": "SOL", "time": 2, "levels": _levels(BIDS[:1], ASKS)}}),
+        _text({"channel": "l2Book", "data": {"coin": "SOL", "time": 3, "levels": _levels([], ASKS)}}),
+        _text({"channel": "l2Book", "data": {"coin": "SOL", "time": 4, "levels": _levels(BIDS, ASKS[1:])}}),
+        _text({"channel": "l2Book", "data": {"coin": "ETH", "time": 5, "levels": _levels(BIDS, ASKS)}}),
+        _text({"channel": "trades", "data": [{"coin": "SOL", "side": "A", "px": "100.5", "sz": "2", "time": 6}]}),
+        _text({"channel": "trades", "data": [{"coin": "SOL", "side": "B", "px": "100.5", "sz": "1", "time": 7},
+                                              {"coin": "SOL", "side": "A", "px": "100.4", "sz": "3", "time": 7}]}),
+        _text({"channel": "trades", "data": [{"coin": "ETH", "side": "B", "px": "1", "sz": "1", "time": 8}]}),
+        # keys out of the usual order: falls back to parsing
+        _text({"channel": "l2Book", "data": {"coin": "SOL", "time": 9, "levels": [
+            [{"sz": "4", "px": "99.5", "n": 1}], [{"px": "101.0", "sz": "1.0", "n": 1}]]}}),
+    ]
+
+    def run(decode):
+        quotes, trades = [], []
+        routes = {"SOL": _Route("SOL-PERP", quotes.append, trades.append, L2Book("SOL"))}
+        for f in frames:
+            decode(f, routes)
+        flat = [t for x in trades for t in (x if isinstance(x, TradeBatch) else [x])]
+        return quotes, flat, trades, routes["SOL"].book.top(3)
+
+    fast, parsed = run(handle_message), run(_handle_parsed)
+    assert fast[0] == parsed[0] and fast[1] == parsed[1] and fast[3] == parsed[3]
+    assert [(q.ts, q.bid, q.ask) for q in fast[0]] == [(1, 99.0, 101.0), (4, 99.0, 102.0), (9, 99.5, 101.0)]
+    assert [(t.ts, t.side, t.size) for t in fast[1]] == [(6, Side.SELL, 2.0), (7, Side.BUY, 1.0), (7, Side.SELL, 3.0)]
+    assert isinstance(fast[2][1], TradeBatch) and len(fast[2][1]) == 2
@@ -0,0 +1,117 @@
+import asyncio, threading
+
+import orjson
+import pytest
+from websockets.asyncio.server import serve
+
+from spl_adapter_hyperliquid.adapter import AsyncHyperliquidMarket, HyperliquidMarket
+
+
+def _trades(coin, px, ts):
+    return orjson.dumps({"channel": "trades", "data": [
+        {"coin": coin, "side": "B", "px": str(px), "sz": "1.5", "time": ts, "hash": "0x0", "tid": ts}]})
+
+
+def _book(coin, bid, ask, ts):
+    return orjson.dumps({"channel": "l2Book", "data": {"coin": coin, "time": ts, "levels": [
+        [{"px": str(bid), "sz": "2", "n": 1}], [{"px": str(ask), "sz": "3", "n": 1}]]}})
+
+
+class FakeHL:
+    """Local WS server: records connections/subscriptions, replies to each subscribe with frames for that coin."""
+    def __init__(self):
+        self.connections = 0
+        self.subs = []
+
+    async def handler(self, ws):
+        self.connections += 1
+        async for raw in ws:
+            sub = orjson.loads(raw).get("subscription") or {}
+            if "coin" not in sub:
+                continue   # account channels / posts of a live exec backend on the same url
+            self.subs.append((sub["type"], sub["coin"]))
+            await ws.send(orjson.dumps({"channel": "subscriptionResponse", "data": {"method": "subscribe"}}))
+            px = {"SOL": 150.0, "BTC": 60_000.0}[sub["coin"]]
+            if sub["type"] == "trades":
+                await ws.send(_trades(sub["coin"], px, 1))
+            else:
+                await ws.send(_book(sub["coin"], px - 1, px + 1, 2))
+
+
+def test_async_market_multiplexes_symbols_over_one_socket():
+    async def main():
+        fake = FakeHL()
+        async with serve(fake.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            m = AsyncHyperliquidMarket({"ws_url": f"ws://127.0.0.1:{port}"})
+            sol_t, btc_t = m.subscribe_trades("SOL-PERP"), m.subscribe_trades("BTC-PERP")
+            sol_q = m.subscribe_quotes("SOL-PERP")
+            with pytest.raises(LookupError):
+                await m.get_mark_price("ETH-PERP")
+            got = await asyncio.wait_for(asyncio.gather(anext(sol_t), anext(btc_t), anext(sol_q)), 5)
+            assert await m.get_mark_price("SOL-PERP") == 150.0
+        return fake, got
+
+    fake, (sol, btc, q) = asyncio.run(main())
+    assert fake.connections == 1
+    assert sorted(fake.subs) == [("l2Book", "BTC"), ("l2Book", "SOL"), ("trades", "BTC"), ("trades", "SOL")]
+    assert (sol.symbol, sol.price) == ("SOL-PERP", 150.0)
+    assert (btc.symbol, btc.price) == ("BTC-PERP", 60_000.0)
+    assert (q.symbol, q.bid, q.ask) == ("SOL-PERP", 149.0, 151.0)
+
+
+class ServerThread:
+    """Runs the fake server on its own loop so blocking generators can be tested."""
+    def __init__(self, handler):
+        self.handler = handler
+        self.ready = threading.Event()
+        self.loop = asyncio.new_event_loop()
+        self.port = None
+        threading.Thread(target=self.loop.run_until_complete, args=(self._run(),), daemon=True).start()
+        assert self.ready.wait(5)
+
+    async def _run(self):
+        self._stop = asyncio.Event()
+        async with serve(self.handler, "127.0.0.1", 0) as srv:
+            self.port = srv.sockets[0].getsockname()[1]
+            self.ready.set()
+            await self._stop.wait()
+
+    def close(self):
+        self.loop.call_soon_threadsafe(self._stop.set)
+
+
+def test_sync_market_uses_one_thread_for_all_symbols():
+    fake = FakeHL()
+    srv = ServerThread(fake.handler)
+    try:
+        m = HyperliquidMarket({"ws_url": f"ws://127.0.0.1:{srv.port}", "ws_connections": 2})
+        sol = next(m.subscribe_trades("SOL-PERP"))
+        btc = next(m.subscribe_trades("BTC-PERP"))
+        assert (sol.symbol, btc.symbol) == ("SOL-PERP", "BTC-PERP")
+        assert len(m._threads) == 1
+        assert fake.connections == 2  # ws_connections spreads coins over a small pool
+    finally:
+        srv.close()
+
+
+def test_async_path_exec_backend_prices_off_the_subscribed_book():
+    from spltrader.engine.async_engine import as_async_backend
+
+    async def main():
+        fake = FakeHL()
+        async with serve(fake.handler, "127.0.0.1", 0) as server:
+            port = server.sockets[0].getsockname()[1]
+            market = HyperliquidMarket({"ws_url": f"ws://127.0.0.1:{port}", "account_address": "0xabc"})
+            # what `spl run` builds with [engine].async = true in live mode
+            ex = market.execution_live()
+            amarket, aexec = market.aio(), as_async_backend(ex)
+            try:
+                assert ex.orders.book("SOL-PERP") is None
+                await asyncio.wait_for(anext(amarket.subscribe_quotes("SOL-PERP")), 5)
+                book = ex.orders.book("SOL-PERP")
+                return book.best_bid(), book.best_ask(), aexec.backend is ex
+            finally:
+                await asyncio.to_thread(ex.close)   # off the loop: the fake server must answer its close
+
+    assert asyncio.run(main()) == (149.0, 151.0, True)
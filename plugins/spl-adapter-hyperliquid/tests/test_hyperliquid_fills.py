@@ -0,0 +1,80 @@
+import time
+
+import orjson
+
+from spltrader.core.types import Side
+from spl_adapter_hyperliquid.backend import HyperliquidExec
+from spl_adapter_hyperliquid.user_feed import HyperliquidUserFeed, cloid_for
+
+from test_hyperliquid_feed import ServerThread
+
+USER = "0xAbC"
+
+
+def _fill(tid, oid, ts, px="150.5", side="B"):
+    return {"coin": "SOL", "px": px, "sz": "0.5", "side": side, "time": ts, "oid": oid, "tid": tid,
+            "fee": "0.02", "hash": "0x0", "crossed": True}
+
+
+class FakeUserHL:
+    """Per connection: a fills snapshot, an order update, then a live fill sent twice; drops the first connection."""
+    def __init__(self, now):
+        self.now = now
+        self.subs = []
+        self.connections = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        async for raw in ws:
+            sub = orjson.loads(raw)["subscription"]
+            self.subs.append((sub["type"], sub["user"]))
+            if sub["type"] != "orderUpdates":
+                continue
+            snapshot = [_fill(1, 10, self.now - 60_000)]                  # before the session: skipped
+            if self.connections > 1:
+                snapshot.append(_fill(2, 11, self.now + 1_000))          # landed while we were away
+            await ws.send(orjson.dumps({"channel": "userFills",
+                                        "data": {"isSnapshot": True, "user": USER, "fills": snapshot}}))
+            await ws.send(orjson.dumps({"channel": "orderUpdates", "data": [
+                {"order": {"coin": "SOL", "oid": 12, "cloid": cloid_for("mm-7")}, "status": "open",
+                 "statusTimestamp": self.now}]}))
+            live = {"channel": "userFills", "data": {"user": USER, "fills": [_fill(3, 12, self.now + 500, side="A")]}}
+            await ws.send(orjson.dumps(live))
+            await ws.send(orjson.dumps(live))                 # redelivered: same tid
+            if self.connections == 1:
+                await ws.close()                              # reconnect replays the snapshot
+                return
+
+
+def test_user_fills_reach_the_engine_once_per_tid():
+    fake = FakeUserHL(int(time.time() * 1000))
+    srv = ServerThread(fake.handler)
+    ex = None
+    try:
+        ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": USER})
+        ex.user.expect("mm-7")
+        fills, deadline = [], time.monotonic() + 5
+        while fake.connections < 2 or len(fills) < 2:
+            assert time.monotonic() < deadline, fills
+            fills += ex.on_trade(None) + ex.on_quote(None)
+            time.sleep(0.01)
+        time.sleep(0.1)
+        fills += ex.on_trade(None)
+    finally:
+        if ex is not None:
+            ex.close()
+        srv.close()
+
+    assert ("userFills", "0xabc") in fake.subs and ("orderUpdates", "0xabc") in fake.subs
+    assert [(f.client_id, f.symbol, f.side, f.px, f.fee) for f in fills] == [
+        ("mm-7", "SOL-PERP", Side.SELL, 150.5, 0.02),  # oid learned from orderUpdates via the cloid
+        ("11", "SOL-PERP", Side.BUY, 150.5, 0.02),     # missed while disconnected: from the reconnect snapshot
+    ]
+
+
+def test_bind_maps_oid_before_any_order_update():
+    got = []
+    feed = HyperliquidUserFeed("ws://unused", USER, on_fill=got.append)
+    feed.bind(42, "q-1")
+    feed._on_fills({"fills": [_fill(9, 42, feed.since_ms + 5), {"tid": 10}]})
+    assert [(f.client_id, f.sz) for f in got] == [("q-1", 0.5)]   # malformed fill skipped
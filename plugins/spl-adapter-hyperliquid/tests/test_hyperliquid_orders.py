@@ -0,0 +1,207 @@
+import threading, time
+
+import orjson
+import pytest
+
+from spltrader.core.types import OrderReq, OrdType, Side
+from spl_adapter_hyperliquid.backend import HyperliquidExec
+from spl_adapter_hyperliquid.book import L2Book
+from spl_adapter_hyperliquid.user_feed import cloid_for
+
+from test_hyperliquid_feed import ServerThread
+
+UNIVERSE = [{"name": "BTC", "szDecimals": 5}, {"name": "SOL", "szDecimals": 2}]
+
+
+class FakeExchange:
+    """Answers posts on the account socket: meta, and ok/rest for every order unless its price is 0."""
+    def __init__(self):
+        self.actions = []
+        self.nonces = []
+        self.next_oid = 100
+
+    def _statuses(self, action):
+        if action["type"] == "cancelByCloid":
+            return ["success"] * len(action["cancels"])
+        orders = action["orders"] if action["type"] == "order" else [m["order"] for m in action["modifies"]]
+        out = []
+        for o in orders:
+            self.next_oid += 1
+            out.append({"error": "Order has invalid price."} if o["p"] == "0" else {"resting": {"oid": self.next_oid}})
+        return out
+
+    async def handler(self, ws):
+        async for raw in ws:
+            msg = orjson.loads(raw)
+            if msg["method"] == "post":
+                await self._answer(ws, msg)
+
+    async def _answer(self, ws, msg):
+        req = msg["request"]
+        if req["type"] == "info":
+            resp = {"type": "info", "payload": {"type": "meta", "data": {"universe": UNIVERSE}}}
+        else:
+            action = req["payload"]["action"]
+            self.actions.append(action)
+            self.nonces.append(req["payload"]["nonce"])
+            resp = {"type": "action", "payload": {"status": "ok", "response": {
+                "type": action["type"], "data": {"statuses": self._statuses(action)}}}}
+        await ws.send(orjson.dumps({"channel": "post", "data": {"id": msg["id"], "response": resp}}).decode())
+
+
+def _signer(action, nonce):
+    return {"r": "0x1", "s": "0x2", "v": 27}
+
+
+def _req(cid, side, px, replaces=None):
+    return OrderReq(cid, "SOL-PERP", side, OrdType.LIMIT, px, 1.234, "GTC", {"replaces": replaces} if replaces else None)
+
+
+def _wait_acks(ex, n, timeout=5.0):
+    acks, deadline = [], time.monotonic() + timeout
+    while len(acks) < n:
+        assert time.monotonic() < deadline, acks
+        acks += ex.poll_acks()
+        time.sleep(0.005)
+    return acks
+
+
+def _held(ex):
+    """Keep the loop busy while the engine thread queues, so one flush sees everything."""
+    gate = threading.Event()
+    ex._loop.call_soon_threadsafe(gate.wait, 5)
+    return gate
+
+
+def test_tick_orders_go_out_as_one_signed_action():
+    fake = FakeExchange()
+    srv = ServerThread(fake.handler)
+    ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": "0xabc"}, signer=_signer)
+    try:
+        ids = ex.place_many([_req("bid", Side.BUY, 149.987654), _req("ask", Side.SELL, 150.5), _req("bad", Side.BUY, 0.0)])
+        assert ids == ["bid", "ask", "bad"]
+        acks = {a.client_id: a for a in _wait_acks(ex, 3)}
+
+        [order] = fake.actions
+        assert order["type"] == "order" and order["grouping"] == "na"
+        assert [(o["a"], o["b"], o["p"], o["s"], o["c"]) for o in order["orders"]] == [
+            (1, True, "149.99", "1.23", cloid_for("bid")),     # 5 significant figures, szDecimals = 2
+            (1, False, "150.5", "1.23", cloid_for("ask")),
+            (1, True, "0", "1.23", cloid_for("bad")),
+        ]
+        assert acks["bid"].ok and acks["ask"].ok and acks["bid"].ref != acks["ask"].ref
+        assert not acks["bad"].ok and "invalid price" in acks["bad"].error
+
+        gate = _held(ex)
+        ex.place(_req("bid2", Side.BUY, 149.5, replaces="bid"))
+        assert ex.cancel("ask") and ex.cancel("nope")
+        gate.set()
+        acks = _wait_acks(ex, 4)
+        assert [a["type"] for a in fake.actions[1:]] == ["batchModify", "cancelByCloid"]
+        assert fake.actions[1]["modifies"][0]["oid"] == cloid_for("bid")
+        assert fake.actions[2]["cancels"] == [{"asset": 1, "cloid": cloid_for("ask")}]
+        assert sorted((a.op, a.client_id, a.ok) for a in acks) == [
+            ("cancel", "ask", True), ("cancel", "bid", True), ("cancel", "nope", False), ("place", "bid2", True)]
+        assert fake.nonces == sorted(set(fake.nonces))       # strictly increasing
+    finally:
+        ex.close()
+        srv.close()
+
+
+def test_no_signer_rejects_without_blocking():
+    fake = FakeExchange()
+    srv = ServerThread(fake.handler)
+    ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": "0xabc"})
+    try:
+        t0 = time.perf_counter()
+        ex.place(_req("x", Side.BUY, 150.0))
+        assert time.perf_counter() - t0 < 0.05
+        [ack] = _wait_acks(ex, 1)
+        assert not ack.ok and "no signer" in ack.error and fake.actions == []
+    finally:
+        ex.close()
+        srv.close()
+
+
+def test_market_orders_without_px_are_priced_off_the_book():
+    fake = FakeExchange()
+    srv = ServerThread(fake.handler)
+    sol = L2Book("SOL")
+    sol.update_top(("149.9", "2", "150.1", "3"), [], 1)
+    ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": "0xabc", "market_slippage": 0.01},
+                         signer=_signer, book={"SOL-PERP": sol}.get)
+    try:
+        ex.place_many([OrderReq("buy", "SOL-PERP", Side.BUY, OrdType.MARKET, None, 1.0),
+                       OrderReq("sell", "SOL-PERP", Side.SELL, OrdType.MARKET, None, 1.0),
+                       OrderReq("nobook", "BTC-PERP", Side.BUY, OrdType.MARKET, None, 0.001)])
+        acks = {a.client_id: a for a in _wait_acks(ex, 3)}
+        [order] = fake.actions
+        assert [(float(o["p"]), o["t"]) for o in order["orders"]] == [
+            (pytest.approx(150.1 * 1.01, abs=0.01), {"limit": {"tif": "Ioc"}}),   # crosses the ask by 1%
+            (pytest.approx(149.9 * 0.99, abs=0.01), {"limit": {"tif": "Ioc"}}),
+        ]
+        assert acks["buy"].ok and acks["sell"].ok
+        assert not acks["nobook"].ok and "BTC-PERP" in acks["nobook"].error
+    finally:
+        ex.close()
+        srv.close()
+
+
+class DroppingExchange(FakeExchange):
+    """Executes the first action, then drops the socket before replying; later tells what happened to it."""
+    def __init__(self, updates: bool):
+        super().__init__()
+        self.updates = updates      # announce the order on orderUpdates after the reconnect
+        self.dropped = None
+        self.connections = 0
+
+    async def handler(self, ws):
+        self.connections += 1
+        async for raw in ws:
+            msg = orjson.loads(raw)
+            if msg["method"] == "subscribe":
+                if msg["subscription"]["type"] == "orderUpdates" and self.dropped and self.updates:
+                    await ws.send(orjson.dumps({"channel": "orderUpdates", "data": [{"order": {
+                        "coin": "SOL", "oid": 555, "cloid": self.dropped["c"]}, "status": "open"}]}).decode())
+                continue
+            req = msg["request"]
+            if req["type"] == "action" and self.dropped is None:
+                self.actions.append(req["payload"]["action"])
+                self.dropped = req["payload"]["action"]["orders"][0]
+                await ws.close()
+                return
+            if req["type"] == "info" and req["payload"]["type"] == "orderStatus":
+                data = {"status": "unknownOid"}   # this fake never rests the dropped order
+                resp = {"type": "info", "payload": {"type": "orderStatus", "data": data}}
+                await ws.send(orjson.dumps({"channel": "post", "data": {"id": msg["id"], "response": resp}}).decode())
+                continue
+            await super()._answer(ws, msg)
+
+
+def test_lost_reply_is_reconciled_from_order_updates_not_rejected():
+    fake = DroppingExchange(updates=True)
+    srv = ServerThread(fake.handler)
+    ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": "0xabc",
+                          "reconcile_after_s": 30}, signer=_signer)
+    try:
+        ex.place(_req("x", Side.BUY, 150.0))
+        [ack] = _wait_acks(ex, 1)
+        assert (ack.client_id, ack.op, ack.ok, ack.ref) == ("x", "place", True, "555")
+        assert fake.connections == 2 and ex.poll_acks() == []
+    finally:
+        ex.close()
+        srv.close()
+
+
+def test_lost_reply_for_an_order_the_exchange_never_saw_fails_after_lookup():
+    fake = DroppingExchange(updates=False)
+    srv = ServerThread(fake.handler)
+    ex = HyperliquidExec({"ws_url": f"ws://127.0.0.1:{srv.port}", "account_address": "0xabc",
+                          "reconcile_after_s": 0.05}, signer=_signer)
+    try:
+        ex.place(_req("x", Side.BUY, 150.0))
+        [ack] = _wait_acks(ex, 1)
+        assert (ack.client_id, ack.ok, ack.error) == ("x", False, "not on the exchange")
+    finally:
+        ex.close()
+        srv.close()
@@ -0,0 +1,136 @@
+import time, tomllib
+from pathlib import Path
+
+import click
+
+from spltrader.core.types import AccountSnapshot
+from spltrader.engine.engine import Engine
+from spltrader.storage.replay import TapeMarket
+from spltrader.core.log import log, WARN, configure_from as configure_log
+from spltrader.cli.helpers import fail, validate_config, symbols_from_config, check_storage_health
+
+# Replays recorded tapes ([record].dir, see storage/recorder.py) through the
+# paper or shadow backend as fast as the CPU allows. Events are merged by
+# timestamp and every clock in the simulated path (strategy client ids, store
+# event rows, snapshots) is event time, so two runs over the same tapes
+# produce the same fills.
+
+
+@click.command()
+@click.option("--config", required=True, help="Path to TOML config")
+@click.option("--tape", "tape_dir", default=None, help="Tape root directory (default: [record].dir)")
+@click.option("--start", default=None, help="First day to replay, YYYYmmdd (inclusive)")
+@click.option("--end", default=None, help="Last day to replay, YYYYmmdd (inclusive)")
+@click.option("--verbose", is_flag=True, help="Keep the engine's per-fill/place log records ([log].level)")
+@click.option("--vectorized", is_flag=True, help="NumPy path for array-native strategies (same fills)")
+def backtest(config, tape_dir, start, end, verbose, vectorized):
+    cfg = tomllib.load(Path(config).open("rb"))
+    validate_config(cfg)
+    configure_log(cfg)
+    symbols = symbols_from_config(cfg)
+    if cfg["mode"] not in ("paper", "shadow"):
+        fail(f"backtest replays through the paper or shadow backend, not mode={cfg['mode']!r}")
+    tape_dir = tape_dir or cfg.get("record", {}).get("dir")
+    if not tape_dir:
+        fail("no tapes to replay: pass --tape or set [record].dir")
+
+    check_storage_health(cfg)
+    market = TapeMarket(tape_dir, start=start, end=end)
+    click.echo(f"[SPL] Backtest mode={cfg['mode']} tapes={tape_dir} symbols={','.join(symbols)}")
+    if vectorized:
+        stats = run_backtest_vectorized(cfg, market, symbols)
+    else:
+        stats = run_backtest(cfg, market, symbols, quiet=not verbose)
+    click.echo(
+        f"[SPL] {stats['events']} events, {stats['fills']} fills in {stats['wall_sec']:.3f}s wall "
+        f"({stats['events_per_sec']:,.0f} events/s, {stats['speedup']:,.1f}x real time)"
+    )
+
+
+def run_backtest(cfg, market, symbols, quiet: bool = True) -> dict:
+    """Run the configured strategy over `market` to exhaustion; returns throughput stats."""
+    # lazy: main.py imports this module for the `spl backtest` subcommand
+    from spltrader.cli.main import build_components, build_store
+
+    eng = None
+    store = build_store(cfg, clock=lambda: eng.now)
+    _, exec_backend, risk, strategies = build_components(cfg, symbols, store, market=market)
+    eng = Engine(market, exec_backend, store, risk,
+                 merge="timestamp",
+                 snapshot_ms=cfg.get("engine", {}).get("snapshot_ms", 0))
+
+    level = log.level
+    if quiet:
+        # per-fill/place records would otherwise dominate the run time
+        log.level = max(level, WARN)
+    try:
+        t0 = time.perf_counter()
+        eng.run(symbols, strategies)
+        wall = time.perf_counter() - t0
+        store.write_snapshot(exec_backend.snapshot())
+    finally:
+        log.level = level
+        store.close()
+
+    firsts = [ts for ts in map(market.first_ts, symbols) if ts is not None]
+    return _stats(eng.n_events, eng.n_fills, wall, min(firsts) if firsts else None, eng.now)
+
+
+def run_backtest_vectorized(cfg, market, symbols) -> dict:
+    """
+    Same run as run_backtest for strategies with a signals() array method
+    (see engine/vectorized.py); fills and a final snapshot go to the store.
+    """
+    from spltrader.cli.main import build_components, build_store
+    from spltrader.engine.vectorized import EventArrays, run_vectorized
+
+    mode = cfg["mode"]
+    store = build_store(cfg)
+    try:
+        _, exec_backend, _, strategies = build_components(cfg, symbols, store, market=market)
+        for sym, strat in strategies.items():
+            if not hasattr(strat, "signals"):
+                fail(f"strategy for {sym} has no signals() array method; drop --vectorized")
+        # the backend only supplies its configured fee/slippage; fills are computed over arrays
+        costs = {"fee_bps": exec_backend.fee_bps}
+        if mode == "paper":
+            costs["slippage_bps"] = exec_backend.slippage_bps
+
+        t0 = time.perf_counter()
+        n_events, results, first, last = 0, [], None, None
+        for sym in symbols:
+            ev = EventArrays.from_tape(market.as_numpy(sym))
+            if not len(ev):
+                continue
+            n_events += len(ev)
+            first = ev.ts[0] if first is None else min(first, ev.ts[0])
+            last = ev.ts[-1] if last is None else max(last, ev.ts[-1])
+            results.append((run_vectorized(ev, strategies[sym], mode, symbol=sym, **costs), strategies[sym]))
+        wall = time.perf_counter() - t0
+
+        positions = {}
+        for vf, strat in results:
+            for f in vf.to_fills(strat):
+                store.write_fill(f)
+            if len(vf):
+                positions[vf.symbol] = vf.position()
+        balance = -sum(float(vf.fee.sum()) for vf, _ in results) if mode == "shadow" else 0.0
+        store.write_snapshot(AccountSnapshot(ts=int(last or 0), balance=balance,
+                                             positions=positions if mode == "shadow" else {}))
+    finally:
+        store.close()
+    return _stats(n_events, sum(len(vf) for vf, _ in results), wall,
+                  None if first is None else int(first), int(last or 0))
+
+
+def _stats(events: int, fills: int, wall: float, first_ts, last_ts: int) -> dict:
+    sim_sec = (last_ts - first_ts) / 1000.0 if first_ts is not None else 0.0
+    return {
+        "events": events,
+        "fills": fills,
+        "wall_sec": wall,
+        "events_per_sec": events / wall if wall > 0 else 0.0,
+        "sim_sec": sim_sec,
+        "speedup": sim_sec / wall if wall > 0 else 0.0,
+    }
+
@@ -23,10 +23,15 @@ def ensure_instance(obj, typename="component"):
 
 def validate_config(cfg: Mapping[str, Any]) -> None:
     """Validate required top-level config keys and field types."""
-    for key in ("mode", "exchange", "symbol"):
+    for key in ("mode", "exchange"):
         if key not in cfg:
             fail(f"Config missing required key: {key}")
 
+    if "symbol" not in cfg and "symbols" not in cfg:
+        fail("Config missing required key: symbol (or symbols = [...])")
+    if "symbols" in cfg and (not isinstance(cfg["symbols"], list) or not cfg["symbols"]):
+        fail("Config symbols must be a non-empty list, e.g. symbols = [\"SOL-PERP\", \"BTC-PERP\"]")
+
     fees = cfg.get("fees", {})
     if "bps" not in fees or not isinstance(fees["bps"], (int, float)):
         fail("Config [fees].bps must be set (float bps)")
@@ -62,6 +67,12 @@ def validate_config(cfg: Mapping[str, Any]) -> None:
     click.secho(f"[STORE] Using database at: {resolved_path}", fg="cyan")
 
 
+def symbols_from_config(cfg: Mapping[str, Any]) -> list[str]:
+    """`symbols = [...]` wins over the single-symbol `symbol = "..."` form; duplicates are dropped."""
+    raw = cfg.get("symbols") or [cfg["symbol"]]
+    return list(dict.fromkeys(raw))
+
+
 def validate_strategy(strategy) -> None:
     """Ensure the strategy implements the expected interface."""
     if not hasattr(strategy, "on_event") or not callable(strategy.on_event):
@@ -122,7 +133,8 @@ def diagnostics_summary(
     if cfg.get("exchange") == "hyperliquid":
         click.secho(f" Network:    {hl.get('network', 'mainnet')}", fg="green")
 
-    click.secho(f" Symbol:     {cfg.get('symbol', '???')}", fg="green")
+    syms = cfg.get("symbols") or [cfg.get("symbol", "???")]
+    click.secho(f" Symbols:    {', '.join(syms)}", fg="green")
     click.secho(f" Observe:    {'Yes' if observe else 'No'}", fg="green")
 
     # --- Storage info ---
@@ -1,4 +1,4 @@
-import click, tomllib
+import asyncio, click, tomllib
 from pathlib import Path
 
 from spltrader.cli.resolve import resolve_market
@@ -7,12 +7,19 @@ from spltrader.mock_adapter.mock import MockMarket
 from spltrader.exec.backend_shadow import ShadowBackend
 from spltrader.exec.backend_paper import PaperBackend
 
-from spltrader.storage.sqlite_store import SQLiteStore
+from spltrader.storage.sqlite_store import SQLiteStore, WriteBehindSQLiteStore
+from spltrader.storage.parquet_store import ParquetStore
+from spltrader.storage.recorder import RecordingMarket
 
 from spltrader.risk.basic import BasicRisk
 from spltrader.risk.allow_all import AllowAllRisk
 
 from spltrader.engine.engine import Engine
+from spltrader.engine.async_engine import AsyncEngine
+from spltrader.cli.supervisor import Supervisor
+from spltrader.core.log import configure_from as configure_log
+from spltrader.core.metrics import EngineMetrics, metrics, serve_from as serve_metrics
+from spltrader.cli.backtest import backtest
 
 from spltrader.strategies.demo_market_tick import DemoMarketTick
 from spltrader.strategies.demo import RangeBounce
@@ -23,66 +30,69 @@ from spltrader.cli.helpers import (
     validate_config,
     validate_strategy,
     validate_market,
+    symbols_from_config,
     diagnostics_summary,
     check_storage_health
 )
 
 
-@click.command()
+class _RunByDefault(click.Group):
+    """`spl --config x.toml` keeps meaning `spl run --config x.toml`."""
+    def parse_args(self, ctx, args):
+        if not args or args[0] not in self.commands:
+            args = ["run", *args]
+        return super().parse_args(ctx, args)
+
+
+@click.group(cls=_RunByDefault)
+def cli():
+    pass
+
+
+@cli.command()
 @click.option("--config", required=True, help="Path to TOML config")
 @click.option("--observe", is_flag=True, help="View quotes only; do not trade")
-def run(config, observe):
+@click.option("--workers", type=int, default=None, help="Shard symbols across N worker processes (supervisor mode)")
+def run(config, observe, workers):
     cfg = tomllib.load(Path(config).open("rb"))
 
     # Pre-validate config
     validate_config(cfg)
+    configure_log(cfg)
+    symbols = symbols_from_config(cfg)
+    mode, exchange = cfg["mode"], cfg["exchange"]
+    workers = workers or cfg.get("engine", {}).get("workers", 1)
 
-    # Market adapter
-    adapter = resolve_market(cfg["exchange"], cfg)
     if observe:
-        # data-only; do not start Engine/strategy
-        md = adapter.market_data()
-        for q in md.subscribe_quotes(cfg["symbol"]):
-            print(q)
+        # data-only; do not start strategy/backends
+        market = build_market(cfg)
+        try:
+            Engine(market, None, None, None, merge=cfg.get("engine", {}).get("merge")).run(symbols, observe=True)
+        finally:
+            close_market(market)
         return
 
    # Storage
-    store_cfg = cfg.get("storage", {})
-    check_storage_health(store_cfg)
-    store = SQLiteStore(cfg)
-    
-    
-    # Exec backend
-    # strategy runs for the 3 execution modes
-    mode = cfg.get("mode", "paper")
-    if mode == "paper":
-        backend = PaperBackend(store=store, slippage_bps=cfg.get("paper", {}).get("slippage_bps", 1.0))
-    elif mode == "shadow":
-        backend = ShadowBackend(store=store)
-    elif mode == "live":
-        backend = adapter.execution_live()  # from your Drift adapter
-    else:
-        raise ValueError(f"unknown mode: {mode}")
-
-    # Risk
-    # risk = BasicRisk(cfg["risk"])
-    risk = AllowAllRisk()
+    check_storage_health(cfg)
+    store = build_store(cfg)
+
+    if workers > 1:
+        # each shard runs its own Engine; this process only aggregates fills/snapshots into `store`
+        click.echo(f"[SPL] Supervisor mode={mode} exchange={exchange} workers={workers} symbols={','.join(symbols)}")
+        try:
+            Supervisor(cfg, symbols, workers, store).run()
+        finally:
+            store.close()
+        return
 
-    # Strategy
-    strat_kind = cfg.get("strategy", {}).get("kind", "range_bounce_demo")
-    if strat_kind == "range_bounce_demo":
-        strategy = RangeBounce(cfg)
-    if strat_kind == "demo_market_tick":
-        print("mtk")
-        strategy = DemoMarketTick(cfg)
-    else:
-        raise NotImplementedError(f"Strategy not found: {strat_kind}")
+    market, exec_backend, risk, strategies = build_components(cfg, symbols, store)
 
 # ----- DO NOT EDIT BENEATH THIS LINE UNLESS YOU KNOW WHAT YOU ARE DOING ------
 
     # Pre-Run Checks
     risk = ensure_instance(risk, typename="risk")
-    validate_strategy(strategy)
+    for strategy in strategies.values():
+        validate_strategy(strategy)
     validate_market(market)
 
     # Print pre-run summary
@@ -97,11 +107,113 @@ def run(config, observe):
     )
 
     # Engine
-    eng = Engine(market, exec_backend, store, risk)
-    click.echo(f"[SPL] Running mode={mode} exchange={exchange} symbol={symbol}")
+    server = serve_metrics(cfg)  # [metrics].port: Prometheus endpoint + summary line
+    if cfg.get("engine", {}).get("async", False):
+        # asyncio-native path; adapters without an async twin are wrapped, and
+        # backends say themselves whether their calls block (AsyncBackendWrapper)
+        amarket = market.aio() if hasattr(market, "aio") else market
+        aeng = AsyncEngine(amarket, exec_backend, store, risk,
+                           snapshot_ms=cfg.get("engine", {}).get("snapshot_ms", 0),
+                           metrics=EngineMetrics(metrics) if server else None)
+        click.echo(f"[SPL] Running (async) mode={mode} exchange={exchange} symbols={','.join(symbols)}")
+        try:
+            asyncio.run(aeng.run(symbols, strategies))
+        finally:
+            close_market(market)
+            store.close()
+            if server:
+                server.close()
+        return
+
+    eng = Engine(market, exec_backend, store, risk,
+                 merge=cfg.get("engine", {}).get("merge"),
+                 snapshot_ms=cfg.get("engine", {}).get("snapshot_ms", 0),
+                 metrics=EngineMetrics(metrics) if server else None)
+    click.echo(f"[SPL] Running mode={mode} exchange={exchange} symbols={','.join(symbols)}")
+    try:
+        eng.run(symbols, strategies)
+    finally:
+        close_market(market)  # finishes tapes when recording
+        store.close()  # drains a write-behind store before exit
+        if server:
+            server.close()
+
+
+cli.add_command(backtest)
+
+
+def build_store(cfg, clock=None):
+    """
+    [storage].kind picks sqlite (default) or parquet; write_behind moves SQLite commits off the engine thread.
+    clock() -> ms stamps event rows (wall time unless given).
+    """
+    if cfg.get("storage", {}).get("kind", "sqlite") == "parquet":
+        return ParquetStore(cfg, clock=clock)
+    if cfg.get("storage", {}).get("write_behind", False):
+        return WriteBehindSQLiteStore(cfg, clock=clock)
+    return SQLiteStore(cfg, clock=clock)
+
+
+def build_adapter(cfg):
+    """Adapter for cfg["exchange"]; one instance serves every symbol."""
+    if cfg["exchange"] == "mock":
+        return MockMarket(cfg)
+    return resolve_market(cfg["exchange"], cfg)
+
+
+def build_market(cfg, adapter=None):
+    """Market data for the run; [record].dir tapes every quote/trade it yields."""
+    adapter = adapter or build_adapter(cfg)
+    market = adapter.market_data() if hasattr(adapter, "market_data") else adapter
+    rec = cfg.get("record", {})
+    if rec.get("dir"):
+        market = RecordingMarket(market, rec["dir"], index_every=int(rec.get("index_every", 4096)))
+    return market
+
+
+def close_market(market):
+    if isinstance(market, RecordingMarket):
+        market.close()
+
+
+def build_components(cfg, symbols, store, market=None):
+    """
+    Market, exec backend, risk and per-symbol strategies for a run over `symbols`.
+    Used by the single-process CLI path, by each supervisor shard and by backtests
+    (which pass their tape `market`; live mode needs the configured adapter).
+    """
+    mode = cfg.get("mode", "paper")
+    adapter = build_adapter(cfg) if market is None or mode == "live" else None
+    market = market if market is not None else build_market(cfg, adapter)
+
+    # Exec backend
+    # strategy runs for the 3 execution modes
+    if mode == "paper":
+        exec_backend = PaperBackend(store=store, slippage_bps=cfg.get("paper", {}).get("slippage_bps", 1.0))
+    elif mode == "shadow":
+        exec_backend = ShadowBackend(fee_bps=cfg.get("fees", {}).get("bps", 0.0))
+    elif mode == "live":
+        exec_backend = adapter.execution_live()  # from your Drift adapter
+    else:
+        raise ValueError(f"unknown mode: {mode}")
+
+    # Risk
+    # risk = BasicRisk(cfg["risk"])
+    risk = AllowAllRisk()
 
-    # Pylance complains here because symbol: str | None, but validate_config takes care of this check for us
-    eng.run(symbol, strategy, observe=observe) # type: ignore[arg-type]
+    # Strategy: one instance per symbol, each built from a per-symbol view of the config
+    strategies = {sym: make_strategy({**cfg, "symbol": sym}) for sym in symbols}
+    return market, exec_backend, risk, strategies
+
+
+def make_strategy(cfg):
+    """Build the configured strategy for the single symbol in cfg["symbol"]."""
+    strat_kind = cfg.get("strategy", {}).get("kind", "range_bounce_demo")
+    if strat_kind == "range_bounce_demo":
+        return RangeBounce(cfg)
+    if strat_kind == "demo_market_tick":
+        return DemoMarketTick(cfg)
+    raise NotImplementedError(f"Strategy not found: {strat_kind}")
 
 if __name__ == "__main__":
-    run()
+    cli()
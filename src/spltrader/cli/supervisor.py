@@ -0,0 +1,182 @@
+# spltrader/cli/supervisor.py
+import multiprocessing as mp
+import queue, time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from ..core.types import AccountSnapshot
+from ..core.log import log, configure_from as configure_log
+from ..core.metrics import EngineMetrics, metrics, serve_from as serve_metrics
+from ..engine.engine import Engine
+
+# Supervisor mode: split the symbol list across N worker processes, each running
+# its own Engine (own GIL, own feed connection, own backend). Workers never touch
+# the database; fills, events and snapshots are forwarded to this process, which
+# owns the one real store. Crashed shards are restarted with exponential backoff.
+
+
+def shard_symbols(symbols: list[str], workers: int) -> list[list[str]]:
+    """Round-robin split; never more shards than symbols."""
+    n = max(1, min(workers, len(symbols)))
+    return [symbols[i::n] for i in range(n)]
+
+
+class QueueStore:
+    """IStorage for shard workers: forwards every write to the supervisor."""
+    def __init__(self, out_q, shard_id: int):
+        self.out_q = out_q
+        self.shard_id = shard_id
+
+    def write_fill(self, f):
+        self.out_q.put(("fill", self.shard_id, f))
+
+    def write_event(self, kind: str, payload: dict):
+        self.out_q.put(("event", self.shard_id, (kind, dict(payload))))
+
+    def write_snapshot(self, s: AccountSnapshot):
+        # copy now: the queue pickles on a feeder thread while the engine keeps mutating positions
+        positions = {sym: dict(p) for sym, p in s.positions.items()}
+        self.out_q.put(("snapshot", self.shard_id, AccountSnapshot(ts=s.ts, balance=s.balance, positions=positions)))
+
+
+def run_shard(shard_id: int, cfg: dict, symbols: list[str], out_q) -> None:
+    """Worker entry point: build components for this shard's symbols and run the Engine."""
+    from .main import build_components, close_market  # imported here so workers only pay for it after spawn
+
+    configure_log(cfg)  # spawned workers start with a fresh, default-configured log
+    # each shard has its own registry; shard i serves [metrics].port + 1 + i
+    mc = cfg.get("metrics", {})
+    server = serve_metrics({"metrics": {**mc, "port": int(mc["port"]) + 1 + shard_id}}) if "port" in mc else None
+    store = QueueStore(out_q, shard_id)
+    market, exec_backend, risk, strategies = build_components(cfg, symbols, store)
+    eng_cfg = cfg.get("engine", {})
+    eng = Engine(market, exec_backend, store, risk,
+                 merge=eng_cfg.get("merge"),
+                 snapshot_ms=eng_cfg.get("snapshot_ms", 5_000),
+                 metrics=EngineMetrics(metrics) if server else None)
+    try:
+        eng.run(symbols, strategies)
+    finally:
+        close_market(market)
+        if server:
+            server.close()
+        log.close()
+
+
+@dataclass
+class _Shard:
+    id: int
+    symbols: list[str]
+    proc: Optional[mp.process.BaseProcess] = None
+    restarts: int = 0
+    restart_at: Optional[float] = None
+    done: bool = False
+    failed: bool = False
+
+
+class Supervisor:
+    """
+    Config ([engine] table):
+      workers        number of shards (CLI --workers overrides)
+      max_restarts   per shard before giving up (default 5)
+      restart_backoff_sec  first restart delay, doubled per crash, capped at 30s (default 1.0)
+      snapshot_ms    how often each shard forwards a backend snapshot (default 5000)
+    """
+    def __init__(self, cfg: dict, symbols: list[str], workers: int, store,
+                 target: Callable = run_shard, start_method: str = "spawn"):
+        eng_cfg = cfg.get("engine", {})
+        self.cfg = cfg
+        self.store = store
+        self.target = target
+        self.max_restarts = int(eng_cfg.get("max_restarts", 5))
+        self.backoff_sec = float(eng_cfg.get("restart_backoff_sec", 1.0))
+        self.ctx = mp.get_context(start_method)
+        self.out_q = self.ctx.Queue()
+        self.shards = [_Shard(i, syms) for i, syms in enumerate(shard_symbols(symbols, workers))]
+        self.snapshots: dict[int, AccountSnapshot] = {}
+        self.n_fills = 0
+
+    def run(self) -> None:
+        for sh in self.shards:
+            self._start(sh)
+        try:
+            while not all(sh.done for sh in self.shards):
+                self._drain(timeout=0.2)
+                self._check()
+            self._drain(timeout=0)
+        finally:
+            self.stop()
+        failed = [sh.id for sh in self.shards if sh.failed]
+        log.info("supervisor", event="stopped", fills=self.n_fills, failed=",".join(map(str, failed)) or "none")
+
+    def stop(self) -> None:
+        for sh in self.shards:
+            if sh.proc is not None and sh.proc.is_alive():
+                sh.proc.terminate()
+                sh.proc.join(timeout=5)
+
+    def aggregate_snapshot(self) -> AccountSnapshot:
+        """Latest snapshot of every shard folded into one account view (shards own disjoint symbols)."""
+        ts, balance, positions = 0, 0.0, {}
+        for s in self.snapshots.values():
+            ts = max(ts, s.ts)
+            balance += s.balance
+            positions.update(s.positions)
+        return AccountSnapshot(ts=ts, balance=balance, positions=positions)
+
+    # --- internals ---
+    def _start(self, sh: _Shard) -> None:
+        sh.proc = self.ctx.Process(target=self.target, name=f"spl-shard-{sh.id}",
+                                   args=(sh.id, self.cfg, sh.symbols, self.out_q), daemon=True)
+        sh.proc.start()
+        sh.restart_at = None
+        log.info("supervisor", event="shard_started", shard=sh.id, pid=sh.proc.pid, symbols=",".join(sh.symbols))
+
+    def _check(self) -> None:
+        now = time.monotonic()
+        for sh in self.shards:
+            if sh.done:
+                continue
+            if sh.proc is None:
+                if sh.restart_at is not None and now >= sh.restart_at:
+                    self._start(sh)
+                continue
+            if sh.proc.is_alive():
+                continue
+
+            code, sh.proc = sh.proc.exitcode, None
+            if code == 0:
+                sh.done = True
+                log.info("supervisor", event="shard_finished", shard=sh.id)
+            elif sh.restarts >= self.max_restarts:
+                sh.done = sh.failed = True
+                log.error("supervisor", event="shard_failed", shard=sh.id, exit=code, restarts=self.max_restarts)
+            else:
+                delay = min(self.backoff_sec * 2 ** sh.restarts, 30.0)
+                sh.restarts += 1
+                sh.restart_at = now + delay
+                log.warn("supervisor", event="shard_crashed", shard=sh.id, exit=code, restart=sh.restarts,
+                         delay_s=round(delay, 1))
+
+    def _drain(self, timeout: float) -> None:
+        """Apply everything queued by the workers; waits up to `timeout` for the first message."""
+        try:
+            msg = self.out_q.get(timeout=timeout) if timeout else self.out_q.get_nowait()
+        except queue.Empty:
+            return
+        while True:
+            self._apply(*msg)
+            try:
+                msg = self.out_q.get_nowait()
+            except queue.Empty:
+                return
+
+    def _apply(self, kind: str, shard_id: int, body) -> None:
+        if kind == "fill":
+            self.n_fills += 1
+            self.store.write_fill(body)
+        elif kind == "event":
+            self.store.write_event(*body)
+        elif kind == "snapshot":
+            self.snapshots[shard_id] = body
+            self.store.write_snapshot(body)
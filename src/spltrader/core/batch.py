@@ -0,0 +1,125 @@
+# src/spltrader/core/batch.py
+from array import array
+from typing import Iterable, Iterator
+from .types import Quote, Trade, Side
+
+# Columnar (struct-of-arrays) containers for one symbol's quotes or trades.
+# Columns are array('q') / array('d') / array('b'), so a batch of N events
+# costs a few contiguous buffers instead of N objects, and to_numpy() views
+# them without copying.
+#
+# Adapters may yield a batch wherever they would yield a single Quote/Trade;
+# the engines expand it row by row, so strategies and backends that handle
+# one event at a time keep working. Bulk consumers read the columns directly.
+# A batch is never empty: an adapter with no rows yields nothing, since
+# merge policies order batches by their first row (`ts` raises ValueError).
+
+_SIDE_CODE = {Side.BUY: 1, Side.SELL: -1}
+_CODE_SIDE = {1: Side.BUY, -1: Side.SELL}
+
+
+class QuoteBatch:
+    __slots__ = ("symbol", "ts_col", "bid", "ask", "bid_sz", "ask_sz")
+
+    def __init__(self, symbol: str = ""):
+        self.symbol = symbol
+        self.ts_col = array("q")
+        self.bid = array("d")
+        self.ask = array("d")
+        self.bid_sz = array("d")
+        self.ask_sz = array("d")
+
+    @classmethod
+    def from_quotes(cls, quotes: Iterable[Quote], symbol: str = "") -> "QuoteBatch":
+        b = cls(symbol)
+        for q in quotes:
+            b.append(q.ts, q.bid, q.ask, q.bid_sz, q.ask_sz)
+        return b
+
+    def append(self, ts: int, bid: float, ask: float, bid_sz: float, ask_sz: float) -> None:
+        self.ts_col.append(ts)
+        self.bid.append(bid)
+        self.ask.append(ask)
+        self.bid_sz.append(bid_sz)
+        self.ask_sz.append(ask_sz)
+
+    @property
+    def ts(self) -> int:
+        """Time of the first row (merge policies order batches by it)."""
+        try:
+            return self.ts_col[0]
+        except IndexError:
+            raise ValueError("empty QuoteBatch has no ts (adapters must not emit empty batches)") from None
+
+    def __len__(self) -> int:
+        return len(self.ts_col)
+
+    def row(self, i: int) -> Quote:
+        return Quote(ts=self.ts_col[i], bid=self.bid[i], ask=self.ask[i],
+                     bid_sz=self.bid_sz[i], ask_sz=self.ask_sz[i], symbol=self.symbol)
+
+    def __iter__(self) -> Iterator[Quote]:
+        sym = self.symbol
+        for ts, bid, ask, bsz, asz in zip(self.ts_col, self.bid, self.ask, self.bid_sz, self.ask_sz):
+            yield Quote(ts=ts, bid=bid, ask=ask, bid_sz=bsz, ask_sz=asz, symbol=sym)
+
+    def to_numpy(self) -> dict:
+        """Zero-copy NumPy views of the columns (needs numpy; don't append while they are alive)."""
+        import numpy as np
+        return {"ts": np.frombuffer(self.ts_col, dtype=np.int64),
+                **{c: np.frombuffer(getattr(self, c), dtype=np.float64) for c in ("bid", "ask", "bid_sz", "ask_sz")}}
+
+
+class TradeBatch:
+    __slots__ = ("symbol", "ts_col", "price", "size", "side")
+
+    def __init__(self, symbol: str = ""):
+        self.symbol = symbol
+        self.ts_col = array("q")
+        self.price = array("d")
+        self.size = array("d")
+        self.side = array("b")  # +1 buy / -1 sell aggressor
+
+    @classmethod
+    def from_trades(cls, trades: Iterable[Trade], symbol: str = "") -> "TradeBatch":
+        b = cls(symbol)
+        for t in trades:
+            b.append(t.ts, t.price, t.size, t.side)
+        return b
+
+    def append(self, ts: int, price: float, size: float, side: Side) -> None:
+        self.ts_col.append(ts)
+        self.price.append(price)
+        self.size.append(size)
+        self.side.append(_SIDE_CODE[side])
+
+    @property
+    def ts(self) -> int:
+        """Time of the first row (merge policies order batches by it)."""
+        try:
+            return self.ts_col[0]
+        except IndexError:
+            raise ValueError("empty TradeBatch has no ts (adapters must not emit empty batches)") from None
+
+    def __len__(self) -> int:
+        return len(self.ts_col)
+
+    def row(self, i: int) -> Trade:
+        return Trade(ts=self.ts_col[i], price=self.price[i], size=self.size[i],
+                     side=_CODE_SIDE[self.side[i]], symbol=self.symbol)
+
+    def __iter__(self) -> Iterator[Trade]:
+        sym, sides = self.symbol, _CODE_SIDE
+        for ts, px, sz, sd in zip(self.ts_col, self.price, self.size, self.side):
+            yield Trade(ts=ts, price=px, size=sz, side=sides[sd], symbol=sym)
+
+    def to_numpy(self) -> dict:
+        """Zero-copy NumPy views of the columns (needs numpy; don't append while they are alive)."""
+        import numpy as np
+        return {"ts": np.frombuffer(self.ts_col, dtype=np.int64),
+                "price": np.frombuffer(self.price, dtype=np.float64),
+                "size": np.frombuffer(self.size, dtype=np.float64),
+                "side": np.frombuffer(self.side, dtype=np.int8)}
+
+
+BATCH_TYPES = (QuoteBatch, TradeBatch)
@@ -1,4 +1,4 @@
-from typing import Protocol, Iterable, Dict, Any
+from typing import Protocol, Iterable, AsyncIterator, Dict, Any
 from .types import Quote, Trade, OrderReq, Fill, AccountSnapshot
 
 class IMarketData(Protocol):
@@ -14,6 +14,22 @@ class IExecutionBackend(Protocol):
     def on_trade(self, t: Trade) -> Iterable[Fill]: ...
     def snapshot(self) -> AccountSnapshot: ...
 
+# Async counterparts, used by AsyncEngine. Sync implementations can be wrapped
+# with spltrader.engine.async_engine.as_async_market / as_async_backend.
+
+class IAsyncMarketData(Protocol):
+    def subscribe_quotes(self, symbol: str) -> AsyncIterator[Quote]: ...
+    def subscribe_trades(self, symbol: str) -> AsyncIterator[Trade]: ...
+    async def get_mark_price(self, symbol: str) -> float: ...
+    async def get_funding(self, symbol: str) -> float: ...
+
+class IAsyncExecutionBackend(Protocol):
+    async def place(self, req: OrderReq) -> str: ...
+    async def cancel(self, client_order_id: str) -> bool: ...
+    async def on_quote(self, q: Quote) -> Iterable[Fill]: ...
+    async def on_trade(self, t: Trade) -> Iterable[Fill]: ...
+    async def snapshot(self) -> AccountSnapshot: ...
+
 class IStorage(Protocol):
     def write_event(self, kind: str, payload: Dict[str, Any]) -> None: ...
     def write_fill(self, f: Fill) -> None: ...
@@ -0,0 +1,182 @@
+# src/spltrader/core/log.py
+import atexit, sys, threading, time
+from collections import deque
+
+import orjson
+
+# Structured, leveled event log for the hot path.
+#
+#   from spltrader.core.log import log, DEBUG
+#   if log.level <= DEBUG:                      # near-free when disabled
+#       log.debug("engine.quote", symbol=s, ts=q.ts, bid=q.bid, ask=q.ask)
+#
+# Callers only append a (time, level, category, fields) tuple to a bounded
+# deque (append/popleft are atomic under the GIL, so no lock is taken). A
+# background thread formats and writes the records every `flush_ms`. When the
+# ring is full the oldest record is dropped and counted. Categories can be
+# rate-limited (records per second, token bucket); suppressed records are
+# counted and reported with the next record of that category that gets through.
+#
+# [log] keys: level ("info"), format ("kv" | "json"), file (default stderr),
+#             ring_size (65536), flush_ms (50)
+# [log.rate] <category> = records/sec, e.g. "engine.quote" = 20
+
+DEBUG, INFO, WARN, ERROR = 10, 20, 30, 40
+LEVELS = {"debug": DEBUG, "info": INFO, "warn": WARN, "warning": WARN, "error": ERROR}
+_NAMES = {DEBUG: "DEBUG", INFO: "INFO", WARN: "WARN", ERROR: "ERROR"}
+
+
+class EventLog:
+    def __init__(self, level: int = INFO, fmt: str = "kv", sink=None, ring_size: int = 65_536,
+                 flush_ms: int = 50, rates: "dict | None" = None):
+        self.level = level
+        self.fmt = fmt
+        self.sink = sink
+        self.flush_sec = flush_ms / 1000.0
+        self._ring: deque = deque(maxlen=ring_size)
+        self.dropped = 0
+        self._dropped_seen = 0
+        self._rates: dict[str, float] = dict(rates or {})
+        self._buckets: dict[str, list] = {}   # category -> [tokens, last refill, suppressed]
+        self._thread = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()         # writer side only
+
+    def enabled(self, level: int) -> bool:
+        return level >= self.level
+
+    def debug(self, cat: str, **fields) -> None:
+        if self.level <= DEBUG:
+            self._emit(DEBUG, cat, fields)
+
+    def info(self, cat: str, **fields) -> None:
+        if self.level <= INFO:
+            self._emit(INFO, cat, fields)
+
+    def warn(self, cat: str, **fields) -> None:
+        if self.level <= WARN:
+            self._emit(WARN, cat, fields)
+
+    def error(self, cat: str, **fields) -> None:
+        if self.level <= ERROR:
+            self._emit(ERROR, cat, fields)
+
+    def configure(self, level=None, fmt=None, sink=None, ring_size=None, flush_ms=None, rates=None) -> "EventLog":
+        """Change settings in place (modules hold a reference to this instance)."""
+        self.flush()
+        if level is not None:
+            self.level = LEVELS[level.lower()] if isinstance(level, str) else int(level)
+        if fmt is not None:
+            self.fmt = fmt
+        if sink is not None:
+            self.sink = sink
+        if ring_size is not None:
+            with self._lock:
+                self._ring = deque(self._ring, maxlen=int(ring_size))
+        if flush_ms is not None:
+            self.flush_sec = float(flush_ms) / 1000.0
+        if rates is not None:
+            self._rates = {k: float(v) for k, v in rates.items()}
+            self._buckets.clear()
+        return self
+
+    def flush(self) -> None:
+        """Write everything buffered so far (from the calling thread)."""
+        self._drain()
+
+    def close(self) -> None:
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._stop.clear()
+        self._drain()
+
+    # --- caller side ---
+    def _emit(self, level: int, cat: str, fields: dict) -> None:
+        rate = self._rates.get(cat)
+        if rate is not None and not self._admit(cat, rate, fields):
+            return
+        ring = self._ring
+        if len(ring) == ring.maxlen:
+            self.dropped += 1
+        ring.append((time.time(), level, cat, fields))
+        if self._thread is None:
+            self._start()
+
+    def _admit(self, cat: str, rate: float, fields: dict) -> bool:
+        now = time.monotonic()
+        b = self._buckets.get(cat)
+        if b is None:
+            b = self._buckets[cat] = [rate, now, 0]
+        b[0] = min(rate, b[0] + (now - b[1]) * rate)
+        b[1] = now
+        if b[0] < 1.0:
+            b[2] += 1
+            return False
+        b[0] -= 1.0
+        if b[2]:
+            fields["suppressed"] = b[2]
+            b[2] = 0
+        return True
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="spl-log", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # --- writer thread ---
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_sec):
+            self._drain()
+
+    def _drain(self) -> None:
+        with self._lock:
+            ring, out = self._ring, []
+            fmt = _format_json if self.fmt == "json" else _format_kv
+            while ring:
+                try:
+                    out.append(fmt(*ring.popleft()))
+                except IndexError:
+                    break
+            if self.dropped != self._dropped_seen:
+                out.append(fmt(time.time(), WARN, "log", {"dropped": self.dropped - self._dropped_seen}))
+                self._dropped_seen = self.dropped
+            if not out:
+                return
+            sink = self.sink or sys.stderr
+            if isinstance(sink, str):
+                with open(sink, "a", encoding="utf-8") as f:
+                    f.write("".join(out))
+            else:
+                sink.write("".join(out))
+                sink.flush()
+
+
+def _format_kv(t: float, level: int, cat: str, fields: dict) -> str:
+    parts = [f"ts={t:.3f}", f"level={_NAMES[level]}", f"cat={cat}"]
+    for k, v in fields.items():
+        s = v.value if hasattr(v, "value") else v  # enums as their wire value
+        s = str(s)
+        if not s or " " in s or "=" in s:
+            s = orjson.dumps(s).decode()
+        parts.append(f"{k}={s}")
+    return " ".join(parts) + "\n"
+
+
+def _format_json(t: float, level: int, cat: str, fields: dict) -> str:
+    rec = {"ts": round(t, 3), "level": _NAMES[level], "cat": cat, **fields}
+    return orjson.dumps(rec, default=str).decode() + "\n"
+
+
+def configure_from(cfg: dict) -> EventLog:
+    """Apply the [log] section of a run config to the shared `log`."""
+    lc = cfg.get("log", {})
+    return log.configure(level=lc.get("level"), fmt=lc.get("format"), sink=lc.get("file"),
+                         ring_size=lc.get("ring_size"), flush_ms=lc.get("flush_ms"), rates=lc.get("rate"))
+
+
+# shared instance used by the engine, strategies and adapters
+log = EventLog()
@@ -1,6 +1,11 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
 from enum import Enum
 
+# Event and order types are slotted (no per-instance __dict__): millions of
+# them go through a session. Fill is also frozen. Use to_dict() instead of
+# obj.__dict__, and event_price() instead of getattr(evt, "price", None).
+# Bulk columnar containers live in core/batch.py.
+
 class Side(str, Enum):
     BUY = "buy"
     SELL = "sell"
@@ -11,22 +16,28 @@ class OrdType(str, Enum):
     STOP = "stop"
     STOP_LIMIT = "stop_limit"
 
-@dataclass
+@dataclass(slots=True)
 class Quote:
     ts: int
     bid: float
     ask: float
     bid_sz: float
     ask_sz: float
+    symbol: str = ""  # stamped by the engine if the adapter leaves it empty
 
-@dataclass
+    @property
+    def mid(self) -> float:
+        return (self.bid + self.ask) / 2.0
+
+@dataclass(slots=True)
 class Trade:
     ts: int
     price: float
     size: float
     side: Side  # aggressor
+    symbol: str = ""
 
-@dataclass
+@dataclass(slots=True)
 class OrderReq:
     client_id: str
     symbol: str
@@ -37,7 +48,7 @@ class OrderReq:
     tif: str = "GTC"
     meta: dict | None = None
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class Fill:
     ts: int
     client_id: str
@@ -47,8 +58,33 @@ class Fill:
     sz: float
     fee: float
 
+@dataclass(slots=True, frozen=True)
+class OrderAck:
+    """Outcome of an asynchronous submission; backends with pipelined place()/cancel() queue these for poll_acks()."""
+    ts: int
+    client_id: str
+    symbol: str
+    ok: bool
+    op: str = "place"  # "place" | "cancel"
+    ref: str = ""      # exchange reference (tx signature, order id)
+    error: str = ""
+
 @dataclass
 class AccountSnapshot:
     ts: int
     balance: float
     positions: dict  # symbol -> dict(base, pnl_unreal, pnl_real)
+
+
+def to_dict(obj) -> dict:
+    """Field dict of a dataclass instance (shallow; works with slots, unlike __dict__)."""
+    return {f.name: getattr(obj, f.name) for f in fields(obj)}
+
+
+def event_price(evt) -> "float | None":
+    """Trade price or quote mid; None for anything else."""
+    if isinstance(evt, Trade):
+        return evt.price
+    if isinstance(evt, Quote):
+        return evt.mid
+    return None
@@ -0,0 +1,342 @@
+# spltrader/engine/async_engine.py
+import asyncio, inspect, threading
+from time import perf_counter_ns
+from typing import Any, AsyncIterator, Hashable, Mapping, Tuple
+from ..core.types import Quote, Trade, to_dict
+from ..core.batch import BATCH_TYPES
+from ..core.log import log, DEBUG, INFO
+from .engine import as_symbol_list, per_symbol
+
+# asyncio-native engine. Adapters that are async inside (Hyperliquid WS, Drift RPC)
+# can hand events straight to the loop with no thread hop or queue.Queue in between.
+# Existing sync adapters keep working through the wrappers at the bottom of this file.
+
+
+class AsyncEngine:
+    """
+    Same contract as Engine (snapshot_ms, metrics, acks), on one event loop.
+    Streams are always merged in arrival order (amerge), so the metrics have
+    no recv_to_dequeue stage.
+    """
+    def __init__(self, market, exec_backend, store, risk, snapshot_ms: int = 0, metrics=None):
+        self.market = as_async_market(market)
+        self.exec_backend = as_async_backend(exec_backend)
+        self.store = store
+        self.risk = risk
+        self.snapshot_ms = snapshot_ms
+        self._last_snapshot_ts = None
+        self.now = 0
+        self.n_events = 0
+        self.n_fills = 0
+        self.n_blocked = 0
+        # OrderAcks of pipelined backends, drained after every event (see Engine)
+        self._poll_acks = getattr(self.exec_backend, "poll_acks", None)
+        self.n_rejected = 0
+        self._strategies = {}
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+
+    async def run(self, symbols, strategy=None, observe=False):
+        """Same contract as Engine.run: one or many symbols, strategy per symbol."""
+        symbols = as_symbol_list(symbols)
+
+        if observe:
+            quotes = {(s, "quote"): self.market.subscribe_quotes(s) for s in symbols}
+            async for (symbol, _), evt in amerge(quotes):
+                for q in (evt if evt.__class__ in BATCH_TYPES else (evt,)):
+                    print(f"{symbol} {q.ts} | bid {q.bid:.4f} ask {q.ask:.4f}")
+            return
+
+        strategies = per_symbol(strategy, symbols)
+        self._strategies = strategies
+        streams = {}
+        for s in symbols:
+            streams[(s, "quote")] = self.market.subscribe_quotes(s)
+            streams[(s, "trade")] = self.market.subscribe_trades(s)
+
+        async for (symbol, kind), evt in amerge(streams):
+            if not evt.symbol:
+                evt.symbol = symbol
+            if evt.__class__ in BATCH_TYPES:
+                for row in evt:
+                    await self._dispatch(symbol, kind, row, strategies[symbol])
+            else:
+                await self._dispatch(symbol, kind, evt, strategies[symbol])
+
+    async def _dispatch(self, symbol: str, kind: str, evt, strategy):
+        self.now = evt.ts
+        self.n_events += 1
+        if kind == "quote":
+            await self.on_quote(symbol, evt, strategy)
+        else:
+            await self.on_trade(symbol, evt, strategy)
+        if self._poll_acks is not None:
+            acks = self._poll_acks()
+            if inspect.isawaitable(acks):
+                acks = await acks
+            if acks:
+                await self._on_acks(acks)
+        if self.snapshot_ms:
+            await self._maybe_snapshot(evt.ts)
+
+    async def on_quote(self, symbol: str, q: Quote, strategy):
+        if log.level <= DEBUG:
+            log.debug("engine.quote", symbol=symbol, ts=q.ts, bid=q.bid, ask=q.ask)
+
+        m = self.metrics
+        if m is None:
+            fills = await self.exec_backend.on_quote(q)
+        else:
+            t0 = perf_counter_ns()
+            fills = await self.exec_backend.on_quote(q)
+            m.match_quote.record(perf_counter_ns() - t0)
+        if fills:
+            self._book_fills(fills, "quote")
+
+        await self._run_strategy(q, strategy)
+
+    async def on_trade(self, symbol: str, t: Trade, strategy):
+        m = self.metrics
+        if m is None:
+            fills = await self.exec_backend.on_trade(t)
+        else:
+            t0 = perf_counter_ns()
+            fills = await self.exec_backend.on_trade(t)
+            m.match_trade.record(perf_counter_ns() - t0)
+        if fills:
+            self._book_fills(fills, "trade")
+
+        await self._run_strategy(t, strategy)
+
+    def _book_fills(self, fills, on: str):
+        m = self.metrics
+        for f in fills:
+            if log.level <= INFO:
+                log.info("engine.fill", on=on, id=f.client_id, side=f.side, px=f.px, sz=f.sz)
+            if m is None:
+                self.store.write_fill(f)
+            else:
+                t0 = perf_counter_ns()
+                self.store.write_fill(f)
+                m.store.record(perf_counter_ns() - t0)
+            self.risk.on_fill(f)
+            self.n_fills += 1
+
+    async def _maybe_snapshot(self, ts: int):
+        if self._last_snapshot_ts is None:
+            self._last_snapshot_ts = ts
+        elif ts - self._last_snapshot_ts >= self.snapshot_ms:
+            self._last_snapshot_ts = ts
+            self.store.write_snapshot(await self.exec_backend.snapshot())
+
+    async def _on_acks(self, acks):
+        """Same as Engine._on_acks: log, store, and hand to the strategy's optional on_ack."""
+        for ack in acks:
+            if not ack.ok:
+                self.n_rejected += 1
+                log.warn("engine.ack", id=ack.client_id, op=ack.op, ok=False, error=ack.error)
+            elif log.level <= INFO:
+                log.info("engine.ack", id=ack.client_id, op=ack.op, ok=True, ref=ack.ref)
+            if self.store is not None:
+                self.store.write_event("order_ack", to_dict(ack))
+            strategy = self._strategies.get(ack.symbol)
+            on_ack = getattr(strategy, "on_ack", None)
+            if on_ack is not None:
+                await self._submit(on_ack(ack))
+
+    async def _run_strategy(self, evt, strategy):
+        m = self.metrics
+        if m is None:
+            reqs = strategy.on_event(evt)
+        else:
+            t0 = perf_counter_ns()
+            reqs = strategy.on_event(evt)
+            m.strategy.record(perf_counter_ns() - t0)
+        await self._submit(reqs)
+
+    async def _submit(self, reqs):
+        """Risk-check and place a strategy's orders (see Engine._submit)."""
+        if not reqs:
+            return
+        m = self.metrics
+        reqs = list(reqs)
+        if log.level <= DEBUG:
+            log.debug("engine.strategy", orders=len(reqs))
+        accepted = []
+        for req in reqs:
+            if m is None:
+                ok = self.risk.pre_place(req)
+            else:
+                t0 = perf_counter_ns()
+                ok = self.risk.pre_place(req)
+                m.risk.record(perf_counter_ns() - t0)
+            if not ok:
+                self.n_blocked += 1
+                log.warn("engine.risk", blocked=req.client_id, symbol=req.symbol, side=req.side, sz=req.sz, px=req.px)
+                continue
+            if log.level <= INFO:
+                log.info("engine.place", id=req.client_id, side=req.side, type=req.type, sz=req.sz, px=req.px)
+            accepted.append(req)
+        if not accepted:
+            return
+        # same contract as Engine._submit: one place_many() per tick when the
+        # backend batches, else meta["replaces"] is cancelled before the place
+        t0 = perf_counter_ns() if m is not None else 0
+        place_many = getattr(self.exec_backend, "place_many", None)
+        if place_many is not None:
+            await place_many(accepted)
+        else:
+            for req in accepted:
+                replaces = req.meta.get("replaces") if req.meta else None
+                if replaces:
+                    await self.exec_backend.cancel(replaces)
+                await self.exec_backend.place(req)
+        if m is not None:
+            m.place.record(perf_counter_ns() - t0)
+
+
+_DONE = object()
+
+
+async def amerge(streams: Mapping[Hashable, AsyncIterator]) -> AsyncIterator[Tuple[Hashable, Any]]:
+    """Arrival-order merge of async streams (async twin of merge.ArrivalMerge)."""
+    q: asyncio.Queue = asyncio.Queue()
+
+    async def pump(key, it):
+        try:
+            async for evt in it:
+                await q.put((key, evt))
+        except Exception as e:
+            await q.put((key, _StreamError(e)))  # surfaces at once, like ArrivalMerge
+        else:
+            await q.put((key, _DONE))
+
+    tasks = [asyncio.create_task(pump(k, it)) for k, it in streams.items()]
+    try:
+        live = len(tasks)
+        while live:
+            key, evt = await q.get()
+            if evt is _DONE:
+                live -= 1
+                continue
+            if evt.__class__ is _StreamError:
+                raise evt.exc
+            yield key, evt
+    finally:
+        for t in tasks:
+            t.cancel()
+
+
+# ----------------------- #
+#   SYNC -> ASYNC WRAPPERS #
+# ----------------------- #
+
+def as_async_market(market):
+    """Return market unchanged if it is already async, else wrap it."""
+    if inspect.isasyncgenfunction(getattr(market, "subscribe_quotes", None)):
+        return market
+    return AsyncMarketWrapper(market)
+
+
+def as_async_backend(backend, blocking: "bool | None" = None):
+    """Return backend unchanged if it is already async, else wrap it (blocking: see AsyncBackendWrapper)."""
+    if inspect.iscoroutinefunction(getattr(backend, "place", None)):
+        return backend
+    return AsyncBackendWrapper(backend, blocking=blocking)
+
+
+class AsyncMarketWrapper:
+    """
+    Drives a blocking IMarketData generator from a helper thread and hands
+    events to the loop. This is the backward-compat path: native async
+    adapters skip it entirely.
+    """
+    def __init__(self, market, maxsize: int = 10_000):
+        self.market = market
+        self.maxsize = maxsize
+
+    async def subscribe_quotes(self, symbol: str):
+        async for q in self._drive(self.market.subscribe_quotes(symbol)):
+            yield q
+
+    async def subscribe_trades(self, symbol: str):
+        async for t in self._drive(self.market.subscribe_trades(symbol)):
+            yield t
+
+    async def get_mark_price(self, symbol: str) -> float:
+        return await asyncio.to_thread(self.market.get_mark_price, symbol)
+
+    async def get_funding(self, symbol: str) -> float:
+        return await asyncio.to_thread(self.market.get_funding, symbol)
+
+    async def _drive(self, it):
+        loop = asyncio.get_running_loop()
+        q: asyncio.Queue = asyncio.Queue(maxsize=self.maxsize)
+
+        def pump():
+            try:
+                for evt in it:
+                    asyncio.run_coroutine_threadsafe(q.put(evt), loop).result()
+            except BaseException as e:
+                asyncio.run_coroutine_threadsafe(q.put(_StreamError(e)), loop)
+            else:
+                asyncio.run_coroutine_threadsafe(q.put(_DONE), loop)
+
+        threading.Thread(target=pump, daemon=True).start()
+        while True:
+            evt = await q.get()
+            if evt is _DONE:
+                return
+            if isinstance(evt, _StreamError):
+                raise evt.exc
+            yield evt
+
+
+class _StreamError:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class AsyncBackendWrapper:
+    """
+    Wraps a sync IExecutionBackend. Calls run inline on the loop unless the
+    backend blocks (network I/O), in which case they go to a worker thread.
+    blocking=None takes the backend's own `blocking` attribute, True when it
+    has none: paper/shadow matching and the pipelined live backends declare
+    blocking = False. snapshot() may fetch the account on its first call even
+    then, and is rare, so it always runs off the loop.
+    """
+    def __init__(self, backend, blocking: "bool | None" = None):
+        self.backend = backend
+        self.blocking = getattr(backend, "blocking", True) if blocking is None else blocking
+        if hasattr(backend, "place_many"):
+            self.place_many = self._place_many
+        if hasattr(backend, "poll_acks"):
+            # a deque drain, never I/O: called inline even for blocking backends
+            self.poll_acks = backend.poll_acks
+
+    async def _place_many(self, reqs):
+        return await self._call(self.backend.place_many, reqs)
+
+    async def _call(self, fn, *args):
+        if self.blocking:
+            return await asyncio.to_thread(fn, *args)
+        return fn(*args)
+
+    async def place(self, req):
+        return await self._call(self.backend.place, req)
+
+    async def cancel(self, client_order_id: str) -> bool:
+        return await self._call(self.backend.cancel, client_order_id)
+
+    async def on_quote(self, q):
+        return await self._call(self.backend.on_quote, q)
+
+    async def on_trade(self, t):
+        return await self._call(self.backend.on_trade, t)
+
+    async def snapshot(self):
+        return await asyncio.to_thread(self.backend.snapshot)
@@ -1,55 +1,215 @@
-from typing import Iterable
-from ..core.types import Quote, Trade
+from time import perf_counter_ns
+from typing import Iterable, Mapping
+from ..core.types import Quote, Trade, to_dict
+from ..core.batch import BATCH_TYPES
+from ..core.log import log, DEBUG, INFO
+from .merge import resolve_merge, ArrivalMerge
 
 class Engine:
-    def __init__(self, market, exec_backend, store, risk):
+    def __init__(self, market, exec_backend, store, risk, merge=None, snapshot_ms: int = 0, metrics=None):
         self.market = market
         self.exec_backend = exec_backend
         self.store = store
         self.risk = risk
+        # how quote/trade streams are combined; see engine/merge.py
+        self.merge = resolve_merge(merge)
+        # write exec_backend.snapshot() to the store every snapshot_ms of event time (0 = off)
+        self.snapshot_ms = snapshot_ms
+        self._last_snapshot_ts = None
+        # event-time clock and counters (a backtest stamps store rows with `now`)
+        self.now = 0
+        self.n_events = 0
+        self.n_fills = 0
+        self.n_blocked = 0
+        # pipelined backends (e.g. live Drift) return from place() before the exchange
+        # answers; their OrderAcks are drained after every event
+        self._poll_acks = getattr(exec_backend, "poll_acks", None)
+        # backends that can send one tick's orders together (one transaction /
+        # batched action) get them in a single place_many(reqs) call
+        self._place_many = getattr(exec_backend, "place_many", None)
+        self.n_rejected = 0
+        # per-stage latency histograms (core/metrics.EngineMetrics); None = no timing at all
+        self.metrics = metrics
+        if metrics is not None:
+            metrics.attach(self)
+            if isinstance(self.merge, ArrivalMerge):
+                self.merge.latency = metrics.recv_to_dequeue
 
-    def run(self, symbol: str, strategy=None, observe=False):
-        quotes = self.market.subscribe_quotes(symbol)
-        trades = self.market.subscribe_trades(symbol)
+    def run(self, symbols: "str | Iterable[str]", strategy=None, observe=False):
+        """
+        symbols:  one symbol or a list; every symbol shares this market, backend and store.
+        strategy: a single strategy, or a mapping symbol -> strategy instance.
+        """
+        symbols = as_symbol_list(symbols)
 
         if observe:
-            for q in quotes:
-                print(f"{q.ts} | bid {q.bid:.4f} ask {q.ask:.4f}")
+            quotes = {(s, "quote"): self.market.subscribe_quotes(s) for s in symbols}
+            for (symbol, _), evt in self.merge(quotes):
+                for q in (evt if evt.__class__ in BATCH_TYPES else (evt,)):
+                    print(f"{symbol} {q.ts} | bid {q.bid:.4f} ask {q.ask:.4f}")
             return
 
-        while True:
-            q = next(quotes)
-            print(f"[ENG] quote {symbol} {q.ts} {q.bid:.4f}/{q.ask:.4f}")
+        strategies = per_symbol(strategy, symbols)
+        self._strategies = strategies
+        streams = {}
+        for s in symbols:
+            streams[(s, "quote")] = self.market.subscribe_quotes(s)
+            streams[(s, "trade")] = self.market.subscribe_trades(s)
 
+        # each event is handled as soon as the merge policy hands it over,
+        # so a burst on one stream is never stuck behind the other
+        for (symbol, kind), evt in self.merge(streams):
+            if not evt.symbol:
+                evt.symbol = symbol
+            if evt.__class__ in BATCH_TYPES:
+                # columnar batch (core/batch.py): handled row by row
+                for row in evt:
+                    self._dispatch(symbol, kind, row, strategies[symbol])
+            else:
+                self._dispatch(symbol, kind, evt, strategies[symbol])
+
+    def _dispatch(self, symbol: str, kind: str, evt, strategy):
+        self.now = evt.ts
+        self.n_events += 1
+        if kind == "quote":
+            self.on_quote(symbol, evt, strategy)
+        else:
+            self.on_trade(symbol, evt, strategy)
+        if self._poll_acks is not None:
+            acks = self._poll_acks()
+            if acks:
+                self._on_acks(acks)
+        if self.snapshot_ms:
+            self._maybe_snapshot(evt.ts)
+
+    def on_quote(self, symbol: str, q: Quote, strategy):
+        if log.level <= DEBUG:
+            log.debug("engine.quote", symbol=symbol, ts=q.ts, bid=q.bid, ask=q.ask)
+
+        m = self.metrics
+        if m is None:
             fills = self.exec_backend.on_quote(q)
-            for f in fills:
-                print(f"[ENG] fill@quote id={f.client_id} side={f.side.value} px={f.px} sz={f.sz}")
-                self.store.write_fill(f)
-                self.risk.on_fill(f)
-
-            reqs = list(strategy.on_event(q))
-            if reqs:
-                print(f"[ENG] strategy returned {len(reqs)} orders")
-            for req in reqs:
-                print(req)
-                if self.risk.pre_place(req):
-                    print(f"[ENG] place {req.client_id} {req.side.value} {req.type.value} sz={req.sz} px={req.px}")
-                    self.exec_backend.place(req)
-                else:
-                    print(f"[ENG] blocked by risk: {req}")
-
-            t = next(trades)
-            # (optional) same style logging here
+        else:
+            t0 = perf_counter_ns()
+            fills = self.exec_backend.on_quote(q)
+            m.match_quote.record(perf_counter_ns() - t0)
+        if fills:
+            self._book_fills(fills, "quote")
+
+        self._run_strategy(q, strategy)
+
+    def on_trade(self, symbol: str, t: Trade, strategy):
+        m = self.metrics
+        if m is None:
+            fills = self.exec_backend.on_trade(t)
+        else:
+            t0 = perf_counter_ns()
             fills = self.exec_backend.on_trade(t)
-            for f in fills:
-                print(f"[ENG] fill@trade id={f.client_id} side={f.side.value} px={f.px} sz={f.sz}")
+            m.match_trade.record(perf_counter_ns() - t0)
+        if fills:
+            self._book_fills(fills, "trade")
+
+        self._run_strategy(t, strategy)
+
+    def _book_fills(self, fills, on: str):
+        m = self.metrics
+        for f in fills:
+            if log.level <= INFO:
+                log.info("engine.fill", on=on, id=f.client_id, side=f.side, px=f.px, sz=f.sz)
+            if m is None:
+                self.store.write_fill(f)
+            else:
+                t0 = perf_counter_ns()
                 self.store.write_fill(f)
-                self.risk.on_fill(f)
-
-            reqs = list(strategy.on_event(t))
-            for req in reqs:
-                if self.risk.pre_place(req):
-                    print(f"[ENG] place {req.client_id} {req.side.value} {req.type.value} sz={req.sz} px={req.px}")
-                    self.exec_backend.place(req)
-                else:
-                    print(f"[ENG] blocked by risk: {req}")
\ No newline at end of file
+                m.store.record(perf_counter_ns() - t0)
+            self.risk.on_fill(f)
+            self.n_fills += 1
+
+    def _maybe_snapshot(self, ts: int):
+        if self._last_snapshot_ts is None:
+            self._last_snapshot_ts = ts
+        elif ts - self._last_snapshot_ts >= self.snapshot_ms:
+            self._last_snapshot_ts = ts
+            self.store.write_snapshot(self.exec_backend.snapshot())
+
+    def _on_acks(self, acks):
+        """Record each OrderAck and hand it to its symbol's strategy (optional on_ack, may return orders)."""
+        for ack in acks:
+            if not ack.ok:
+                self.n_rejected += 1
+                log.warn("engine.ack", id=ack.client_id, op=ack.op, ok=False, error=ack.error)
+            elif log.level <= INFO:
+                log.info("engine.ack", id=ack.client_id, op=ack.op, ok=True, ref=ack.ref)
+            if self.store is not None:
+                self.store.write_event("order_ack", to_dict(ack))
+            strategy = self._strategies.get(ack.symbol)
+            on_ack = getattr(strategy, "on_ack", None)
+            if on_ack is not None:
+                self._submit(on_ack(ack))
+
+    def _run_strategy(self, evt, strategy):
+        m = self.metrics
+        if m is None:
+            reqs = strategy.on_event(evt)
+        else:
+            t0 = perf_counter_ns()
+            reqs = strategy.on_event(evt)
+            m.strategy.record(perf_counter_ns() - t0)
+        self._submit(reqs)
+
+    def _submit(self, reqs):
+        """Risk-check and place a strategy's orders; meta["replaces"] = client id to cancel in the same step."""
+        if not reqs:
+            return
+        m = self.metrics
+        reqs = list(reqs)
+        if log.level <= DEBUG:
+            log.debug("engine.strategy", orders=len(reqs))
+        accepted = []
+        for req in reqs:
+            if m is None:
+                ok = self.risk.pre_place(req)
+            else:
+                t0 = perf_counter_ns()
+                ok = self.risk.pre_place(req)
+                m.risk.record(perf_counter_ns() - t0)
+            if not ok:
+                self.n_blocked += 1
+                log.warn("engine.risk", blocked=req.client_id, symbol=req.symbol, side=req.side, sz=req.sz, px=req.px)
+                continue
+            if log.level <= INFO:
+                log.info("engine.place", id=req.client_id, side=req.side, type=req.type, sz=req.sz, px=req.px)
+            accepted.append(req)
+        if not accepted:
+            return
+        t0 = perf_counter_ns() if m is not None else 0
+        if self._place_many is not None:
+            self._place_many(accepted)
+        else:
+            backend = self.exec_backend
+            for req in accepted:
+                replaces = req.meta.get("replaces") if req.meta else None
+                if replaces:
+                    backend.cancel(replaces)
+                backend.place(req)
+        if m is not None:
+            m.place.record(perf_counter_ns() - t0)
+
+
+def as_symbol_list(symbols: "str | Iterable[str]") -> list[str]:
+    out = [symbols] if isinstance(symbols, str) else list(symbols)
+    if not out:
+        raise ValueError("Engine.run needs at least one symbol")
+    return out
+
+
+def per_symbol(strategy, symbols: list[str]) -> dict:
+    """Route table symbol -> strategy. A bare strategy is only allowed for one symbol."""
+    if isinstance(strategy, Mapping):
+        missing = [s for s in symbols if s not in strategy]
+        if missing:
+            raise ValueError(f"no strategy for symbols: {missing}")
+        return dict(strategy)
+    if len(symbols) > 1:
+        raise ValueError("multi-symbol runs need a strategy per symbol (mapping symbol -> strategy)")
+    return {symbols[0]: strategy}
@@ -0,0 +1,98 @@
+# spltrader/engine/merge.py
+import heapq, queue, threading
+from time import perf_counter_ns
+from typing import Any, Callable, Hashable, Iterable, Iterator, Mapping, Tuple
+
+# Merge policies combine several market data streams (quotes, trades, ...) into
+# one sequence of (key, event) pairs for Engine.run.
+#
+# A policy is any callable: policy(streams: Mapping[key, Iterable]) -> Iterator[(key, event)]
+#
+# - ArrivalMerge:   live feeds. Each stream is pumped by its own thread, so a quiet
+#                   stream never holds back a busy one (no head-of-line blocking).
+# - TimestampMerge: recorded / finite feeds. Strict k-way merge on event.ts.
+
+MergePolicy = Callable[[Mapping[Hashable, Iterable]], Iterator[Tuple[Hashable, Any]]]
+
+_DONE = object()
+
+
+class _StreamError:
+    __slots__ = ("exc",)
+
+    def __init__(self, exc: BaseException):
+        self.exc = exc
+
+
+class ArrivalMerge:
+    """
+    Handles each event the moment it arrives, whichever stream it came from.
+    Stream exceptions are re-raised in the consumer thread. Pumps stamp each
+    event as they receive it; set `latency` (a metrics Histogram) to record
+    receive -> dequeue time in ns.
+    """
+    def __init__(self, maxsize: int = 100_000, latency=None):
+        self.maxsize = maxsize
+        self.latency = latency
+
+    def __call__(self, streams: Mapping[Hashable, Iterable]) -> Iterator[Tuple[Hashable, Any]]:
+        q: queue.Queue = queue.Queue(maxsize=self.maxsize)
+
+        def pump(key, it):
+            try:
+                for evt in it:
+                    q.put((key, evt, perf_counter_ns()))
+            except BaseException as e:
+                q.put((key, _StreamError(e), 0))
+            finally:
+                q.put((key, _DONE, 0))
+
+        for key, it in streams.items():
+            threading.Thread(target=pump, args=(key, it), name=f"merge-{key}", daemon=True).start()
+
+        live = len(streams)
+        hist = self.latency
+        while live:
+            key, evt, t_recv = q.get()
+            if hist is not None and t_recv:
+                hist.record(perf_counter_ns() - t_recv)
+            if evt is _DONE:
+                live -= 1
+                continue
+            if isinstance(evt, _StreamError):
+                raise evt.exc
+            yield key, evt
+
+
+class TimestampMerge:
+    """
+    Yields events in non-decreasing ts order across all streams.
+    Needs the head of every stream before emitting, so use it for recorded
+    or simulated feeds, not for live sockets.
+    """
+    def __call__(self, streams: Mapping[Hashable, Iterable]) -> Iterator[Tuple[Hashable, Any]]:
+        # heapq.merge is stable: equal timestamps come out in stream order
+        tagged = [_tag(key, it) for key, it in streams.items()]
+        yield from heapq.merge(*tagged, key=lambda kv: kv[1].ts)
+
+
+def _tag(key, it):
+    for evt in it:
+        yield key, evt
+
+
+MERGE_POLICIES = {
+    "arrival": ArrivalMerge,
+    "timestamp": TimestampMerge,
+}
+
+
+def resolve_merge(policy: "str | MergePolicy | None" = None) -> MergePolicy:
+    """Accepts a policy name from MERGE_POLICIES, a policy callable, or None (arrival)."""
+    if policy is None:
+        return ArrivalMerge()
+    if isinstance(policy, str):
+        if policy not in MERGE_POLICIES:
+            raise ValueError(f"unknown merge policy: {policy} (choose from {sorted(MERGE_POLICIES)})")
+        return MERGE_POLICIES[policy]()
+    return policy
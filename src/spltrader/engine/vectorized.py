@@ -0,0 +1,172 @@
+# src/spltrader/engine/vectorized.py
+from dataclasses import dataclass
+from ..core.types import Fill, Side
+
+try:
+    import numpy as np
+except ImportError:  # optional: pip install "spl-trader[vector]"
+    np = None
+
+# Array-native backtest path for parameter research. One symbol's events are
+# loaded as NumPy arrays (see TapeMarket.as_numpy), the strategy turns the
+# whole price series into order signals at once, and fills are found with
+# searchsorted instead of replaying events one by one.
+#
+# Same results as Engine + PaperBackend/ShadowBackend on the same tape:
+#   - events in TimestampMerge order (ts, quotes before trades on ties)
+#   - an order placed at event i can only fill at an event j > i
+#   - paper: MARKET fills at the next quote (paper_px_for_market), LIMIT at the
+#     next quote it is marketable against, at min(px, ask) / max(px, bid)
+#   - shadow: MARKET fills at the next trade, LIMIT at the next trade that
+#     crosses it (trade_crosses_limit), both at the trade price
+#   - fills of one event in OrderBook order: MARKET, then BUY limits by price
+#     priority (PriceHeap), then SELL limits, placement order within a price
+#
+# Array strategies implement
+#   signals(price) -> (sign, px, sz)    sign +1 buy / -1 sell / 0 none per event,
+#                                        px NaN for MARKET, else LIMIT; sz array or scalar
+#   client_id(side, ts, seq) -> str     seq counts the strategy's orders from 1
+
+
+@dataclass
+class EventArrays:
+    """One symbol's events in engine order. price is the trade price or the quote mid."""
+    ts: "np.ndarray"
+    is_trade: "np.ndarray"
+    price: "np.ndarray"
+    bid: "np.ndarray"
+    ask: "np.ndarray"
+
+    @classmethod
+    def from_tape(cls, arr) -> "EventArrays":
+        """From a structured tape array (TAPE_DTYPE_FIELDS), records in arrival order."""
+        _need_numpy()
+        from ..storage.tape import KIND_TRADE
+        arr = arr[np.lexsort((arr["kind"], arr["ts"]))]  # stable: heapq.merge order
+        is_trade = arr["kind"] == KIND_TRADE
+        bid, ask = arr["f0"], arr["f1"]
+        price = np.where(is_trade, bid, (bid + ask) / 2.0)
+        return cls(ts=arr["ts"], is_trade=is_trade, price=price, bid=bid, ask=ask)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+@dataclass
+class VectorFills:
+    """Fills of one symbol, ordered like the event path emits them."""
+    symbol: str
+    ts: "np.ndarray"
+    sign: "np.ndarray"
+    px: "np.ndarray"
+    sz: "np.ndarray"
+    fee: "np.ndarray"
+    order_ts: "np.ndarray"   # event time each filled order was placed at
+    seq: "np.ndarray"        # strategy order counter of each filled order
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def to_fills(self, strategy) -> list[Fill]:
+        return [
+            Fill(ts=int(ts), client_id=strategy.client_id(side, int(ots), int(seq)), symbol=self.symbol,
+                 side=side, px=float(px), sz=float(sz), fee=float(fee))
+            for ts, side, px, sz, fee, ots, seq in zip(
+                self.ts, map(_side, self.sign), self.px, self.sz, self.fee, self.order_ts, self.seq)
+        ]
+
+    def position(self) -> dict:
+        """Same shape as ShadowBackend.positions[symbol]."""
+        base = self.sign * self.sz
+        return {"base": float(base.sum()), "pnl_real": float(-(base * self.px).sum())}
+
+
+def paper_px_for_market_arr(sign, bid, ask, slippage_bps: float):
+    """Array form of fill_paper.paper_px_for_market; sign is +1 buy / -1 sell."""
+    ref = np.where(sign > 0, ask, bid)
+    return ref * (1 + (slippage_bps / 1e4) * sign)
+
+
+def trade_crosses_limit_arr(sign: int, limit_px: float, trade_px):
+    """Array form of fill_shadow.trade_crosses_limit for one side and limit price."""
+    return trade_px <= limit_px if sign > 0 else trade_px >= limit_px
+
+
+def quote_crosses_limit_arr(sign: int, limit_px: float, bid, ask):
+    """Quotes a resting paper LIMIT is marketable against (PaperBackend.on_quote)."""
+    return ask <= limit_px if sign > 0 else bid >= limit_px
+
+
+def run_vectorized(ev: EventArrays, strategy, mode: str, symbol: str = "",
+                   fee_bps: float = 0.0, slippage_bps: float = 0.0) -> VectorFills:
+    """
+    Fills for `strategy` over one symbol's events. mode is "paper" or "shadow";
+    fee_bps/slippage_bps as configured on the matching backend.
+    """
+    _need_numpy()
+    sign, px, sz = strategy.signals(ev.price)
+    order_idx = np.flatnonzero(sign)
+    seq = np.arange(1, len(order_idx) + 1)
+    o_sign = sign[order_idx].astype(np.int64)
+    o_px = np.asarray(px, dtype=np.float64)[order_idx]
+    o_sz = np.broadcast_to(np.asarray(sz, dtype=np.float64), sign.shape)[order_idx]
+    market = np.isnan(o_px)
+
+    if mode == "paper":
+        quotes = np.flatnonzero(~ev.is_trade)
+        candidates = quotes
+        crosses = lambda s, lpx: quotes[quote_crosses_limit_arr(s, lpx, ev.bid[quotes], ev.ask[quotes])]
+    elif mode == "shadow":
+        trades = np.flatnonzero(ev.is_trade)
+        candidates = trades
+        crosses = lambda s, lpx: trades[trade_crosses_limit_arr(s, lpx, ev.price[trades])]
+    else:
+        raise ValueError(f"vectorized backtest supports paper and shadow, not {mode!r}")
+
+    fill_idx = np.full(len(order_idx), -1, dtype=np.int64)
+    fill_idx[market] = _first_after(order_idx[market], candidates)
+    # one crossing series per distinct (side, limit price)
+    limit = ~market
+    keys = np.unique(np.stack([o_sign[limit], o_px[limit]]), axis=1) if limit.any() else np.empty((2, 0))
+    for s, lpx in keys.T:
+        grp = limit & (o_sign == s) & (o_px == lpx)
+        fill_idx[grp] = _first_after(order_idx[grp], crosses(s, lpx))
+
+    hit = np.flatnonzero(fill_idx >= 0)
+    # within one fill event the backends emit MARKET orders, then BUY limits
+    # best (highest) first, then SELL limits best (lowest) first, ties by placement
+    h_sign, h_px = o_sign[hit], o_px[hit]
+    h_limit = ~np.isnan(h_px)
+    cls = np.where(h_limit, np.where(h_sign > 0, 1, 2), 0)
+    prio = np.where(h_limit, -h_sign * h_px, 0.0)
+    hit = hit[np.lexsort((hit, prio, cls, fill_idx[hit]))]
+    j = fill_idx[hit]
+    f_sign, f_sz = o_sign[hit], o_sz[hit]
+    if mode == "paper":
+        bid, ask, lpx = ev.bid[j], ev.ask[j], o_px[hit]
+        f_px = np.where(np.isnan(lpx), paper_px_for_market_arr(f_sign, bid, ask, slippage_bps),
+                        np.where(f_sign > 0, np.minimum(lpx, ask), np.maximum(lpx, bid)))
+        fee = np.abs(f_px * f_sz) * (fee_bps / 1e4)          # core.utils.fee_from_bps
+    else:
+        f_px = ev.price[j]
+        fee = np.abs(f_sz) * f_px * (fee_bps / 10_000.0)     # ShadowBackend
+    return VectorFills(symbol=symbol, ts=ev.ts[j], sign=f_sign, px=f_px, sz=f_sz, fee=fee,
+                       order_ts=ev.ts[order_idx[hit]], seq=seq[hit])
+
+
+def _first_after(order_idx, candidates):
+    """For each order placed at event order_idx, the first candidate event strictly after it (-1 if none)."""
+    pos = np.searchsorted(candidates, order_idx, side="right")
+    out = np.full(len(order_idx), -1, dtype=np.int64)
+    ok = pos < len(candidates)
+    out[ok] = candidates[pos[ok]]
+    return out
+
+
+def _side(sign) -> Side:
+    return Side.BUY if sign > 0 else Side.SELL
+
+
+def _need_numpy():
+    if np is None:
+        raise ImportError("the vectorized backtest needs numpy: pip install 'spl-trader[vector]'")
@@ -1,44 +1,82 @@
+from dataclasses import replace
 from typing import Iterable, Dict
-from ..core.types import OrderReq, Quote, Fill, AccountSnapshot
+from ..core.types import OrderReq, Quote, Fill, AccountSnapshot, to_dict
 from ..core.types import Side, OrdType
 from ..core.utils import fee_from_bps
 from ..engine.fill_paper import paper_px_for_market
+from .order_book import OrderBook
 import time
 
 class PaperBackend:
+    """
+    Fills every order type against quotes (same symbol only), checking only the
+    best-priced candidates of each symbol's OrderBook:
+
+    - MARKET: next quote, ask/bid plus slippage
+    - LIMIT: once marketable (BUY ask <= px, SELL bid >= px) at min(px, ask) / max(px, bid)
+    - STOP: triggers when BUY ask >= stop / SELL bid <= stop, then fills like MARKET on that quote
+    - STOP_LIMIT: triggers the same way, then rests as a LIMIT at px (may fill on that quote)
+
+    Stop triggers come from meta["stop_px"] (plain STOP may use px instead).
+    """
+    blocking = False  # in-memory matching: AsyncEngine calls it inline on the loop
+
     def __init__(self, store, fee_bps: float = 1.0, slippage_bps: float = 1.5):
         self.store = store
         self.fee_bps = fee_bps
         self.slippage_bps = slippage_bps
-        self._orders: Dict[str, OrderReq] = {}
+        self._orders: Dict[str, OrderBook] = {}   # symbol -> resting orders
+        self._order_symbol: Dict[str, str] = {}   # client_id -> symbol
         self._fills: list[Fill] = []
+        self._last_ts = 0  # latest quote time; snapshots are stamped with it
 
     def place(self, req: OrderReq) -> str:
-        self._orders[req.client_id] = req
-        self.store.write_event("place", req.__dict__)
+        book = self._orders.get(req.symbol)
+        if book is None:
+            book = self._orders[req.symbol] = OrderBook()
+        book.add(req)
+        self._order_symbol[req.client_id] = req.symbol
+        self.store.write_event("place", to_dict(req))
         return req.client_id
 
     def cancel(self, client_order_id: str) -> bool:
-        ok = self._orders.pop(client_order_id, None) is not None
+        sym = self._order_symbol.pop(client_order_id, None)
+        ok = sym is not None and self._orders[sym].remove(client_order_id) is not None
         if ok: self.store.write_event("cancel", {"client_id": client_order_id})
         return ok
 
     def on_quote(self, q: Quote) -> Iterable[Fill]:
-        # market orders fill immediately against quote
+        self._last_ts = q.ts
+        book = self._orders.get(q.symbol)
+        if not book:
+            return []
         fills = []
-        for cid, o in list(self._orders.items()):
-            if o.type == OrdType.MARKET:
-                px = paper_px_for_market(o.side, q, self.slippage_bps)
-                fee = fee_from_bps(px * o.sz, self.fee_bps)
-                f = Fill(ts=q.ts, client_id=cid, symbol=o.symbol, side=o.side, px=px, sz=o.sz, fee=fee)
-                fills.append(f)
-                self._fills.append(f)
-                self._orders.pop(cid, None)
+        for o in book.take_market() if book.market else ():
+            fills.append(self._fill(o, paper_px_for_market(o.side, q, self.slippage_bps), q))
+        for o in book.take_triggered(q.ask, q.bid):
+            if o.type == OrdType.STOP:
+                fills.append(self._fill(o, paper_px_for_market(o.side, q, self.slippage_bps), q))
+            elif o.px is not None:
+                book.add(replace(o, type=OrdType.LIMIT))  # checked against this quote just below
+            else:
+                self._order_symbol.pop(o.client_id, None)  # STOP_LIMIT without a limit: nothing to rest
+        for o in book.take_bids(q.ask):
+            fills.append(self._fill(o, min(o.px, q.ask), q))
+        for o in book.take_asks(q.bid):
+            fills.append(self._fill(o, max(o.px, q.bid), q))
         return fills
 
     def on_trade(self, t) -> Iterable[Fill]:
         # paper backend ignores trades for filling
+        self._last_ts = t.ts
         return []
 
     def snapshot(self) -> AccountSnapshot:
-        return AccountSnapshot(ts=int(time.time()*1000), balance=0.0, positions={})
+        return AccountSnapshot(ts=self._last_ts or int(time.time()*1000), balance=0.0, positions={})
+
+    def _fill(self, o: OrderReq, px: float, q: Quote) -> Fill:
+        fee = fee_from_bps(px * o.sz, self.fee_bps)
+        f = Fill(ts=q.ts, client_id=o.client_id, symbol=o.symbol, side=o.side, px=px, sz=o.sz, fee=fee)
+        self._fills.append(f)
+        self._order_symbol.pop(o.client_id, None)
+        return f
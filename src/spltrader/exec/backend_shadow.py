@@ -2,57 +2,61 @@
 import time
 from typing import Iterable, Dict
 from ..core.interfaces import IExecutionBackend
-from ..core.types import Quote, Trade, OrderReq, Fill, AccountSnapshot, Side, OrdType
+from ..core.types import Quote, Trade, OrderReq, Fill, AccountSnapshot, Side
+from .order_book import OrderBook
 
 class ShadowBackend(IExecutionBackend):
+    blocking = False  # in-memory matching: AsyncEngine calls it inline on the loop
+
     def __init__(self, fee_bps: float = 0.0):
+        self.fee_bps = fee_bps
         self.fee = fee_bps / 10_000.0
-        self.resting: Dict[str, OrderReq] = {}   # orders we “would” have sent
+        self.resting: Dict[str, OrderBook] = {}   # symbol -> orders we “would” have sent
+        self._resting_symbol: Dict[str, str] = {}  # client_id -> symbol
         self.positions: Dict[str, Dict[str, float]] = {}
         self.cash = 0.0
+        self._last_ts = 0  # latest trade time; snapshots are stamped with it
 
     def place(self, req: OrderReq) -> str:
         # store intent; do not send
-        self.resting[req.client_id] = req
+        book = self.resting.get(req.symbol)
+        if book is None:
+            book = self.resting[req.symbol] = OrderBook()
+        book.add(req)
+        self._resting_symbol[req.client_id] = req.symbol
         return req.client_id
 
     def cancel(self, client_order_id: str) -> bool:
-        return self.resting.pop(client_order_id, None) is not None
+        sym = self._resting_symbol.pop(client_order_id, None)
+        return sym is not None and self.resting[sym].remove(client_order_id) is not None
 
     def on_quote(self, q: Quote) -> Iterable[Fill]:
         # shadow doesn’t fill from quotes
         return []
 
     def on_trade(self, t: Trade) -> Iterable[Fill]:
-        fills = []
-        for cid, req in list(self.resting.items()):
-            if req.symbol != req.symbol:
-                continue
-            # MARKET orders: treat first trade after placement as fill
-            if req.type == OrdType.MARKET:
-                px = t.price
-                fee = abs(req.sz) * px * self.fee
-                base = req.sz if req.side == Side.BUY else -req.sz
-                pos = self.positions.setdefault(req.symbol, {"base": 0.0, "pnl_real": 0.0})
-                pos["pnl_real"] -= base * px
-                pos["base"] += base
-                self.cash -= fee
-                fills.append(Fill(ts=t.ts, client_id=cid, symbol=req.symbol, side=req.side, px=px, sz=req.sz, fee=fee))
-                self.resting.pop(cid)
-            # LIMIT: fill if trade price crosses our limit in the right direction
-            elif req.type == OrdType.LIMIT and req.px is not None:
-                if (req.side == Side.BUY and t.price <= req.px) or (req.side == Side.SELL and t.price >= req.px):
-                    px = t.price
-                    fee = abs(req.sz) * px * self.fee
-                    base = req.sz if req.side == Side.BUY else -req.sz
-                    pos = self.positions.setdefault(req.symbol, {"base": 0.0, "pnl_real": 0.0})
-                    pos["pnl_real"] -= base * px
-                    pos["base"] += base
-                    self.cash -= fee
-                    fills.append(Fill(ts=t.ts, client_id=cid, symbol=req.symbol, side=req.side, px=px, sz=req.sz, fee=fee))
-                    self.resting.pop(cid)
-        return fills
+        # only orders on the traded symbol, and only those the print reaches:
+        # MARKET orders take the first trade after placement, LIMITs fill when
+        # the trade price crosses them; both at the trade price
+        self._last_ts = t.ts
+        book = self.resting.get(t.symbol)
+        if not book:
+            return []
+        reqs = book.take_market() if book.market else []
+        reqs += book.take_crossed(t.price)
+        return [self._fill(req, t) for req in reqs]
+
+    def _fill(self, req: OrderReq, t: Trade) -> Fill:
+        px = t.price
+        fee = abs(req.sz) * px * self.fee
+        base = req.sz if req.side == Side.BUY else -req.sz
+        pos = self.positions.setdefault(req.symbol, {"base": 0.0, "pnl_real": 0.0})
+        pos["pnl_real"] -= base * px
+        pos["base"] += base
+        self.cash -= fee
+        self._resting_symbol.pop(req.client_id, None)
+        return Fill(ts=t.ts, client_id=req.client_id, symbol=req.symbol, side=req.side, px=px, sz=req.sz, fee=fee)
 
     def snapshot(self) -> AccountSnapshot:
-        ts = int(time.time()*1000)
+        ts = self._last_ts or int(time.time()*1000)
         return AccountSnapshot(ts=ts, balance=self.cash, positions=self.positions)
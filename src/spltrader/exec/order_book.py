@@ -0,0 +1,147 @@
+# src/spltrader/exec/order_book.py
+import heapq, itertools
+from collections import deque
+from typing import Dict, Iterator, List
+from ..core.types import OrderReq, Side, OrdType
+
+# Resting orders of one symbol, indexed so an incoming price only touches the
+# orders it actually crosses:
+#
+#   market      FIFO of MARKET orders (all of them go on the next print)
+#   bids        max-heap of BUY limits  -> pop while limit >= price
+#   asks        min-heap of SELL limits -> pop while limit <= price
+#   buy_stops   min-heap of BUY stop triggers  -> pop while trigger <= price
+#   sell_stops  max-heap of SELL stop triggers -> pop while trigger >= price
+#
+# STOP orders trigger at meta["stop_px"] (or px); STOP_LIMIT orders trigger at
+# meta["stop_px"] and then rest as a LIMIT at px.
+#
+# Cancels are lazy: the order leaves `orders` at once and its heap entry is
+# dropped when it surfaces (or when the heap is compacted). An entry is live
+# only while `orders` still maps its client id to the very OrderReq it was
+# pushed for, so re-using a client id (cancel and re-place, or placing it
+# again without a cancel, which replaces the old order) never lets the old
+# entry fill the new order.
+
+
+class PriceHeap:
+    """
+    Orders keyed by price, best first for `side` (highest BUY, lowest SELL),
+    arrival order within a price.
+    """
+    def __init__(self, side: Side):
+        self._sign = -1.0 if side == Side.BUY else 1.0
+        self._heap: list[tuple[float, int, float, str, OrderReq]] = []  # (sign*px, seq, px, client_id, req)
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def push(self, px: float, req: OrderReq) -> None:
+        heapq.heappush(self._heap, (self._sign * px, next(self._seq), px, req.client_id, req))
+
+    def pop_crossed(self, price: float, live) -> List[OrderReq]:
+        """
+        Pop every live order whose price is reached by `price` (BUY: px >= price,
+        SELL: px <= price), best first. Entries whose order is no longer
+        live[client_id] are discarded.
+        """
+        out, h = [], self._heap
+        bound = self._sign * price
+        while h:
+            key, _, _, cid, req = h[0]
+            if live.get(cid) is not req:
+                heapq.heappop(h)
+            elif key <= bound:
+                heapq.heappop(h)
+                out.append(req)
+            else:
+                break
+        return out
+
+    def compact(self, live) -> None:
+        self._heap = [e for e in self._heap if live.get(e[3]) is e[4]]
+        heapq.heapify(self._heap)
+
+
+class OrderBook:
+    """One symbol's resting orders; iterates client ids like the dict it replaces."""
+    def __init__(self):
+        self.orders: Dict[str, OrderReq] = {}
+        self.market: deque[OrderReq] = deque()
+        self.bids = PriceHeap(Side.BUY)
+        self.asks = PriceHeap(Side.SELL)
+        # a buy stop fires when price rises to it: lowest trigger first
+        self.buy_stops = PriceHeap(Side.SELL)
+        self.sell_stops = PriceHeap(Side.BUY)
+
+    def __len__(self) -> int:
+        return len(self.orders)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.orders)
+
+    def __contains__(self, client_id: str) -> bool:
+        return client_id in self.orders
+
+    def add(self, req: OrderReq) -> None:
+        self.orders[req.client_id] = req
+        if req.type == OrdType.MARKET:
+            self.market.append(req)
+        elif req.type == OrdType.LIMIT and req.px is not None:
+            (self.bids if req.side == Side.BUY else self.asks).push(req.px, req)
+        elif req.type in (OrdType.STOP, OrdType.STOP_LIMIT):
+            trigger = stop_price(req)
+            if trigger is not None:
+                (self.buy_stops if req.side == Side.BUY else self.sell_stops).push(trigger, req)
+
+    def remove(self, client_id: str) -> "OrderReq | None":
+        req = self.orders.pop(client_id, None)
+        if req is not None:
+            # stale heap entries are skipped lazily; rebuild once they dominate
+            for heap in (self.bids, self.asks, self.buy_stops, self.sell_stops):
+                if len(heap) > 64 and len(heap) > 2 * len(self.orders):
+                    heap.compact(self.orders)
+        return req
+
+    def take_market(self) -> List[OrderReq]:
+        """Every live MARKET order, oldest first, removed from the book."""
+        out, orders = [], self.orders
+        while self.market:
+            req = self.market.popleft()
+            if orders.get(req.client_id) is req:
+                del orders[req.client_id]
+                out.append(req)
+        return out
+
+    def take_crossed(self, price: float) -> List[OrderReq]:
+        """LIMIT orders a print at `price` reaches (bids first), removed from the book."""
+        return self.take_bids(price) + self.take_asks(price)
+
+    def take_bids(self, price: float) -> List[OrderReq]:
+        """BUY limits at or above `price` (e.g. the ask), best first, removed from the book."""
+        return self._take(self.bids.pop_crossed(price, self.orders))
+
+    def take_asks(self, price: float) -> List[OrderReq]:
+        """SELL limits at or below `price` (e.g. the bid), best first, removed from the book."""
+        return self._take(self.asks.pop_crossed(price, self.orders))
+
+    def take_triggered(self, buy_price: float, sell_price: float) -> List[OrderReq]:
+        """
+        STOP / STOP_LIMIT orders whose trigger is reached: BUY stops at or below
+        `buy_price`, SELL stops at or above `sell_price`. Removed from the book.
+        """
+        return self._take(self.buy_stops.pop_crossed(buy_price, self.orders)
+                          + self.sell_stops.pop_crossed(sell_price, self.orders))
+
+    def _take(self, reqs: List[OrderReq]) -> List[OrderReq]:
+        for req in reqs:
+            del self.orders[req.client_id]
+        return reqs
+
+
+def stop_price(req: OrderReq) -> "float | None":
+    """Trigger of a STOP / STOP_LIMIT order: meta["stop_px"], else px for plain STOP."""
+    if req.meta and req.meta.get("stop_px") is not None:
+        return float(req.meta["stop_px"])
+    return req.px if req.type == OrdType.STOP else None
@@ -1,34 +1,129 @@
 import time, math, random
-from typing import Iterable
+from typing import Iterable, Iterator
 from ..core.types import Quote, Trade, Side
 
+# Synthetic feed for booting the engine end to end and for load testing.
+#
+# Every symbol has its own event schedule derived from (seed, symbol): arrival
+# times, quote/trade kind and a mean-reverting price path around `price`.
+# subscribe_quotes and subscribe_trades each replay that schedule from the
+# start and keep only their own kind, so the two streams agree on the price
+# path without sharing mutable state, and two runs with the same seed emit the
+# same events. Timestamps are simulated (start_ms + arrival time); `speed`
+# only decides how fast they are handed out in wall time.
+#
+# [mock] keys:
+#   seed = 0
+#   rate = 13.5          simulated events/sec per symbol (quotes + trades)
+#   trade_ratio = 0.9    share of events that are trades
+#   profile = "poisson"  "steady" (fixed spacing) | "poisson" | "burst"
+#   burst_factor = 10    burst: rate multiplier while bursting ...
+#   burst_ms = 200       ... mean burst length
+#   quiet_ms = 2000      ... mean time between bursts
+#   speed = 1.0          wall pacing: 1 real time, 10 = ten times faster, 0 = as fast as possible
+#   events = 0           stop each symbol after this many events (0 = endless)
+#   start_ms             timestamp of t=0 (default: wall clock at start-up)
+#   price = 100.0        start/mean price; [mock.prices] overrides per symbol
+#   spread_bps = 2.0
+#   vol_bps = 1.0        per-event noise
+#   quote_sz = 5.0
+#   trade_sz = 0.5
+
+
 class MockMarket:
     """
     Emits a synthetic mean-reverting price around 100 with small noise.
-    Useful for booting the engine end-to-end without external deps.
+    Useful for booting the engine end-to-end without external deps, and
+    (seeded, unpaced) as a deterministic load generator.
     """
     def __init__(self, cfg):
         self.cfg = cfg
-        self._p = 100.0
+        mc = cfg.get("mock", {})
+        self.seed = mc.get("seed", 0)
+        self.rate = float(mc.get("rate", 13.5))
+        self.trade_ratio = float(mc.get("trade_ratio", 0.9))
+        self.profile = mc.get("profile", "poisson")
+        self.burst_factor = float(mc.get("burst_factor", 10.0))
+        self.burst_ms = float(mc.get("burst_ms", 200.0))
+        self.quiet_ms = float(mc.get("quiet_ms", 2000.0))
+        self.speed = float(mc.get("speed", 1.0))
+        self.events = int(mc.get("events", 0))
+        self.start_ms = int(mc.get("start_ms", time.time() * 1000))
+        self.price = float(mc.get("price", 100.0))
+        self.prices = dict(mc.get("prices", {}))
+        self.spread_bps = float(mc.get("spread_bps", 2.0))
+        self.vol_bps = float(mc.get("vol_bps", 1.0))
+        self.quote_sz = float(mc.get("quote_sz", 5.0))
+        self.trade_sz = float(mc.get("trade_sz", 0.5))
+        if self.rate <= 0:
+            raise ValueError("[mock].rate must be > 0")
+        if self.profile not in ("steady", "poisson", "burst"):
+            raise ValueError(f"[mock].profile must be steady, poisson or burst, not {self.profile!r}")
+        self._wall0 = time.monotonic()
+        self._mark: dict[str, float] = {}  # last quote mid per symbol (read by get_mark_price only)
 
     def subscribe_quotes(self, symbol: str) -> Iterable[Quote]:
-        while True:
-            # small random walk around mid; generate tight spread
-            self._p += math.sin(time.time()/3.0)*0.005 + random.uniform(-0.01, 0.01)
-            bid = round(self._p - 0.01, 4)
-            ask = round(self._p + 0.01, 4)
-            yield Quote(ts=int(time.time()*1000), bid=bid, ask=ask, bid_sz=5.0, ask_sz=5.0)
-            time.sleep(1)
+        half, sz = self._half_spread(symbol), self.quote_sz
+        for ts, is_trade, p, _ in self._schedule(symbol):
+            if is_trade:
+                continue
+            self._pace(ts)
+            self._mark[symbol] = p
+            yield Quote(ts=ts, bid=round(p - half, 4), ask=round(p + half, 4), bid_sz=sz, ask_sz=sz, symbol=symbol)
 
     def subscribe_trades(self, symbol: str) -> Iterable[Trade]:
-        while True:
-            px = round(self._p + random.uniform(-0.02, 0.02), 4)
-            side = Side.BUY if random.random() > 0.5 else Side.SELL
-            yield Trade(ts=int(time.time()*1000), price=px, size=0.5, side=side)
-            time.sleep(0.08)
+        sz = self.trade_sz
+        for ts, is_trade, p, buy in self._schedule(symbol):
+            if not is_trade:
+                continue
+            self._pace(ts)
+            yield Trade(ts=ts, price=round(p, 4), size=sz, side=Side.BUY if buy else Side.SELL, symbol=symbol)
 
     def get_mark_price(self, symbol: str) -> float:
-        return self._p
+        return self._mark.get(symbol, self._mean(symbol))
 
     def get_funding(self, symbol: str) -> float:
         return 0.0
+
+    def _schedule(self, symbol: str) -> Iterator[tuple]:
+        """(ts, is_trade, price, buy) for every event of `symbol`; same sequence on every call."""
+        rnd = random.Random(f"{self.seed}:{symbol}")
+        mean = self._mean(symbol)
+        p, t_ms = mean, 0.0
+        gap_ms = 1000.0 / self.rate
+        profile, trade_ratio, half = self.profile, self.trade_ratio, self._half_spread(symbol)
+        vol, cycle = mean * self.vol_bps / 1e4, mean * 0.5 / 1e4
+        bursting, switch_ms = False, rnd.expovariate(1.0 / self.quiet_ms) if profile == "burst" else math.inf
+        n = 0
+        while not self.events or n < self.events:
+            n += 1
+            if profile == "steady":
+                t_ms += gap_ms
+            else:
+                if profile == "burst":
+                    while t_ms >= switch_ms:
+                        bursting = not bursting
+                        switch_ms += rnd.expovariate(1.0 / (self.burst_ms if bursting else self.quiet_ms))
+                    r = self.rate * self.burst_factor if bursting else self.rate
+                else:
+                    r = self.rate
+                t_ms += rnd.expovariate(r) * 1000.0
+            # mean reversion + slow cycle + noise, as the original walk
+            p += (mean - p) * 0.001 + math.sin(t_ms / 3000.0) * cycle + rnd.uniform(-vol, vol)
+            if rnd.random() < trade_ratio:
+                buy = rnd.random() < 0.5
+                yield self.start_ms + int(t_ms), True, p + (half if buy else -half), buy
+            else:
+                yield self.start_ms + int(t_ms), False, p, False
+
+    def _mean(self, symbol: str) -> float:
+        return float(self.prices.get(symbol, self.price))
+
+    def _half_spread(self, symbol: str) -> float:
+        return self._mean(symbol) * self.spread_bps / 2e4
+
+    def _pace(self, ts: int) -> None:
+        if self.speed > 0:
+            delay = self._wall0 + (ts - self.start_ms) / 1000.0 / self.speed - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
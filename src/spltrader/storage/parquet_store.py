@@ -0,0 +1,153 @@
+# src/spltrader/storage/parquet_store.py
+import json, os, time
+from array import array
+from datetime import datetime, timezone
+from pathlib import Path
+from ..core.types import Fill, AccountSnapshot
+from .sqlite_store import wall_ms
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional: pip install "spl-trader[parquet]"
+    pa = pq = None
+
+# Columnar IStorage. Rows are buffered per table in typed column arrays
+# (array('q') / array('d') for numbers, lists for strings); a full buffer is
+# written as one Parquet row group. Each table rolls to a new file after
+# `roll_minutes` or once the current file reaches `roll_mb`, so closed files
+# (complete footers) are always readable while the engine keeps running.
+# The age check runs on every write to any table: a quiet table (fills) whose
+# oldest unsealed row is `roll_minutes` old is written and its file closed
+# then, instead of waiting for a full row group or close().
+#
+# [storage] keys: kind = "parquet", dir ("spl_parquet"), row_group_rows (65536),
+#                 roll_minutes (60), roll_mb (256), compression ("zstd")
+#
+# Layout: <dir>/<table>/<table>-YYYYmmdd-HHMMSS-<pid>-<seq>.parquet
+
+
+class _Table:
+    """Typed column buffers for one table plus its rolling file writer."""
+    def __init__(self, root: Path, name: str, columns: dict, opts: dict):
+        self.name = name
+        self.dir = root / name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self.typecodes = columns  # column -> 'q' | 'd' | 's'
+        self.schema = pa.schema([(c, _ARROW_TYPES[t]()) for c, t in columns.items()])
+        self.opts = opts
+        self.cols = self._empty()
+        self.n = 0
+        self.writer = None
+        self.path = None
+        self.opened_at = 0.0
+        self.seq = 0
+        self.due = _NEVER   # monotonic time by which buffered/open rows must be sealed in a closed file
+
+    def _empty(self) -> dict:
+        return {c: ([] if t == "s" else array(t)) for c, t in self.typecodes.items()}
+
+    def append(self, row: tuple) -> None:
+        for col, v in zip(self.cols.values(), row):
+            col.append(v)
+        self.n += 1
+        if self.n == 1 and self.due == _NEVER:
+            self.due = time.monotonic() + self.opts["roll_sec"]
+        if self.n >= self.opts["row_group_rows"]:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self.n:
+            return
+        if self.writer is None or self._should_roll():
+            self._roll()
+        arrays = [pa.array(col, type=f.type) for col, f in zip(self.cols.values(), self.schema)]
+        self.writer.write_table(pa.Table.from_arrays(arrays, schema=self.schema), row_group_size=self.n)
+        self.cols = self._empty()
+        self.n = 0
+
+    def close(self) -> None:
+        """Write buffered rows and close the current file (footer included); the next row starts a new one."""
+        self.flush()
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        self.due = _NEVER
+
+    def _should_roll(self) -> bool:
+        if time.monotonic() - self.opened_at >= self.opts["roll_sec"]:
+            return True
+        return os.path.getsize(self.path) >= self.opts["roll_bytes"]
+
+    def _roll(self) -> None:
+        if self.writer is not None:
+            self.writer.close()
+        stamp = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S")
+        self.seq += 1
+        self.path = self.dir / f"{self.name}-{stamp}-{os.getpid()}-{self.seq:04d}.parquet"
+        self.writer = pq.ParquetWriter(self.path, self.schema, compression=self.opts["compression"])
+        self.opened_at = time.monotonic()
+        self.due = min(self.due, self.opened_at + self.opts["roll_sec"])
+
+
+_NEVER = float("inf")
+
+_ARROW_TYPES = {
+    "q": lambda: pa.int64(),
+    "d": lambda: pa.float64(),
+    "s": lambda: pa.string(),
+}
+
+
+class ParquetStore:
+    def __init__(self, cfg: dict, clock=None):
+        if pa is None:
+            raise ImportError("ParquetStore needs pyarrow: pip install 'spl-trader[parquet]'")
+        st = cfg.get("storage", {})
+        root = Path(st.get("dir", "spl_parquet")).expanduser()
+        opts = {
+            "row_group_rows": int(st.get("row_group_rows", 65_536)),
+            "roll_sec": float(st.get("roll_minutes", 60)) * 60.0,
+            "roll_bytes": int(float(st.get("roll_mb", 256)) * 1024 * 1024),
+            "compression": st.get("compression", "zstd"),
+        }
+        self.fills = _Table(root, "fills", {
+            "ts": "q", "client_id": "s", "symbol": "s", "side": "s", "px": "d", "sz": "d", "fee": "d",
+        }, opts)
+        self.events = _Table(root, "events", {"ts": "q", "kind": "s", "payload": "s"}, opts)
+        # one row per (snapshot, symbol); accounts without positions get a row with symbol=""
+        self.snapshots = _Table(root, "snapshots", {
+            "ts": "q", "balance": "d", "symbol": "s", "base": "d", "pnl_real": "d",
+        }, opts)
+        self._tables = (self.fills, self.events, self.snapshots)
+        self.clock = clock or wall_ms
+
+    def write_fill(self, f: Fill):
+        self.fills.append((f.ts, f.client_id, f.symbol, f.side.value, f.px, f.sz, f.fee))
+        self._seal_due()
+
+    def write_event(self, kind: str, payload: dict):
+        self.events.append((self.clock(), kind, json.dumps(payload, default=str)))
+        self._seal_due()
+
+    def write_snapshot(self, s: AccountSnapshot):
+        if not s.positions:
+            self.snapshots.append((s.ts, s.balance, "", 0.0, 0.0))
+        for sym, p in s.positions.items():
+            self.snapshots.append((s.ts, s.balance, sym, float(p.get("base", 0.0)), float(p.get("pnl_real", 0.0))))
+        self._seal_due()
+
+    def flush(self):
+        """Write buffered rows as (short) row groups; files stay open."""
+        for t in self._tables:
+            t.flush()
+
+    def close(self):
+        for t in self._tables:
+            t.close()
+
+    def _seal_due(self) -> None:
+        now = time.monotonic()
+        for t in self._tables:
+            if now >= t.due:
+                t.close()
@@ -0,0 +1,93 @@
+# src/spltrader/storage/recorder.py
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable
+from ..core.types import Quote, Trade
+from ..core.batch import BATCH_TYPES
+from .tape import TapeWriter
+
+# Wraps any IMarketData and appends every Quote/Trade it yields to a tape
+# (see tape.py) before handing it on. One file per symbol per UTC day:
+#
+#   <dir>/<symbol>/<YYYYmmdd>.tape
+#
+# Quotes and trades of a symbol go to the same file, in arrival order.
+# [record] keys: dir (enables recording), index_every (4096)
+
+_DAY_MS = 86_400_000
+
+
+class RecordingMarket:
+    def __init__(self, market, root: "str | Path", index_every: int = 4096):
+        self.market = market
+        self.root = Path(root)
+        self.index_every = index_every
+        self._lock = threading.Lock()                         # guards _locks
+        self._locks: dict[str, threading.Lock] = {}           # symbol -> lock over its writer
+        self._writers: dict[str, tuple[int, TapeWriter]] = {}  # symbol -> (day, writer)
+
+    def subscribe_quotes(self, symbol: str) -> Iterable[Quote]:
+        for q in self.market.subscribe_quotes(symbol):
+            self._record(symbol, q)
+            yield q
+
+    def subscribe_trades(self, symbol: str) -> Iterable[Trade]:
+        for t in self.market.subscribe_trades(symbol):
+            self._record(symbol, t)
+            yield t
+
+    def get_mark_price(self, symbol: str) -> float:
+        return self.market.get_mark_price(symbol)
+
+    def get_funding(self, symbol: str) -> float:
+        return self.market.get_funding(symbol)
+
+    def __getattr__(self, name):
+        # anything else (execution_live, ...) belongs to the wrapped adapter; `aio` is
+        # withheld so AsyncEngine wraps this recorder instead of bypassing it
+        if name == "aio":
+            raise AttributeError(name)
+        return getattr(self.market, name)
+
+    def close(self) -> None:
+        """Finish every open tape (writes index + trailer)."""
+        with self._lock:
+            locks = dict(self._locks)
+        for symbol, lock in locks.items():
+            with lock:
+                entry = self._writers.pop(symbol, None)
+                if entry is not None:
+                    entry[1].close()
+
+    def _record(self, symbol: str, evt) -> None:
+        if evt.__class__ in BATCH_TYPES:
+            for row in evt:
+                self._record(symbol, row)
+            return
+        day = evt.ts // _DAY_MS
+        lock = self._locks.get(symbol)
+        if lock is None:
+            with self._lock:
+                lock = self._locks.setdefault(symbol, threading.Lock())
+        # quote and trade streams of a symbol are pumped from different threads:
+        # lookup, roll and write happen under the symbol's lock. Days only roll
+        # forward; a late event from the previous day goes to the current file.
+        with lock:
+            entry = self._writers.get(symbol)
+            if entry is None or day > entry[0]:
+                entry = self._roll(symbol, day, entry)
+            entry[1].write(evt)
+
+    def _roll(self, symbol: str, day: int, entry):
+        if entry is not None:
+            entry[1].close()
+        stamp = datetime.fromtimestamp(day * _DAY_MS / 1000, tz=timezone.utc).strftime("%Y%m%d")
+        path = tape_path(self.root, symbol, stamp)
+        entry = self._writers[symbol] = (day, TapeWriter(path, index_every=self.index_every))
+        return entry
+
+
+def tape_path(root: "str | Path", symbol: str, day: str) -> Path:
+    """Path of the tape for `symbol` on `day` (YYYYmmdd)."""
+    return Path(root) / symbol / f"{day}.tape"
@@ -0,0 +1,63 @@
+# src/spltrader/storage/replay.py
+from pathlib import Path
+from typing import Iterable, Optional
+from ..core.types import Quote, Trade
+from .tape import TapeReader, KIND_QUOTE, KIND_TRADE, TAPE_DTYPE_FIELDS
+
+# IMarketData over recorded tapes (see recorder.py for the layout). Streams end
+# when the last tape is exhausted and nothing sleeps, so the engine runs at CPU
+# speed. Pair it with the "timestamp" merge policy for a deterministic replay.
+
+
+class TapeMarket:
+    def __init__(self, root: "str | Path", start: Optional[str] = None, end: Optional[str] = None):
+        """start/end: inclusive YYYYmmdd bounds on the tape files to replay."""
+        self.root = Path(root)
+        self.start = start
+        self.end = end
+        self._last: dict[str, Quote] = {}
+
+    def days(self, symbol: str) -> list[Path]:
+        paths = sorted((self.root / symbol).glob("*.tape"))
+        return [p for p in paths
+                if (self.start is None or p.stem >= self.start) and (self.end is None or p.stem <= self.end)]
+
+    def first_ts(self, symbol: str) -> Optional[int]:
+        """Time of the first replayed record of `symbol` (None without tapes)."""
+        for path in self.days(symbol):
+            with TapeReader(path) as r:
+                if len(r):
+                    return r.ts_at(0)
+        return None
+
+    def subscribe_quotes(self, symbol: str) -> Iterable[Quote]:
+        for q in self._replay(symbol, KIND_QUOTE):
+            self._last[symbol] = q
+            yield q
+
+    def subscribe_trades(self, symbol: str) -> Iterable[Trade]:
+        return self._replay(symbol, KIND_TRADE)
+
+    def get_mark_price(self, symbol: str) -> float:
+        q = self._last.get(symbol)
+        if q is None:
+            raise RuntimeError(f"no quote replayed yet for {symbol}")
+        return (q.bid + q.ask) / 2.0
+
+    def get_funding(self, symbol: str) -> float:
+        return 0.0
+
+    def as_numpy(self, symbol: str):
+        """All replayed records of `symbol` as one structured array (copied; needs numpy)."""
+        import numpy as np
+        parts = []
+        for path in self.days(symbol):
+            with TapeReader(path) as r:
+                if len(r):
+                    parts.append(r.as_numpy().copy())
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.dtype(TAPE_DTYPE_FIELDS))
+
+    def _replay(self, symbol: str, kind: int):
+        for path in self.days(symbol):
+            with TapeReader(path, symbol=symbol) as r:
+                yield from r.iter_kind(kind)
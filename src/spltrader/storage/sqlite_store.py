@@ -1,33 +1,232 @@
 # src/spl/storage/sqlite_store.py
-import sqlite3, time, json
+import sqlite3, time, json, queue, threading
 from pathlib import Path
-from ..core.types import Fill
+from ..core.types import Fill, AccountSnapshot
+from ..core.log import log
+
+_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS fills(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER, client_id TEXT, symbol TEXT, side TEXT,
+        px REAL, sz REAL, fee REAL
+    )""",
+    """CREATE TABLE IF NOT EXISTS events(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER, kind TEXT, payload TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS snapshots(
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        ts INTEGER, balance REAL, positions TEXT
+    )""",
+)
+_INSERT_FILL = "INSERT INTO fills(ts, client_id, symbol, side, px, sz, fee) VALUES (?,?,?,?,?,?,?)"
+_INSERT_EVENT = "INSERT INTO events(ts, kind, payload) VALUES (?,?,?)"
+_INSERT_SNAPSHOT = "INSERT INTO snapshots(ts, balance, positions) VALUES (?,?,?)"
+
+
+def wall_ms() -> int:
+    return int(time.time()*1000)
+
 
 class SQLiteStore:
-    def __init__(self, cfg: dict):
-        dbpath = cfg.get("storage", {}).get("path", "spl.db")
-        self.conn = sqlite3.connect(Path(dbpath))
-        self.conn.execute("""CREATE TABLE IF NOT EXISTS fills(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ts INTEGER, client_id TEXT, symbol TEXT, side TEXT,
-            px REAL, sz REAL, fee REAL
-        )""")
-        self.conn.execute("""CREATE TABLE IF NOT EXISTS events(
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            ts INTEGER, kind TEXT, payload TEXT
-        )""")
+    def __init__(self, cfg: dict, clock=None):
+        # clock() -> ms stamps event rows; a backtest passes simulated time
+        self.clock = clock or wall_ms
+        self.path = Path(cfg.get("storage", {}).get("path", "spl.db"))
+        self.conn = sqlite3.connect(self.path)
+        for ddl in _SCHEMA:
+            self.conn.execute(ddl)
         self.conn.commit()
-    
+
     def write_fill(self, f: Fill):
         self.conn.execute(
-            "INSERT INTO fills(ts, client_id, symbol, side, px, sz, fee) VALUES (?,?,?,?,?,?,?)",
+            _INSERT_FILL,
             (f.ts, f.client_id, f.symbol, f.side.value, f.px, f.sz, f.fee),
         )
         self.conn.commit()
 
     def write_event(self, kind: str, payload: dict):
         self.conn.execute(
-            "INSERT INTO events(ts, kind, payload) VALUES (?,?,?)",
-            (int(time.time()*1000), kind, json.dumps(payload)),
+            _INSERT_EVENT,
+            (self.clock(), kind, json.dumps(payload)),
+        )
+        self.conn.commit()
+
+    def write_snapshot(self, s: AccountSnapshot):
+        self.conn.execute(
+            _INSERT_SNAPSHOT,
+            (s.ts, s.balance, json.dumps(s.positions)),
         )
         self.conn.commit()
+
+    def flush(self):
+        # every write already committed
+        pass
+
+    def close(self):
+        self.conn.close()
+
+
+_FILL, _EVENT, _SNAPSHOT, _FLUSH, _STOP = range(5)
+
+
+class WriteBehindSQLiteStore(SQLiteStore):
+    """
+    Same tables as SQLiteStore, but write_* only enqueue a row tuple. A dedicated
+    writer thread drains the queue with executemany (WAL, synchronous=NORMAL) and
+    commits every `commit_every` rows or `commit_ms` milliseconds, whichever comes first.
+
+    [storage] keys: write_behind = true, queue_max (100000), commit_every (500), commit_ms (200)
+
+    The queue is bounded: when the writer falls that far behind, write_* blocks
+    rather than dropping fills. Call close() (or flush()) before exit.
+
+    A batch that fails (say an event payload json can't encode) is retried row
+    by row; only the rows that fail again are dropped and logged. Anything else
+    stops the writer: the error is kept and re-raised by write_*, flush() and
+    close(), so queued rows are never dropped silently and nothing blocks on a
+    queue nobody drains.
+    """
+    def __init__(self, cfg: dict, clock=None):
+        super().__init__(cfg, clock)
+        self.conn.close()  # schema only; the writer thread owns its own connection
+        st = cfg.get("storage", {})
+        self.commit_every = int(st.get("commit_every", 500))
+        self.commit_sec = float(st.get("commit_ms", 200)) / 1000.0
+        self._q: queue.Queue = queue.Queue(maxsize=int(st.get("queue_max", 100_000)))
+        self._error: BaseException | None = None   # set once by the writer thread if it dies
+        self._writer = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._writer.start()
+
+    def write_fill(self, f: Fill):
+        self._put((_FILL, (f.ts, f.client_id, f.symbol, f.side.value, f.px, f.sz, f.fee)))
+
+    def write_event(self, kind: str, payload: dict):
+        # json encoding happens on the writer thread; shallow-copy so later mutation can't race it
+        self._put((_EVENT, (self.clock(), kind, dict(payload))))
+
+    def write_snapshot(self, s: AccountSnapshot):
+        positions = {sym: dict(p) for sym, p in s.positions.items()}
+        self._put((_SNAPSHOT, (s.ts, s.balance, positions)))
+
+    def flush(self):
+        """Block until everything enqueued so far is committed."""
+        self._check()
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._put((_FLUSH, done))
+        while not done.wait(0.5):
+            self._check()
+
+    def _put(self, item) -> None:
+        self._check()
+        try:
+            self._q.put_nowait(item)
+        except queue.Full:
+            while True:
+                try:
+                    self._q.put(item, timeout=0.5)
+                    return
+                except queue.Full:
+                    self._check()
+
+    def _check(self) -> None:
+        if self._error is not None:
+            raise RuntimeError(f"sqlite writer thread died: {self._error!r}") from self._error
+
+    def close(self):
+        """Stop the writer after it drains the queue; raises if it died with rows unwritten."""
+        while self._writer.is_alive():
+            try:
+                self._q.put((_STOP, None), timeout=0.5)
+                break
+            except queue.Full:
+                pass
+        self._writer.join()
+        self._check()
+
+    # --- writer thread ---
+    def _run(self):
+        try:
+            self._write_loop()
+        except BaseException as e:
+            self._error = e
+            log.error("storage.sqlite", event="writer_died", error=repr(e))
+
+    def _write_loop(self):
+        conn = sqlite3.connect(self.path)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        fills, events, snaps, waiters = [], [], [], []
+        last_commit = time.monotonic()
+        stop = False
+
+        while not stop:
+            pending = len(fills) + len(events) + len(snaps)
+            timeout = max(0.0, self.commit_sec - (time.monotonic() - last_commit)) if pending else None
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+
+            # take whatever else is already queued, up to one batch
+            while item is not None:
+                kind, row = item
+                if kind == _FILL:
+                    fills.append(row)
+                elif kind == _EVENT:
+                    events.append(row)
+                elif kind == _SNAPSHOT:
+                    snaps.append(row)
+                elif kind == _FLUSH:
+                    waiters.append(row)
+                else:
+                    stop = True
+                if stop or len(fills) + len(events) + len(snaps) >= self.commit_every:
+                    break
+                try:
+                    item = self._q.get_nowait()
+                except queue.Empty:
+                    item = None
+
+            pending = len(fills) + len(events) + len(snaps)
+            due = time.monotonic() - last_commit >= self.commit_sec
+            if pending and (due or waiters or stop or pending >= self.commit_every):
+                try:
+                    if fills:
+                        conn.executemany(_INSERT_FILL, fills)
+                    if events:
+                        conn.executemany(_INSERT_EVENT, [(ts, k, json.dumps(p)) for ts, k, p in events])
+                    if snaps:
+                        conn.executemany(_INSERT_SNAPSHOT, [(ts, b, json.dumps(p)) for ts, b, p in snaps])
+                    conn.commit()
+                except (TypeError, ValueError, sqlite3.InterfaceError) as e:
+                    conn.rollback()
+                    _write_rows(conn, fills, events, snaps, e)
+                fills, events, snaps = [], [], []
+                last_commit = time.monotonic()
+            elif not pending:
+                last_commit = time.monotonic()
+            for w in waiters:
+                w.set()
+            waiters = []
+
+        conn.close()
+
+
+def _write_rows(conn, fills, events, snaps, batch_error):
+    """Commit a failed batch one row at a time, dropping (and logging) only the rows that fail."""
+    rows = [(_INSERT_FILL, r, None) for r in fills]
+    rows += [(_INSERT_EVENT, (ts, k), p) for ts, k, p in events]
+    rows += [(_INSERT_SNAPSHOT, (ts, b), p) for ts, b, p in snaps]
+    dropped, first = 0, None
+    for sql, row, payload in rows:
+        try:
+            conn.execute(sql, row if payload is None else row + (json.dumps(payload),))
+        except (TypeError, ValueError, sqlite3.InterfaceError) as e:
+            dropped += 1
+            first = first or e
+    conn.commit()
+    log.error("storage.sqlite", event="rows_dropped", rows=dropped, of=len(rows),
+              batch_error=repr(batch_error), error=repr(first))
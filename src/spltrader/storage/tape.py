@@ -0,0 +1,203 @@
+# src/spltrader/storage/tape.py
+import mmap, os, struct
+from bisect import bisect_right
+from pathlib import Path
+from typing import Iterator, Union
+from ..core.types import Quote, Trade, Side
+
+# Compact fixed-width market data tape.
+#
+#   header   16 B   magic "SPLTAPE1", u16 version, u16 record size, u32 reserved
+#   records  48 B   i64 ts | u8 kind | u8 side | 6 pad | 4 x f64
+#                     quote: bid, ask, bid_sz, ask_sz
+#                     trade: price, size, 0, 0
+#   index    16 B   (i64 ts, u64 record_no) for every `index_every`-th record
+#   trailer  32 B   u64 n_records, u64 index_offset, u64 n_index, magic "SPLTAIL1"
+#
+# Records are appended in arrival order. The index/trailer are written on close;
+# a file without them (crash, or still being written) is still readable: the
+# record count comes from the file size and seeks bisect the records directly.
+# Fixed-width little-endian records make the file mmap- and NumPy-friendly
+# (see TAPE_DTYPE_FIELDS / TapeReader.as_numpy).
+
+MAGIC = b"SPLTAPE1"
+TAIL_MAGIC = b"SPLTAIL1"
+VERSION = 1
+
+_HEADER = struct.Struct("<8sHHI")
+_RECORD = struct.Struct("<qBB6xdddd")
+_INDEX = struct.Struct("<qQ")
+_TRAILER = struct.Struct("<QQQ8s")
+
+HEADER_SIZE = _HEADER.size
+RECORD_SIZE = _RECORD.size
+
+KIND_QUOTE, KIND_TRADE = 1, 2
+_SIDE_CODE = {None: 0, Side.BUY: 1, Side.SELL: 2}
+_CODE_SIDE = {1: Side.BUY, 2: Side.SELL}
+
+# numpy.dtype(TAPE_DTYPE_FIELDS) matches one record
+TAPE_DTYPE_FIELDS = [
+    ("ts", "<i8"), ("kind", "u1"), ("side", "u1"), ("_pad", "V6"),
+    ("f0", "<f8"), ("f1", "<f8"), ("f2", "<f8"), ("f3", "<f8"),
+]
+
+
+class TapeWriter:
+    """
+    Appends Quote/Trade records to one tape file. Reopening an existing tape
+    drops its index/trailer (and any torn last record) and keeps appending.
+    """
+    def __init__(self, path: Union[str, Path], index_every: int = 4096, buffer_bytes: int = 1 << 20):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.index_every = index_every
+        self.n = self._prepare()
+        self._index: list[tuple[int, int]] = []
+        if self.n:
+            self._rebuild_index()
+        self._f = open(self.path, "ab", buffering=buffer_bytes)
+        if self.n == 0 and self._f.tell() == 0:
+            self._f.write(_HEADER.pack(MAGIC, VERSION, RECORD_SIZE, 0))
+        self._pack = _RECORD.pack
+
+    def write(self, evt: Union[Quote, Trade]) -> None:
+        if self.n % self.index_every == 0:
+            self._index.append((evt.ts, self.n))
+        if isinstance(evt, Trade):
+            self._f.write(self._pack(evt.ts, KIND_TRADE, _SIDE_CODE[evt.side], evt.price, evt.size, 0.0, 0.0))
+        else:
+            self._f.write(self._pack(evt.ts, KIND_QUOTE, 0, evt.bid, evt.ask, evt.bid_sz, evt.ask_sz))
+        self.n += 1
+
+    def flush(self) -> None:
+        self._f.flush()
+
+    def close(self) -> None:
+        """Writes the index and trailer; the file is then complete."""
+        if self._f.closed:
+            return
+        index_offset = HEADER_SIZE + self.n * RECORD_SIZE
+        for ts, rec in self._index:
+            self._f.write(_INDEX.pack(ts, rec))
+        self._f.write(_TRAILER.pack(self.n, index_offset, len(self._index), TAIL_MAGIC))
+        self._f.close()
+
+    def _prepare(self) -> int:
+        """Return the record count of an existing tape, truncated back to its last whole record."""
+        if not self.path.exists() or self.path.stat().st_size == 0:
+            return 0
+        with open(self.path, "r+b") as f:
+            _check_header(f.read(HEADER_SIZE), self.path)
+            n, _, _ = _read_trailer(f, self.path.stat().st_size)
+            f.truncate(HEADER_SIZE + n * RECORD_SIZE)
+        return n
+
+    def _rebuild_index(self) -> None:
+        with TapeReader(self.path) as r:
+            for rec in range(0, self.n, self.index_every):
+                self._index.append((r.ts_at(rec), rec))
+
+
+class TapeReader:
+    """Memory-mapped, random-access reader for one tape file (records are stamped with `symbol`)."""
+    def __init__(self, path: Union[str, Path], symbol: str = ""):
+        self.path = Path(path)
+        self.symbol = symbol
+        self._f = open(self.path, "rb")
+        size = os.fstat(self._f.fileno()).st_size
+        _check_header(self._f.read(HEADER_SIZE), self.path)
+        self.n, index_offset, n_index = _read_trailer(self._f, size)
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if size else None
+        # sparse index from the footer, when the tape was closed cleanly
+        self._index_ts: list[int] = []
+        self._index_rec: list[int] = []
+        for i in range(n_index):
+            ts, rec = _INDEX.unpack_from(self._mm, index_offset + i * _INDEX.size)
+            self._index_ts.append(ts)
+            self._index_rec.append(rec)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.n
+
+    def close(self) -> None:
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+    def ts_at(self, i: int) -> int:
+        return struct.unpack_from("<q", self._mm, HEADER_SIZE + i * RECORD_SIZE)[0]
+
+    def record(self, i: int) -> Union[Quote, Trade]:
+        ts, kind, side, f0, f1, f2, f3 = _RECORD.unpack_from(self._mm, HEADER_SIZE + i * RECORD_SIZE)
+        if kind == KIND_TRADE:
+            return Trade(ts=ts, price=f0, size=f1, side=_CODE_SIDE[side], symbol=self.symbol)
+        return Quote(ts=ts, bid=f0, ask=f1, bid_sz=f2, ask_sz=f3, symbol=self.symbol)
+
+    def seek(self, ts: int) -> int:
+        """Index of the first record with record.ts >= ts (assumes ts is non-decreasing)."""
+        lo, hi = 0, self.n
+        if self._index_ts:
+            # narrow to one index block before bisecting the records themselves
+            b = bisect_right(self._index_ts, ts) - 1
+            if b >= 0:
+                lo = self._index_rec[b]
+            if b + 1 < len(self._index_rec):
+                hi = self._index_rec[b + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.ts_at(mid) < ts:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def __iter__(self) -> Iterator[Union[Quote, Trade]]:
+        return self.iter_from(0)
+
+    def iter_from(self, start: int = 0, stop: "int | None" = None) -> Iterator[Union[Quote, Trade]]:
+        stop = self.n if stop is None else min(stop, self.n)
+        for i in range(start, stop):
+            yield self.record(i)
+
+    def iter_kind(self, kind: int, start: int = 0) -> Iterator[Union[Quote, Trade]]:
+        """Only KIND_QUOTE or only KIND_TRADE records; other records are skipped without decoding."""
+        mm, rec = self._mm, self.record
+        off = HEADER_SIZE + start * RECORD_SIZE + 8  # kind byte follows the i64 ts
+        for i in range(start, self.n):
+            if mm[off] == kind:
+                yield rec(i)
+            off += RECORD_SIZE
+
+    def as_numpy(self):
+        """Zero-copy structured array view over all records (needs numpy)."""
+        import numpy as np
+        return np.frombuffer(self._mm, dtype=np.dtype(TAPE_DTYPE_FIELDS), count=self.n, offset=HEADER_SIZE)
+
+
+def _check_header(raw: bytes, path) -> None:
+    if len(raw) < HEADER_SIZE:
+        raise ValueError(f"{path}: truncated tape header")
+    magic, version, rec_size, _ = _HEADER.unpack(raw)
+    if magic != MAGIC or rec_size != RECORD_SIZE:
+        raise ValueError(f"{path}: not a SPL tape (magic={magic!r}, record={rec_size})")
+    if version != VERSION:
+        raise ValueError(f"{path}: unsupported tape version {version}")
+
+
+def _read_trailer(f, size: int) -> tuple[int, int, int]:
+    """(n_records, index_offset, n_index); files without a trailer are sized from their length."""
+    if size >= HEADER_SIZE + _TRAILER.size:
+        f.seek(size - _TRAILER.size)
+        n, index_offset, n_index, magic = _TRAILER.unpack(f.read(_TRAILER.size))
+        if magic == TAIL_MAGIC and index_offset == HEADER_SIZE + n * RECORD_SIZE:
+            return n, index_offset, n_index
+    f.seek(HEADER_SIZE)
+    return max(0, (size - HEADER_SIZE) // RECORD_SIZE), 0, 0
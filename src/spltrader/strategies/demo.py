@@ -1,5 +1,4 @@
-import time
-from ..core.types import OrderReq, OrdType, Side
+from ..core.types import OrderReq, OrdType, Side, event_price
 
 class RangeBounce:
     """
@@ -7,6 +6,8 @@ class RangeBounce:
     - If price > range_high: place a short limit just below it.
     - If price < range_low: place a long limit just above it.
     This is intentionally naive; replace with your real signal logic.
+
+    signals() is the same rule over whole price arrays (engine/vectorized.py).
     """
     def __init__(self, cfg):
         s = cfg.get("strategy", {})
@@ -14,24 +15,21 @@ class RangeBounce:
         self.range_high = float(s.get("range_high", 100.5))
         self.size = float(s.get("size", 1.0))
         self.symbol = cfg.get("symbol", "SOL-PERP")
+        self._seq = 0  # client ids derive from event time + this counter, so replays are repeatable
 
     def on_event(self, event):
 
-        # Works with Quote or Trade (both have price info one way or another)
-        price = getattr(event, "price", None)
+        # Works with Quote (mid) or Trade (price)
+        price = event_price(event)
         if price is None:
-            # if Quote, derive mid
-            if hasattr(event, "bid") and hasattr(event, "ask"):
-                price = (event.bid + event.ask) / 2.0
-            else:
-                return []
+            return []
 
         orders = []
-        ts = int(time.time()*1000)
+        ts = event.ts
 
         if price >= self.range_high:
             orders.append(OrderReq(
-                client_id=f"short-{ts}",
+                client_id=self.client_id(Side.SELL, ts, self._next_seq()),
                 symbol=self.symbol,
                 side=Side.SELL,
                 type=OrdType.LIMIT,
@@ -40,7 +38,7 @@ class RangeBounce:
             ))
         elif price <= self.range_low:
             orders.append(OrderReq(
-                client_id=f"long-{ts}",
+                client_id=self.client_id(Side.BUY, ts, self._next_seq()),
                 symbol=self.symbol,
                 side=Side.BUY,
                 type=OrdType.LIMIT,
@@ -49,3 +47,18 @@ class RangeBounce:
             ))
 
         return orders
+
+    def signals(self, price):
+        """Per-event (sign, limit px, size) over a NumPy price array; sign 0 = no order."""
+        import numpy as np
+        sign = np.where(price >= self.range_high, -1, np.where(price <= self.range_low, 1, 0)).astype(np.int8)
+        px = np.where(sign < 0, self.range_high - 0.01, self.range_low + 0.01)
+        return sign, px, self.size
+
+    @staticmethod
+    def client_id(side: Side, ts: int, seq: int) -> str:
+        return f"{'short' if side == Side.SELL else 'long'}-{ts}-{seq}"
+
+    def _next_seq(self) -> int:
+        self._seq += 1
+        return self._seq
@@ -1,5 +1,6 @@
 import time
 from ..core.types import OrderReq, OrdType, Side
+from ..core.log import log
 
 class DemoMarketTick:
     def __init__(self, cfg):
@@ -20,10 +21,8 @@ class DemoMarketTick:
         mid = (evt.bid + evt.ask) / 2
         client_id = f"demo-{now}"
 
-        print(
-            f"[STRAT] firing market BUY {self.qty} {self.symbol} "
-            f"at mid={mid:.4f} (bid={evt.bid:.4f} ask={evt.ask:.4f})"
-        )
+        log.info("strategy.demo_market_tick", action="buy", qty=self.qty, symbol=self.symbol,
+                 mid=mid, bid=evt.bid, ask=evt.ask)
 
         return [
             OrderReq(
@@ -0,0 +1,178 @@
+import asyncio, time
+
+import pytest
+
+from spltrader.core.types import Quote, Trade, Side, OrderReq, OrdType, OrderAck
+from spltrader.engine.async_engine import AsyncEngine, amerge, as_async_backend, as_async_market
+from spltrader.exec.backend_shadow import ShadowBackend
+from spltrader.risk.allow_all import AllowAllRisk
+
+
+class _AsyncMarket:
+    async def subscribe_quotes(self, symbol):
+        yield Quote(ts=1, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+
+    async def subscribe_trades(self, symbol):
+        await asyncio.sleep(0.01)
+        yield Trade(ts=2, price=98.0, size=1.0, side=Side.SELL)
+
+
+class _SyncMarket:
+    def subscribe_quotes(self, symbol):
+        yield Quote(ts=1, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+
+    def subscribe_trades(self, symbol):
+        time.sleep(0.05)
+        yield Trade(ts=2, price=98.0, size=1.0, side=Side.SELL)
+
+
+class _BuyOnQuote:
+    def on_event(self, evt):
+        if isinstance(evt, Quote):
+            return [OrderReq(client_id="b1", symbol="SOL-PERP", side=Side.BUY,
+                             type=OrdType.LIMIT, px=99.0, sz=1.0)]
+        return []
+
+
+class _Store:
+    def __init__(self):
+        self.fills = []
+    def write_fill(self, f):
+        self.fills.append(f)
+
+
+def _run(market):
+    store = _Store()
+    eng = AsyncEngine(market, ShadowBackend(), store, AllowAllRisk())
+    asyncio.run(eng.run("SOL-PERP", _BuyOnQuote()))
+    return store.fills
+
+
+def test_native_async_market_fills_through_shadow():
+    assert as_async_market(_AsyncMarket()).__class__ is _AsyncMarket
+    fills = _run(_AsyncMarket())
+    assert [(f.client_id, f.px) for f in fills] == [("b1", 98.0)]
+
+
+def test_sync_adapters_are_wrapped():
+    backend = as_async_backend(ShadowBackend())
+    assert asyncio.iscoroutinefunction(backend.place)
+    fills = _run(_SyncMarket())
+    assert [(f.client_id, f.px) for f in fills] == [("b1", 98.0)]
+
+
+class _Batching(ShadowBackend):
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+    def place_many(self, reqs):
+        self.batches.append([r.client_id for r in reqs])
+        return [self.place(r) for r in reqs]
+
+
+def test_wrapped_backend_keeps_place_many():
+    backend = _Batching()
+    eng = AsyncEngine(_AsyncMarket(), backend, _Store(), AllowAllRisk())
+    asyncio.run(eng.run("SOL-PERP", _BuyOnQuote()))
+    assert backend.batches == [["b1"]]
+    assert not hasattr(as_async_backend(ShadowBackend()), "place_many")
+
+
+class _AckingBackend(ShadowBackend):
+    """Sync backend whose places are acked one event later; rejects the first order."""
+    def __init__(self):
+        super().__init__()
+        self._acks = []
+    def place(self, req):
+        self._acks.append(OrderAck(ts=0, client_id=req.client_id, symbol=req.symbol, ok=req.client_id != "b1",
+                                   error="" if req.client_id != "b1" else "rejected"))
+        return super().place(req)
+    def poll_acks(self):
+        acks, self._acks = self._acks, []
+        return acks
+
+
+class _RetryStrategy(_BuyOnQuote):
+    def __init__(self):
+        self.acks = []
+    def on_ack(self, ack):
+        self.acks.append((ack.client_id, ack.ok))
+        if ack.ok:
+            return []
+        return [OrderReq(client_id="b2", symbol="SOL-PERP", side=Side.BUY, type=OrdType.LIMIT, px=99.0, sz=1.0)]
+
+
+class _EventStore(_Store):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+    def write_event(self, kind, payload):
+        self.events.append((kind, payload["client_id"], payload["ok"]))
+
+
+def test_async_engine_drains_acks_through_wrapper():
+    backend, store, strat = _AckingBackend(), _EventStore(), _RetryStrategy()
+    eng = AsyncEngine(_AsyncMarket(), as_async_backend(backend, blocking=True), store, AllowAllRisk())
+    asyncio.run(eng.run("SOL-PERP", strat))
+    assert strat.acks == [("b1", False), ("b2", True)]
+    assert store.events == [("order_ack", "b1", False), ("order_ack", "b2", True)]
+    assert eng.n_rejected == 1 and backend._acks == []
+
+
+def test_amerge_raises_a_stream_error_while_others_still_run():
+    async def endless():
+        while True:
+            await asyncio.sleep(0.001)
+            yield 1
+
+    async def broken():
+        yield 0
+        raise RuntimeError("feed died")
+
+    async def main():
+        seen = []
+        with pytest.raises(RuntimeError, match="feed died"):
+            async for _, evt in amerge({"live": endless(), "bad": broken()}):
+                seen.append(evt)
+        return seen
+
+    assert 0 in asyncio.run(asyncio.wait_for(main(), 2))
+
+
+class _Plain:
+    def place(self, req): return req.client_id
+
+
+def test_backends_declare_whether_they_block():
+    assert as_async_backend(ShadowBackend()).blocking is False     # in-memory: inline on the loop
+    assert as_async_backend(_Plain()).blocking is True             # unknown backend: assume network I/O
+    assert as_async_backend(ShadowBackend(), blocking=True).blocking is True
+
+
+class _TickMarket:
+    async def subscribe_quotes(self, symbol):
+        for ts in (0, 60, 120, 180):
+            yield Quote(ts=ts, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+
+    async def subscribe_trades(self, symbol):
+        return
+        yield
+
+
+class _SnapStore(_Store):
+    def __init__(self):
+        super().__init__()
+        self.snapshots = []
+    def write_snapshot(self, s):
+        self.snapshots.append(s)
+
+
+def test_async_engine_snapshots_and_metrics_like_engine():
+    from spltrader.core.metrics import EngineMetrics, Registry
+    reg, store = Registry(), _SnapStore()
+    eng = AsyncEngine(_TickMarket(), ShadowBackend(), store, AllowAllRisk(), snapshot_ms=100,
+                      metrics=EngineMetrics(reg))
+    asyncio.run(eng.run("SOL-PERP", _BuyOnQuote()))
+    assert len(store.snapshots) == 1                                # 0 starts the clock, 120 is the first due
+    assert reg.counter_value("spl_events_total") == 4
+    assert eng.metrics.match_quote.count == 4 and eng.metrics.strategy.count == 4 and eng.metrics.place.count == 4
@@ -0,0 +1,71 @@
+import pickle
+
+import pytest
+
+from spltrader.core.batch import QuoteBatch, TradeBatch
+from spltrader.core.types import Quote, Trade, Fill, Side, event_price, to_dict, OrderReq, OrdType
+from spltrader.engine.engine import Engine
+from spltrader.risk.allow_all import AllowAllRisk
+
+
+def test_slotted_types():
+    q = Quote(ts=1, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+    assert not hasattr(q, "__dict__") and q.mid == 100.0 and event_price(q) == 100.0
+    assert event_price(Trade(ts=1, price=5.0, size=1.0, side=Side.BUY)) == 5.0
+    f = Fill(ts=1, client_id="a", symbol="S", side=Side.BUY, px=1.0, sz=1.0, fee=0.0)
+    with pytest.raises(AttributeError):
+        f.px = 2.0
+    assert pickle.loads(pickle.dumps(f)) == f
+    req = OrderReq(client_id="a", symbol="S", side=Side.SELL, type=OrdType.LIMIT, px=1.0, sz=2.0)
+    assert to_dict(req)["sz"] == 2.0
+
+
+def test_batch_roundtrip_and_numpy():
+    trades = [Trade(ts=i, price=100.0 + i, size=1.0, side=Side.SELL if i % 2 else Side.BUY, symbol="S")
+              for i in range(5)]
+    tb = TradeBatch.from_trades(trades, symbol="S")
+    assert len(tb) == 5 and tb.ts == 0 and list(tb) == trades and tb.row(3) == trades[3]
+    pytest.importorskip("numpy")
+    cols = tb.to_numpy()
+    assert cols["price"].sum() == sum(t.price for t in trades)
+    assert cols["side"].tolist() == [1, -1, 1, -1, 1]
+
+
+def test_empty_batch_is_rejected_by_ts_and_merges():
+    from spltrader.engine.merge import TimestampMerge
+    for empty in (QuoteBatch("S"), TradeBatch("S")):
+        with pytest.raises(ValueError, match="must not emit empty batches"):
+            empty.ts
+    streams = {"q": iter([QuoteBatch("S")]), "t": iter([Trade(ts=1, price=1.0, size=1.0, side=Side.BUY)])}
+    with pytest.raises(ValueError, match="empty QuoteBatch"):
+        list(TimestampMerge()(streams))
+
+
+class _BatchMarket:
+    def subscribe_quotes(self, symbol):
+        yield QuoteBatch.from_quotes(Quote(ts=i, bid=1.0, ask=2.0, bid_sz=1.0, ask_sz=1.0) for i in range(3))
+
+    def subscribe_trades(self, symbol):
+        yield Trade(ts=10, price=1.5, size=1.0, side=Side.BUY)
+
+
+class _NullBackend:
+    def place(self, req): return req.client_id
+    def on_quote(self, q): return []
+    def on_trade(self, t): return []
+
+
+class _Recorder:
+    def __init__(self):
+        self.seen = []
+    def on_event(self, evt):
+        self.seen.append(evt)
+        return []
+
+
+def test_engine_expands_batches():
+    strat = _Recorder()
+    eng = Engine(_BatchMarket(), _NullBackend(), None, AllowAllRisk(), merge="timestamp")
+    eng.run("SOL-PERP", strat)
+    assert [type(e).__name__ for e in strat.seen] == ["Quote"] * 3 + ["Trade"]
+    assert all(e.symbol == "SOL-PERP" for e in strat.seen) and eng.n_events == 4
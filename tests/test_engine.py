@@ -0,0 +1,193 @@
+import threading
+
+import pytest
+
+from spltrader.core.types import Quote, Trade, Side, OrderReq, OrdType, OrderAck
+from spltrader.engine.engine import Engine
+from spltrader.engine.merge import TimestampMerge
+from spltrader.exec.backend_shadow import ShadowBackend
+from spltrader.risk.allow_all import AllowAllRisk
+
+
+class _NullBackend:
+    def place(self, req): return req.client_id
+    def cancel(self, cid): return False
+    def on_quote(self, q): return []
+    def on_trade(self, t): return []
+
+
+class _Recorder:
+    def __init__(self):
+        self.seen = []
+    def on_event(self, evt):
+        self.seen.append(evt)
+        return []
+
+
+class _BurstMarket:
+    """One quote, then the quote stream goes quiet until every trade was handled."""
+    def __init__(self, n_trades, strategy):
+        self.n_trades = n_trades
+        self.strategy = strategy
+        self.released = threading.Event()
+
+    def subscribe_quotes(self, symbol):
+        yield Quote(ts=0, bid=99.9, ask=100.1, bid_sz=1.0, ask_sz=1.0)
+        # lockstep alternation would deadlock here waiting for trade #2
+        assert self.released.wait(timeout=5.0), "trades were held behind the quote stream"
+
+    def subscribe_trades(self, symbol):
+        for i in range(self.n_trades):
+            yield Trade(ts=i + 1, price=100.0, size=1.0, side=Side.BUY)
+        while sum(isinstance(e, Trade) for e in self.strategy.seen) < self.n_trades:
+            threading.Event().wait(0.001)
+        self.released.set()
+
+
+def test_trade_burst_not_blocked_by_quiet_quote_stream():
+    strat = _Recorder()
+    market = _BurstMarket(50, strat)
+    eng = Engine(market, _NullBackend(), store=None, risk=AllowAllRisk())
+    eng.run("SOL-PERP", strat)
+    assert sum(isinstance(e, Trade) for e in strat.seen) == 50
+    assert sum(isinstance(e, Quote) for e in strat.seen) == 1
+
+
+def test_timestamp_merge_orders_across_streams():
+    quotes = [Quote(ts=ts, bid=1.0, ask=2.0, bid_sz=1.0, ask_sz=1.0) for ts in (1, 4, 4, 9)]
+    trades = [Trade(ts=ts, price=1.5, size=1.0, side=Side.SELL) for ts in (2, 3, 4, 10)]
+    merged = list(TimestampMerge()({"quote": iter(quotes), "trade": iter(trades)}))
+    assert [e.ts for _, e in merged] == [1, 2, 3, 4, 4, 4, 9, 10]
+    # ties keep stream order
+    assert [k for k, e in merged if e.ts == 4] == ["quote", "quote", "trade"]
+
+
+class _TwoSymbolMarket:
+    """SOL prints through the resting bid; BTC never trades."""
+    def subscribe_quotes(self, symbol):
+        yield Quote(ts=1, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+
+    def subscribe_trades(self, symbol):
+        if symbol == "SOL-PERP":
+            threading.Event().wait(0.05)  # let both quotes (and placements) land first
+            yield Trade(ts=2, price=90.0, size=1.0, side=Side.SELL)
+
+
+class _BuyOnce:
+    def __init__(self, symbol):
+        self.symbol = symbol
+        self.done = False
+
+    def on_event(self, evt):
+        assert evt.symbol == self.symbol
+        if self.done or not isinstance(evt, Quote):
+            return []
+        self.done = True
+        return [OrderReq(client_id=f"b-{self.symbol}", symbol=self.symbol, side=Side.BUY,
+                         type=OrdType.LIMIT, px=100.0, sz=1.0)]
+
+
+class _ListStore:
+    def __init__(self):
+        self.fills = []
+    def write_fill(self, f):
+        self.fills.append(f)
+
+
+def test_multi_symbol_routes_events_and_fills_per_symbol():
+    symbols = ["SOL-PERP", "BTC-PERP"]
+    backend, store = ShadowBackend(), _ListStore()
+    eng = Engine(_TwoSymbolMarket(), backend, store, AllowAllRisk())
+    eng.run(symbols, {s: _BuyOnce(s) for s in symbols})
+
+    assert [f.client_id for f in store.fills] == ["b-SOL-PERP"]
+    assert list(backend.resting["BTC-PERP"]) == ["b-BTC-PERP"]
+    assert backend.cancel("b-BTC-PERP") and not backend.resting["BTC-PERP"]
+
+
+def test_multi_symbol_requires_strategy_per_symbol():
+    eng = Engine(_TwoSymbolMarket(), ShadowBackend(), _ListStore(), AllowAllRisk())
+    with pytest.raises(ValueError):
+        eng.run(["SOL-PERP", "BTC-PERP"], _Recorder())
+
+
+class _PipelinedBackend(_NullBackend):
+    """place() returns at once; the outcome shows up in poll_acks() one event later."""
+    def __init__(self):
+        self.placed, self._pending = [], []
+    def place(self, req):
+        self.placed.append(req.client_id)
+        self._pending.append(OrderAck(ts=0, client_id=req.client_id, symbol=req.symbol,
+                                      ok=req.px > 0, error="" if req.px > 0 else "bad price"))
+        return req.client_id
+    def poll_acks(self):
+        acks, self._pending = self._pending, []
+        return acks
+
+
+class _RetryOnReject(_BuyOnce):
+    def __init__(self, symbol):
+        super().__init__(symbol)
+        self.acks = []
+    def on_event(self, evt):
+        reqs = super().on_event(evt)
+        for r in reqs:
+            r.px = -1.0
+        return reqs
+    def on_ack(self, ack):
+        self.acks.append(ack)
+        if ack.ok:
+            return []
+        return [OrderReq(client_id="retry", symbol=ack.symbol, side=Side.BUY, type=OrdType.LIMIT, px=100.0, sz=1.0)]
+
+
+class _EventStore(_ListStore):
+    def __init__(self):
+        super().__init__()
+        self.events = []
+    def write_event(self, kind, data):
+        self.events.append((kind, data["client_id"], data["ok"]))
+
+
+def test_engine_drains_acks_into_strategy_and_store():
+    backend, store, strat = _PipelinedBackend(), _EventStore(), _RetryOnReject("SOL-PERP")
+    eng = Engine(_TwoSymbolMarket(), backend, store, AllowAllRisk())
+    eng.run("SOL-PERP", strat)
+
+    assert backend.placed == ["b-SOL-PERP", "retry"]
+    assert [(a.client_id, a.ok) for a in strat.acks] == [("b-SOL-PERP", False), ("retry", True)]
+    assert store.events == [("order_ack", "b-SOL-PERP", False), ("order_ack", "retry", True)]
+    assert eng.n_rejected == 1
+
+
+class _Requote(_BuyOnce):
+    """Two orders on the quote, then a requote of the first on the trade."""
+    def on_event(self, evt):
+        if isinstance(evt, Quote):
+            return [OrderReq(client_id=c, symbol=self.symbol, side=Side.BUY, type=OrdType.LIMIT, px=99.0, sz=1.0)
+                    for c in ("q1", "q2")]
+        return [OrderReq(client_id="q3", symbol=self.symbol, side=Side.BUY, type=OrdType.LIMIT, px=98.0, sz=1.0,
+                         meta={"replaces": "q1"})]
+
+
+class _CallLog(_NullBackend):
+    def __init__(self, batched):
+        self.calls = []
+        if batched:
+            self.place_many = lambda reqs: self.calls.append(("place_many", [r.client_id for r in reqs]))
+    def place(self, req):
+        self.calls.append(("place", req.client_id))
+    def cancel(self, cid):
+        self.calls.append(("cancel", cid))
+
+
+def test_tick_orders_go_out_in_one_place_many():
+    backend = _CallLog(batched=True)
+    Engine(_TwoSymbolMarket(), backend, None, AllowAllRisk()).run("SOL-PERP", _Requote("SOL-PERP"))
+    assert backend.calls == [("place_many", ["q1", "q2"]), ("place_many", ["q3"])]
+
+
+def test_replaces_cancels_first_without_place_many():
+    backend = _CallLog(batched=False)
+    Engine(_TwoSymbolMarket(), backend, None, AllowAllRisk()).run("SOL-PERP", _Requote("SOL-PERP"))
+    assert backend.calls == [("place", "q1"), ("place", "q2"), ("cancel", "q1"), ("place", "q3")]
@@ -0,0 +1,38 @@
+import io, json
+
+from spltrader.core.log import EventLog, DEBUG, INFO, WARN
+from spltrader.core.types import Side
+
+
+def test_levels_and_kv_format():
+    sink = io.StringIO()
+    log = EventLog(level=INFO, sink=sink)
+    log.debug("engine.quote", bid=1.0)
+    log.info("engine.fill", id="a b", side=Side.BUY, px=101.25)
+    log.flush()
+    (line,) = sink.getvalue().splitlines()
+    assert "level=INFO cat=engine.fill" in line and 'id="a b" side=buy px=101.25' in line
+
+
+def test_rate_limit_and_ring_overflow_are_counted():
+    sink = io.StringIO()
+    log = EventLog(level=DEBUG, sink=sink, fmt="json", ring_size=4, rates={"noisy": 2},
+                   flush_ms=60_000)  # writer thread stays out of the way
+    for i in range(100):
+        log.debug("noisy", i=i)  # bucket starts with 2 tokens; the rest are suppressed
+    log.configure(rates={})
+    for i in range(10):
+        log.warn("burst", i=i)
+    log.flush()
+    recs = [json.loads(l) for l in sink.getvalue().splitlines()]
+    assert [r["i"] for r in recs if r["cat"] == "burst"] == [6, 7, 8, 9]
+    assert [r for r in recs if r["cat"] == "log"][0]["dropped"] == 6
+    assert log.dropped == 6
+
+
+def test_writer_thread_drains():
+    sink = io.StringIO()
+    log = EventLog(level=WARN, sink=sink, flush_ms=5)
+    log.warn("engine.risk", blocked="x")
+    log.close()
+    assert "blocked=x" in sink.getvalue()
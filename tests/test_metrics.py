@@ -0,0 +1,61 @@
+import urllib.request
+
+from spltrader.core.metrics import Histogram, Registry, EngineMetrics, MetricsServer
+from spltrader.core.types import Quote, Trade, Side, OrderReq, OrdType
+from spltrader.engine.engine import Engine
+from spltrader.exec.backend_shadow import ShadowBackend
+from spltrader.risk.allow_all import AllowAllRisk
+
+
+def test_histogram_percentiles_within_bucket_error():
+    h = Histogram()
+    for v in range(1, 100_001):
+        h.record(v * 1_000)  # 1µs .. 100ms
+    assert h.count == 100_000 and h.max == 100_000_000
+    for q, exact in ((0.5, 50_000_000), (0.99, 99_000_000)):
+        assert abs(h.percentile(q) - exact) / exact < 0.04
+    small = Histogram()
+    for v in (0, 3, 7, 7, 63):
+        small.record(v)  # exact below 2 * 2**sub_bits
+    assert [small.percentile(q) for q in (0.2, 0.6, 1.0)] == [0, 7, 63]
+
+
+class _Market:
+    def subscribe_quotes(self, symbol):
+        for i in range(50):
+            yield Quote(ts=2 * i, bid=99.0, ask=101.0, bid_sz=1.0, ask_sz=1.0)
+
+    def subscribe_trades(self, symbol):
+        for i in range(50):
+            yield Trade(ts=2 * i + 1, price=100.0, size=1.0, side=Side.BUY)
+
+
+class _EveryTrade:
+    def on_event(self, evt):
+        if isinstance(evt, Trade):
+            return [OrderReq(client_id=f"m-{evt.ts}", symbol="S", side=Side.BUY, type=OrdType.MARKET, px=None, sz=1.0)]
+        return []
+
+
+class _NullStore:
+    def write_fill(self, f): pass
+
+
+def test_engine_stage_metrics_and_endpoint():
+    reg = Registry()
+    eng = Engine(_Market(), ShadowBackend(), _NullStore(), AllowAllRisk(), metrics=EngineMetrics(reg))
+    eng.run("S", _EveryTrade())
+    assert reg.counter_value("spl_events_total") == 100 and reg.counter_value("spl_fills_total") == 49
+    m = eng.metrics
+    assert m.recv_to_dequeue.count == 100 and m.strategy.count == 100 and m.place.count == 50
+    assert m.match_trade.count == 50 and m.store.count == 49
+
+    server = MetricsServer(reg, port=0, summary_sec=0).start()
+    try:
+        body = urllib.request.urlopen(f"http://127.0.0.1:{server.port}/metrics", timeout=5).read().decode()
+    finally:
+        server.close()
+    assert '# TYPE spl_stage_seconds summary' in body
+    assert 'spl_stage_seconds_count{stage="place"} 50' in body
+    assert "spl_fills_total 49" in body and "spl_dropped_total 0" in body
+    assert "place_p99_us" in reg.summary_fields()
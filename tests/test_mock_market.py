@@ -0,0 +1,59 @@
+from itertools import islice
+
+import pytest
+
+from spltrader.mock_adapter.mock import MockMarket
+
+
+def _mock(**kw):
+    return MockMarket({"mock": {"speed": 0, "start_ms": 1_700_000_000_000, **kw}})
+
+
+def test_same_seed_same_events():
+    a, b = _mock(seed=7, events=2000), _mock(seed=7, events=2000)
+    assert list(a.subscribe_quotes("SOL-PERP")) == list(b.subscribe_quotes("SOL-PERP"))
+    assert list(a.subscribe_trades("SOL-PERP")) == list(b.subscribe_trades("SOL-PERP"))
+    c = _mock(seed=8, events=2000)
+    assert list(c.subscribe_trades("SOL-PERP")) != list(a.subscribe_trades("SOL-PERP"))
+
+
+def test_streams_share_one_price_path():
+    m = _mock(events=5000, trade_ratio=0.5)
+    quotes = list(m.subscribe_quotes("SOL-PERP"))
+    trades = list(m.subscribe_trades("SOL-PERP"))
+    assert len(quotes) + len(trades) == 5000
+    # every trade prints at the touch of the quote stream around it
+    mids = {q.ts: (q.bid + q.ask) / 2 for q in quotes}
+    near = [t for t in trades if t.ts in mids]
+    assert near
+    for t in near:
+        assert abs(t.price - mids[t.ts]) < 0.05
+
+
+def test_rate_ratio_and_symbols():
+    m = _mock(rate=1000, trade_ratio=0.75, events=20_000, profile="steady", prices={"BTC-PERP": 60_000.0})
+    trades = list(m.subscribe_trades("SOL-PERP"))
+    quotes = list(m.subscribe_quotes("SOL-PERP"))
+    assert len(trades) / 20_000 == pytest.approx(0.75, abs=0.02)
+    last = max(trades[-1].ts, quotes[-1].ts) - m.start_ms
+    assert last == pytest.approx(20_000, abs=2)  # 20k events at 1000/s of simulated time
+    assert all(a.ts <= b.ts for a, b in zip(trades, trades[1:]))
+    btc = next(iter(m.subscribe_quotes("BTC-PERP")))
+    assert btc.symbol == "BTC-PERP" and btc.bid == pytest.approx(60_000, rel=1e-3)
+
+
+def test_burst_profile_clusters_arrivals():
+    def busiest_second(profile):
+        m = _mock(rate=100, events=20_000, profile=profile, burst_factor=20, burst_ms=500, quiet_ms=5000)
+        counts = {}
+        for t in m.subscribe_trades("SOL-PERP"):
+            counts[t.ts // 1000] = counts.get(t.ts // 1000, 0) + 1
+        return max(counts.values())
+    assert busiest_second("burst") > 5 * busiest_second("poisson")
+
+
+def test_endless_by_default_and_paced():
+    m = MockMarket({"mock": {"rate": 1000, "speed": 1.0}})
+    assert len(list(islice(m.subscribe_quotes("SOL-PERP"), 5))) == 5
+    with pytest.raises(ValueError):
+        MockMarket({"mock": {"profile": "spiky"}})
@@ -0,0 +1,88 @@
+from spltrader.core.types import OrderReq, OrdType, Side, Trade, Quote
+from spltrader.exec.backend_paper import PaperBackend
+from spltrader.exec.backend_shadow import ShadowBackend
+from spltrader.exec.order_book import OrderBook
+
+
+def _limit(cid, side, px, symbol="SOL-PERP"):
+    return OrderReq(client_id=cid, symbol=symbol, side=side, type=OrdType.LIMIT, px=px, sz=1.0)
+
+
+def _trade(ts, px, symbol="SOL-PERP"):
+    return Trade(ts=ts, price=px, size=1.0, side=Side.BUY, symbol=symbol)
+
+
+def test_trade_fills_only_crossed_orders_best_price_first():
+    b = ShadowBackend(fee_bps=10.0)
+    for i in range(500):  # a deep ladder far from the print
+        b.place(_limit(f"bid-{i}", Side.BUY, 90.0 - i * 0.01))
+        b.place(_limit(f"ask-{i}", Side.SELL, 110.0 + i * 0.01))
+    b.place(_limit("b1", Side.BUY, 100.0))
+    b.place(_limit("b2", Side.BUY, 100.5))
+    b.place(_limit("b3", Side.BUY, 100.0))
+    b.place(OrderReq(client_id="m", symbol="SOL-PERP", side=Side.SELL, type=OrdType.MARKET, px=None, sz=2.0))
+    b.place(_limit("other", Side.BUY, 200.0, symbol="BTC-PERP"))
+
+    fills = b.on_trade(_trade(1, 100.0))
+    assert [f.client_id for f in fills] == ["m", "b2", "b1", "b3"]
+    assert all(f.px == 100.0 for f in fills)
+    assert b.positions["SOL-PERP"]["base"] == 1.0 and b.cash == -0.5
+    assert len(b.resting["SOL-PERP"]) == 1000 and "other" in b.resting["BTC-PERP"]
+    assert b.on_trade(_trade(2, 100.0)) == []
+
+
+def test_lazy_cancel_and_compaction():
+    book = OrderBook()
+    for i in range(200):
+        book.add(_limit(f"s-{i}", Side.SELL, 100.0 + i))
+    for i in range(150):
+        assert book.remove(f"s-{i}") is not None
+    assert book.remove("s-0") is None
+    assert len(book) == 50 and len(book.asks) < 200  # stale entries were compacted away
+    assert [r.client_id for r in book.take_crossed(251.0)] == ["s-150", "s-151"]
+
+
+def test_reused_client_id_never_fills_from_a_stale_entry():
+    book = OrderBook()
+    book.add(_limit("x", Side.BUY, 100.0))
+    book.remove("x")
+    book.add(_limit("x", Side.BUY, 90.0))          # cancel, then re-place the same id lower
+    assert book.take_crossed(95.0) == []
+    assert [r.px for r in book.take_crossed(90.0)] == [90.0]
+
+    book.add(_limit("y", Side.BUY, 100.0))
+    book.add(_limit("y", Side.BUY, 90.0))          # no cancel: the second order replaces the first
+    assert len(book) == 1
+    assert [(r.client_id, r.px) for r in book.take_crossed(85.0)] == [("y", 90.0)]
+    assert book.take_crossed(85.0) == [] and len(book) == 0
+
+
+class _NullStore:
+    def write_event(self, kind, payload): pass
+
+
+def _quote(ts, bid, ask, symbol="SOL-PERP"):
+    return Quote(ts=ts, bid=bid, ask=ask, bid_sz=1.0, ask_sz=1.0, symbol=symbol)
+
+
+def test_paper_limit_stop_and_stop_limit():
+    b = PaperBackend(store=_NullStore(), fee_bps=0.0, slippage_bps=0.0)
+    b.place(_limit("buy-99", Side.BUY, 99.0))
+    b.place(_limit("sell-101", Side.SELL, 101.0))
+    b.place(OrderReq(client_id="stop-buy", symbol="SOL-PERP", side=Side.BUY, type=OrdType.STOP,
+                     px=None, sz=1.0, meta={"stop_px": 102.0}))
+    b.place(OrderReq(client_id="sl-sell", symbol="SOL-PERP", side=Side.SELL, type=OrdType.STOP_LIMIT,
+                     px=98.5, sz=1.0, meta={"stop_px": 98.0}))
+    for i in range(300):  # resting depth that no quote below reaches
+        b.place(_limit(f"deep-{i}", Side.BUY, 50.0 - i * 0.01))
+
+    assert b.on_quote(_quote(1, 99.9, 100.1)) == []
+    # ask through the buy limit: filled at the (better) ask
+    assert [(f.client_id, f.px) for f in b.on_quote(_quote(2, 98.5, 98.8))] == [("buy-99", 98.8)]
+    # bid down to 98 triggers the stop-limit; it rests at 98.5 until the bid gets back there
+    assert b.on_quote(_quote(3, 97.9, 98.1)) == []
+    assert [(f.client_id, f.px) for f in b.on_quote(_quote(4, 98.6, 98.7))] == [("sl-sell", 98.6)]
+    # ask at 102 triggers the stop (fills as a market order) and crosses the sell limit's price
+    fills = b.on_quote(_quote(5, 101.8, 102.0))
+    assert [(f.client_id, f.px) for f in fills] == [("stop-buy", 102.0), ("sell-101", 101.8)]
+    assert len(b._orders["SOL-PERP"]) == 300
@@ -0,0 +1,65 @@
+import pytest
+
+pq = pytest.importorskip("pyarrow.parquet")
+
+from spltrader.core.types import AccountSnapshot, Fill, Side
+from spltrader.storage.parquet_store import ParquetStore
+
+
+def _fill(i):
+    return Fill(ts=i, client_id=f"t{i}", symbol="SOL-PERP", side=Side.BUY if i % 2 else Side.SELL,
+                px=100.0 + i, sz=0.5, fee=0.01)
+
+
+def test_fills_written_as_row_groups(tmp_path):
+    store = ParquetStore({"storage": {"dir": str(tmp_path), "row_group_rows": 100}})
+    for i in range(250):
+        store.write_fill(_fill(i))
+    store.write_event("place", {"client_id": "t1", "side": Side.BUY})
+    store.write_snapshot(AccountSnapshot(ts=5, balance=-1.0, positions={"SOL-PERP": {"base": 2.0, "pnl_real": -3.0}}))
+    store.close()
+
+    [path] = (tmp_path / "fills").glob("*.parquet")
+    f = pq.ParquetFile(path)
+    assert f.metadata.num_rows == 250
+    assert [f.metadata.row_group(i).num_rows for i in range(f.num_row_groups)] == [100, 100, 50]
+    t = f.read(columns=["ts", "side", "px"])
+    assert t.column("ts").to_pylist()[:3] == [0, 1, 2]
+    assert t.column("side").to_pylist()[:2] == ["sell", "buy"]
+    assert t.column("px").to_pylist()[-1] == 349.0
+
+    [snap] = pq.read_table(tmp_path / "snapshots").to_pylist()
+    assert snap == {"ts": 5, "balance": -1.0, "symbol": "SOL-PERP", "base": 2.0, "pnl_real": -3.0}
+    [evt] = pq.read_table(tmp_path / "events").to_pylist()
+    assert evt["kind"] == "place" and '"side": "buy"' in evt["payload"]
+
+
+def test_rolls_files_by_size(tmp_path):
+    store = ParquetStore({"storage": {"dir": str(tmp_path), "row_group_rows": 50, "roll_mb": 0}})
+    for i in range(200):
+        store.write_fill(_fill(i))
+    store.close()
+
+    paths = sorted((tmp_path / "fills").glob("*.parquet"))
+    assert len(paths) == 4
+    assert sum(pq.ParquetFile(p).metadata.num_rows for p in paths) == 200
+
+
+def test_quiet_table_is_sealed_after_roll_minutes(tmp_path, monkeypatch):
+    from spltrader.storage import parquet_store
+    now = [1000.0]
+    monkeypatch.setattr(parquet_store.time, "monotonic", lambda: now[0])
+    store = ParquetStore({"storage": {"dir": str(tmp_path), "roll_minutes": 1}})
+    for i in range(3):
+        store.write_fill(_fill(i))
+    assert list((tmp_path / "fills").glob("*.parquet")) == []   # far below row_group_rows
+
+    now[0] += 61
+    store.write_event("cancel", {"client_id": "t0"})             # any write checks every table's age
+    [path] = (tmp_path / "fills").glob("*.parquet")
+    assert pq.ParquetFile(path).metadata.num_rows == 3           # closed, footer written, engine still running
+
+    store.write_fill(_fill(3))
+    store.close()
+    paths = sorted((tmp_path / "fills").glob("*.parquet"))
+    assert len(paths) == 2 and pq.ParquetFile(paths[1]).metadata.num_rows == 1
@@ -14,3 +14,79 @@ def test_fills_written(tmp_path, monkeypatch):
     conn = sqlite3.connect(db)
     n, = conn.execute("select count(*) from fills").fetchone()
     assert n == 1
+
+
+def test_write_behind_batches_and_flushes(tmp_path):
+    import sqlite3, time
+    from spltrader.core.types import Fill, Side
+    from spltrader.storage.sqlite_store import WriteBehindSQLiteStore
+
+    db = tmp_path/"spl.db"
+    store = WriteBehindSQLiteStore({"storage": {"path": str(db), "commit_every": 100, "commit_ms": 50}})
+    for i in range(1000):
+        store.write_fill(Fill(ts=i, client_id=f"t{i}", symbol="SOL-PERP", side=Side.BUY, px=100.0, sz=0.01, fee=0.0))
+        store.write_event("place", {"client_id": f"t{i}"})
+    store.flush()
+
+    conn = sqlite3.connect(db)
+    assert conn.execute("select count(*) from fills").fetchone() == (1000,)
+    assert conn.execute("select count(*) from events").fetchone() == (1000,)
+    assert conn.execute("pragma journal_mode").fetchone() == ("wal",)
+
+    # below commit_every: still committed once commit_ms elapses, without a flush
+    store.write_fill(Fill(ts=1, client_id="late", symbol="SOL-PERP", side=Side.SELL, px=1.0, sz=1.0, fee=0.0))
+    deadline = time.time() + 2.0
+    while conn.execute("select count(*) from fills").fetchone() != (1001,) and time.time() < deadline:
+        time.sleep(0.01)
+    assert conn.execute("select count(*) from fills").fetchone() == (1001,)
+    store.close()
+
+
+def test_write_behind_drops_only_bad_rows(tmp_path):
+    import sqlite3
+    from spltrader.storage.sqlite_store import WriteBehindSQLiteStore
+
+    db = tmp_path/"spl.db"
+    store = WriteBehindSQLiteStore({"storage": {"path": str(db)}})
+    store.write_event("place", {"client_id": "ok1"})
+    store.write_event("place", {"client_id": object()})   # json can't encode it
+    store.write_event("place", {"client_id": "ok2"})
+    store.flush()
+
+    conn = sqlite3.connect(db)
+    assert [p for p, in conn.execute("select payload from events")] == ['{"client_id": "ok1"}', '{"client_id": "ok2"}']
+    store.write_event("place", {"client_id": "ok3"})      # the writer is still alive
+    store.close()
+    assert conn.execute("select count(*) from events").fetchone() == (3,)
+
+
+def test_write_behind_raises_instead_of_blocking_once_the_writer_dies(tmp_path):
+    import sqlite3, pytest
+    from spltrader.core.types import Fill, Side
+    from spltrader.storage.sqlite_store import WriteBehindSQLiteStore
+
+    db = tmp_path/"spl.db"
+    store = WriteBehindSQLiteStore({"storage": {"path": str(db), "queue_max": 2}})
+    sqlite3.connect(db).execute("DROP TABLE fills")
+    fill = Fill(ts=1, client_id="t1", symbol="SOL-PERP", side=Side.BUY, px=1.0, sz=1.0, fee=0.0)
+    with pytest.raises(RuntimeError, match="no such table"):
+        store.write_fill(fill)
+        store.flush()
+    with pytest.raises(RuntimeError, match="writer thread died"):
+        for _ in range(10):                                  # would block forever on the full queue
+            store.write_fill(fill)
+    with pytest.raises(RuntimeError, match="writer thread died"):
+        store.close()
+
+
+def test_write_behind_close_raises_when_queued_rows_were_lost(tmp_path):
+    import sqlite3, pytest
+    from spltrader.core.types import Fill, Side
+    from spltrader.storage.sqlite_store import WriteBehindSQLiteStore
+
+    db = tmp_path/"spl.db"
+    store = WriteBehindSQLiteStore({"storage": {"path": str(db)}})
+    sqlite3.connect(db).execute("DROP TABLE fills")
+    store.write_fill(Fill(ts=1, client_id="t1", symbol="SOL-PERP", side=Side.BUY, px=1.0, sz=1.0, fee=0.0))
+    with pytest.raises(RuntimeError, match="no such table"):   # no flush(): close() is the first to know
+        store.close()
@@ -0,0 +1,38 @@
+import os, sqlite3
+
+from spltrader.cli.supervisor import QueueStore, Supervisor, shard_symbols
+from spltrader.core.types import AccountSnapshot, Fill, Side
+from spltrader.storage.sqlite_store import SQLiteStore
+
+
+def _flaky_shard(shard_id, cfg, symbols, out_q):
+    # first start of every shard dies hard; the restart does the work
+    marker = os.path.join(cfg["tmp"], f"shard-{shard_id}")
+    if not os.path.exists(marker):
+        open(marker, "w").close()
+        os._exit(3)
+    store = QueueStore(out_q, shard_id)
+    for i, sym in enumerate(symbols):
+        store.write_fill(Fill(ts=i, client_id=f"{sym}-{i}", symbol=sym, side=Side.BUY, px=1.0, sz=1.0, fee=0.0))
+    store.write_snapshot(AccountSnapshot(ts=10 + shard_id, balance=1.0,
+                                         positions={s: {"base": 1.0, "pnl_real": 0.0} for s in symbols}))
+
+
+def test_shard_symbols_round_robin():
+    assert shard_symbols(["A", "B", "C", "D", "E"], 2) == [["A", "C", "E"], ["B", "D"]]
+    assert shard_symbols(["A"], 4) == [["A"]]
+
+
+def test_supervisor_restarts_crashed_shards_and_aggregates(tmp_path):
+    symbols = ["SOL-PERP", "BTC-PERP", "ETH-PERP"]
+    cfg = {"tmp": str(tmp_path), "storage": {"path": str(tmp_path / "spl.db")},
+           "engine": {"restart_backoff_sec": 0.01}}
+    sup = Supervisor(cfg, symbols, 2, SQLiteStore(cfg), target=_flaky_shard)
+    sup.run()
+
+    assert [sh.restarts for sh in sup.shards] == [1, 1]
+    assert not any(sh.failed for sh in sup.shards)
+    conn = sqlite3.connect(tmp_path / "spl.db")
+    assert sorted(r[0] for r in conn.execute("select symbol from fills")) == sorted(symbols)
+    agg = sup.aggregate_snapshot()
+    assert agg.balance == 2.0 and sorted(agg.positions) == sorted(symbols)